@@ -0,0 +1,466 @@
+import re
+from array import array
+
+from conjuntos import conjuntos_python
+from gramatica import EPSILON, TablaSimbolos, insertar_concatenaciones
+
+# Códigos de los tipos de nodo guardados en el arreglo de operadores
+HOJA = 0
+CONCATENACION = 1
+ALTERNACION = 2
+ESTRELLA = 3
+MAS = 4  # x+: una o más veces, sin repetir las posiciones de x como x.x*
+OPCIONAL = 5  # x?: cero o una vez
+VACIO = 6  # Épsilon: nodo sin posición (no es hoja) que acepta la cadena vacía
+
+codigos_operador = {'.': CONCATENACION, '|': ALTERNACION, '*': ESTRELLA, '+': MAS, '?': OPCIONAL}
+valores_operador = {codigo: operador for operador, codigo in codigos_operador.items()}
+valores_operador[VACIO] = EPSILON
+
+# Operadores que se aplican a un solo árbol (van después de su operando)
+operadores_unarios = ['*', '+', '?']
+
+SIN_HIJO = -1  # Valor de izquierdo/derecho cuando el nodo no tiene ese hijo
+
+# Árbol de expresión guardado como arreglos paralelos: el nodo i está en la posición i de cada arreglo.
+# Los nodos se agregan siempre después de sus hijos, así que recorrer los índices en orden
+# creciente visita los hijos antes que los padres.
+# Los símbolos de las hojas son ids de una TablaSimbolos, que se puede compartir entre varios árboles.
+class Arbol:
+    def __init__(self, tabla_simbolos=None):
+        self.operador = array('b')  # HOJA, CONCATENACION, ALTERNACION, ESTRELLA, MAS, OPCIONAL o VACIO
+        self.izquierdo = array('i')  # Índice del hijo izquierdo (SIN_HIJO si no tiene)
+        self.derecho = array('i')  # Índice del hijo derecho (SIN_HIJO si no tiene)
+        self.numero_hoja = array('i')  # Número de la hoja (0 si no es hoja)
+        self.nullable = array('b')
+        self.simbolo = array('i')  # Id del símbolo de la hoja (-1 si es operador)
+        self.tabla_simbolos = tabla_simbolos if tabla_simbolos is not None else TablaSimbolos()
+        self.simbolos = self.tabla_simbolos.nombres  # Id -> nombre del símbolo (a1, b2, ...)
+        self.first = []  # First de cada nodo, se llena en calcular_conjuntos
+        self.last = []  # Last de cada nodo, se llena en calcular_conjuntos
+        self.raiz = SIN_HIJO
+
+    def __len__(self):
+        return len(self.operador)
+
+    def agregar_nodo(self, operador, izquierdo=SIN_HIJO, derecho=SIN_HIJO, simbolo=-1):
+        self.operador.append(operador)
+        self.izquierdo.append(izquierdo)
+        self.derecho.append(derecho)
+        self.numero_hoja.append(0)
+        self.nullable.append(0)
+        self.simbolo.append(simbolo)
+        return len(self.operador) - 1
+
+    # Agregar una hoja a partir del id de su símbolo o de su nombre (a1, b2, ...)
+    def agregar_hoja(self, valor):
+        if isinstance(valor, int):
+            return self.agregar_nodo(HOJA, simbolo=valor)
+        return self.agregar_nodo(HOJA, simbolo=self.tabla_simbolos.agregar_nombre(valor))
+
+    def es_hoja(self, nodo):
+        return self.operador[nodo] == HOJA
+
+    # Valor del nodo como texto: el símbolo si es hoja o el operador
+    def valor(self, nodo):
+        if self.operador[nodo] == HOJA:
+            return self.simbolos[self.simbolo[nodo]]
+        return valores_operador[self.operador[nodo]]
+
+# Precedencia de operadores
+def precedencia(token):
+    if token in operadores_unarios:
+        return 3
+    elif token == '.':
+        return 2
+    elif token == '|':
+        return 1
+    else:
+        return 0
+
+# Función para verificar si es un operador
+def es_operador(token):
+    return token in ['.', '|', '*', '+', '?', '(', ')']
+
+# Función para dividir la expresión en tokens
+def tokenizar_expresion(expresion_regular):
+    # Usamos una expresión regular para agrupar terminales alfanuméricos como 'a1', 'b2', y los operadores individuales
+    return re.findall(r'[a-zA-Z]+\d*|[().*|+?]|' + EPSILON, expresion_regular)
+
+# Función para sacar un operador de la pila y construir su nodo con los árboles de la pila
+def aplicar_operador(operador, pila_arboles, arbol):
+    if operador in operadores_unarios:  # Si el operador es unario
+        if not pila_arboles:
+            raise Exception("Error: Faltan operandos para el operador")
+        nodo = arbol.agregar_nodo(codigos_operador[operador], pila_arboles.pop())
+    else:  # Si es binario
+        if len(pila_arboles) < 2:
+            raise Exception("Error: Faltan operandos para el operador")
+        derecho = pila_arboles.pop()
+        izquierdo = pila_arboles.pop()
+        nodo = arbol.agregar_nodo(codigos_operador[operador], izquierdo, derecho)
+
+    pila_arboles.append(nodo)
+
+# Construir el árbol de expresión y numerar hojas.
+# La expresión puede ser texto con letras (a1.b2|c3) o una lista de partes ya separadas donde los símbolos son ids
+# de tabla_simbolos (ver gramatica.simbolizar); en ese caso no se vuelve a tokenizar ningún texto. En el texto la
+# concatenación puede ir implícita (a3(a3|a1)*b1), igual que en la gramática: se agregan los "." que falten.
+# Con simplificar se aplica simplificar_arbol antes de numerar las hojas.
+def construir_arbol(expresion_regular, tabla_simbolos=None, simplificar=False):
+    arbol = Arbol(tabla_simbolos)
+    pila_tokens = []  # Pila de operadores (T)
+    pila_arboles = []  # Pila de árboles (S), guarda los índices de sus raíces
+
+    if isinstance(expresion_regular, str):
+        tokens = tokenizar_expresion(expresion_regular)  # Tokenizamos la expresión
+        if tokens:
+            tokens = insertar_concatenaciones(tokens)
+    else:
+        tokens = expresion_regular
+
+    anterior = None
+    for token in tokens:
+        # Un grupo vacío "()" o una alternativa vacía ("(|x", "x|)", "x||y") es épsilon
+        if token in [')', '|'] and anterior in [None, '(', '|']:
+            pila_arboles.append(arbol.agregar_nodo(VACIO))
+        anterior = token
+
+        if token == EPSILON:
+            pila_arboles.append(arbol.agregar_nodo(VACIO))
+        elif not es_operador(token):  # Si es un símbolo terminal (st)
+            pila_arboles.append(arbol.agregar_hoja(token))
+        elif token == '(':
+            pila_tokens.append(token)
+        elif token == ')':
+            while pila_tokens and pila_tokens[-1] != '(':
+                aplicar_operador(pila_tokens.pop(), pila_arboles, arbol)
+            if not pila_tokens:
+                raise Exception("Error: Paréntesis de cierre sin apertura")
+            pila_tokens.pop()  # Quitar el '('
+        else:
+            while (pila_tokens and pila_tokens[-1] != '(' and
+                   precedencia(pila_tokens[-1]) >= precedencia(token)):
+                aplicar_operador(pila_tokens.pop(), pila_arboles, arbol)
+            pila_tokens.append(token)  # Añadir el operador actual a la pila
+
+    if anterior == '|':  # Alternativa vacía al final
+        pila_arboles.append(arbol.agregar_nodo(VACIO))
+
+    # Procesar los operadores restantes
+    while pila_tokens:
+        operador = pila_tokens.pop()
+        if operador == '(':
+            raise Exception("Error: Paréntesis de apertura sin cierre")
+        aplicar_operador(operador, pila_arboles, arbol)
+
+    # Al final, debería quedar un solo árbol en la pila
+    if len(pila_arboles) != 1:
+        raise Exception("Error: Expresión incorrecta, operandos faltantes")
+
+    arbol.raiz = pila_arboles.pop()
+    if simplificar:
+        arbol = simplificar_arbol(arbol)
+    total_hojas = asignar_numeros_hojas(arbol)  # Asignar números de hoja
+
+    return arbol, total_hojas  # Devuelve el árbol y el número total de hojas
+
+# Simplificación del árbol (antes de numerar las hojas). El árbol se pasa a expresiones anidadas de tuplas:
+# (HOJA, id), (VACIO,), (CONCATENACION, partes), (ALTERNACION, alternativas) y (ESTRELLA / MAS / OPCIONAL, hijo),
+# que se arman con funciones que ya las dejan simplificadas:
+#   - las cadenas de "." y de "|" quedan como una sola lista (sin grupos anidados) y sin épsilon en "."
+#   - se quitan las alternativas repetidas y épsilon en "|" pasa a ser "?" de las demás
+#   - las alternativas que empiezan igual se factorizan: a.b|c|a.d -> a.(b|d)|c
+#   - los unarios seguidos se juntan: (x*)* -> x*, (x+)? -> x*, ...
+# Ninguna regla cambia el lenguaje. El token que gana es el del marcador Tn de menor posición, así que una
+# alternativa con marcador solo se junta con el grupo anterior a ella (nunca pasa por delante de otro token).
+# Las tuplas se pueden comparar y usar como llaves, por eso se usan para quitar repetidos.
+EXPRESION_VACIA = (VACIO,)
+
+def hacer_concatenacion(partes):
+    lista = []
+    for parte in partes:
+        if parte[0] == CONCATENACION:
+            lista.extend(parte[1])
+        elif parte[0] != VACIO:
+            lista.append(parte)
+    if not lista:
+        return EXPRESION_VACIA
+    if len(lista) == 1:
+        return lista[0]
+    return (CONCATENACION, tuple(lista))
+
+def hacer_unario(operador, hijo):
+    if hijo[0] == VACIO:
+        return EXPRESION_VACIA
+    if hijo[0] in (ESTRELLA, MAS, OPCIONAL):
+        if hijo[0] == operador:
+            return hijo
+        return (ESTRELLA, hijo[1])  # Cualquier combinación de dos unarios distintos es *
+    return (operador, hijo)
+
+# Separar una expresión en su primer elemento y el resto (épsilon si no hay más)
+def separar_cabeza(expresion):
+    if expresion[0] == CONCATENACION:
+        return expresion[1][0], hacer_concatenacion(expresion[1][1:])
+    return expresion, EXPRESION_VACIA
+
+# Ver si una expresión tiene un marcador: los marcadores van al final de cada token, así que basta con seguir
+# el último elemento de las concatenaciones
+def tiene_marcador(expresion, marcadores):
+    pendientes = [expresion]
+    while pendientes:
+        actual = pendientes.pop()
+        if actual[0] == HOJA:
+            if actual[1] in marcadores:
+                return True
+        elif actual[0] == CONCATENACION:
+            pendientes.append(actual[1][-1])
+        elif actual[0] == ALTERNACION:
+            pendientes.extend(actual[1])
+        elif actual[0] != VACIO:
+            pendientes.append(actual[1])
+    return False
+
+# marcadores es el conjunto de ids de símbolo de los marcadores Tn (ver TablaSimbolos.agregar_marcador)
+def hacer_alternacion(alternativas, marcadores=frozenset()):
+    lista = []
+    for alternativa in alternativas:
+        if alternativa[0] == ALTERNACION:
+            lista.extend(alternativa[1])
+        else:
+            lista.append(alternativa)
+
+    # Quitar repetidas y épsilon, y juntar las que empiezan igual
+    hay_vacio = False
+    grupos = []  # Listas [primer elemento, restos]
+    grupo_cabeza = {}  # Primer elemento -> último grupo con ese primer elemento
+    for alternativa in dict.fromkeys(lista):
+        if alternativa[0] == VACIO:
+            hay_vacio = True
+            continue
+        cabeza, resto = separar_cabeza(alternativa)
+        grupo = grupo_cabeza.get(cabeza)
+        if grupo is None or (grupo is not grupos[-1] and tiene_marcador(resto, marcadores)):
+            grupo = [cabeza, []]
+            grupos.append(grupo)
+            grupo_cabeza[cabeza] = grupo
+        grupo[1].append(resto)
+
+    resultado = []
+    for cabeza, restos in grupos:
+        if len(restos) == 1:
+            resultado.append(hacer_concatenacion([cabeza, restos[0]]))
+        else:
+            resultado.append(hacer_concatenacion([cabeza, hacer_alternacion(restos, marcadores)]))
+
+    if not resultado:
+        return EXPRESION_VACIA
+    expresion = resultado[0] if len(resultado) == 1 else (ALTERNACION, tuple(resultado))
+    return hacer_unario(OPCIONAL, expresion) if hay_vacio else expresion
+
+# Pasar el árbol a una expresión simplificada; los hijos tienen índices menores, así que no hace falta recursión.
+# Una cadena de "|" (como la de todos los tokens) se junta en una lista y se simplifica una sola vez en su nodo
+# más alto, en vez de volver a factorizar todas las alternativas en cada nivel.
+def expresion_arbol(arbol):
+    marcadores = {id_simbolo for id_simbolo, token in enumerate(arbol.tabla_simbolos.tokens) if token is not None}
+    operadores = arbol.operador
+    padres = [SIN_HIJO] * len(arbol)
+    for nodo in range(len(arbol)):
+        for hijo in (arbol.izquierdo[nodo], arbol.derecho[nodo]):
+            if hijo != SIN_HIJO:
+                padres[hijo] = nodo
+
+    expresiones = [None] * len(arbol)
+    for nodo in range(len(arbol)):
+        operador = operadores[nodo]
+        if operador == HOJA:
+            expresiones[nodo] = (HOJA, arbol.simbolo[nodo])
+        elif operador == VACIO:
+            expresiones[nodo] = EXPRESION_VACIA
+        elif operador == CONCATENACION:
+            expresiones[nodo] = hacer_concatenacion([expresiones[arbol.izquierdo[nodo]],
+                                                     expresiones[arbol.derecho[nodo]]])
+        elif operador == ALTERNACION:
+            izquierdo, derecho = expresiones[arbol.izquierdo[nodo]], expresiones[arbol.derecho[nodo]]
+            # Una lista es una cadena de "|" todavía sin simplificar; la del hijo izquierdo se reutiliza
+            alternativas = izquierdo if isinstance(izquierdo, list) else [izquierdo]
+            if isinstance(derecho, list):
+                alternativas.extend(derecho)
+            else:
+                alternativas.append(derecho)
+            padre = padres[nodo]
+            if padre != SIN_HIJO and operadores[padre] == ALTERNACION:
+                expresiones[nodo] = alternativas
+            else:
+                expresiones[nodo] = hacer_alternacion(alternativas, marcadores)
+        else:
+            expresiones[nodo] = hacer_unario(operador, expresiones[arbol.izquierdo[nodo]])
+    return expresiones[arbol.raiz]
+
+# Agregar una expresión al árbol; las listas de "." y "|" vuelven a ser nodos binarios asociativos por la izquierda
+def agregar_expresion(arbol, expresion):
+    nodos = []  # Nodos ya agregados de las expresiones terminadas
+    pila = [(expresion, False)]
+    while pila:
+        actual, hijos_agregados = pila.pop()
+        operador = actual[0]
+        if operador == HOJA:
+            nodos.append(arbol.agregar_nodo(HOJA, simbolo=actual[1]))
+            continue
+        if operador == VACIO:
+            nodos.append(arbol.agregar_nodo(VACIO))
+            continue
+
+        hijos = actual[1] if operador in (CONCATENACION, ALTERNACION) else (actual[1],)
+        if not hijos_agregados:
+            pila.append((actual, True))
+            pila.extend((hijo, False) for hijo in reversed(hijos))
+            continue
+
+        nodos_hijos = nodos[len(nodos) - len(hijos):]
+        del nodos[len(nodos) - len(hijos):]
+        if operador in (CONCATENACION, ALTERNACION):
+            nodo = nodos_hijos[0]
+            for derecho in nodos_hijos[1:]:
+                nodo = arbol.agregar_nodo(operador, nodo, derecho)
+        else:
+            nodo = arbol.agregar_nodo(operador, nodos_hijos[0])
+        nodos.append(nodo)
+    return nodos[0]
+
+# Devolver un árbol nuevo (con la misma tabla de símbolos) con la expresión simplificada, sin números de hoja
+def simplificar_arbol(arbol):
+    simplificado = Arbol(arbol.tabla_simbolos)
+    simplificado.raiz = agregar_expresion(simplificado, expresion_arbol(arbol))
+    return simplificado
+
+# Recorrer el árbol en preorden (nodo, izquierdo, derecho) con una pila explícita
+def recorrer_preorden(arbol):
+    izquierdos, derechos = arbol.izquierdo, arbol.derecho
+    pila = [arbol.raiz] if arbol.raiz != SIN_HIJO else []
+    while pila:
+        actual = pila.pop()
+        yield actual
+        if derechos[actual] != SIN_HIJO:
+            pila.append(derechos[actual])
+        if izquierdos[actual] != SIN_HIJO:
+            pila.append(izquierdos[actual])
+
+# Recorrer el árbol en postorden (izquierdo, derecho, nodo) con una pila explícita
+def recorrer_postorden(arbol):
+    izquierdos, derechos = arbol.izquierdo, arbol.derecho
+    pila = [(arbol.raiz, False)] if arbol.raiz != SIN_HIJO else []
+    while pila:
+        actual, hijos_visitados = pila.pop()
+        if hijos_visitados:
+            yield actual
+            continue
+        pila.append((actual, True))
+        if derechos[actual] != SIN_HIJO:
+            pila.append((derechos[actual], False))
+        if izquierdos[actual] != SIN_HIJO:
+            pila.append((izquierdos[actual], False))
+
+# Recorrer el árbol en inorden (izquierdo, nodo, derecho) con una pila explícita
+def recorrer_inorden(arbol):
+    izquierdos, derechos = arbol.izquierdo, arbol.derecho
+    pila = []
+    actual = arbol.raiz
+    while pila or actual != SIN_HIJO:
+        while actual != SIN_HIJO:  # Bajar por la rama izquierda
+            pila.append(actual)
+            actual = izquierdos[actual]
+        actual = pila.pop()
+        yield actual
+        actual = derechos[actual]
+
+def asignar_numeros_hojas(arbol):
+    """Asigna números a los nodos hoja de izquierda a derecha y devuelve el total de hojas"""
+    contador_hojas = 0
+    for actual in recorrer_preorden(arbol):
+        if arbol.operador[actual] == HOJA:
+            contador_hojas += 1
+            arbol.numero_hoja[actual] = contador_hojas
+    return contador_hojas
+
+# Calcular First, Last, Nullable y Follow
+def calcular_conjuntos(arbol, follow_dict, conjuntos=conjuntos_python):
+    operadores, izquierdos, derechos = arbol.operador, arbol.izquierdo, arbol.derecho
+    numeros_hoja, nullable = arbol.numero_hoja, arbol.nullable
+    first = [None] * len(arbol)
+    last = [None] * len(arbol)
+
+    # Los hijos tienen índices menores que su padre, así que ya están calculados (postorden)
+    for nodo in range(len(arbol)):
+        operador = operadores[nodo]
+        izquierdo = izquierdos[nodo]
+        derecho = derechos[nodo]
+
+        if operador == HOJA:  # Es un símbolo terminal (hoja numerada)
+            first[nodo] = last[nodo] = conjuntos.unitario(numeros_hoja[nodo])
+            nullable[nodo] = False
+        elif operador == ALTERNACION:
+            first[nodo] = first[izquierdo] | first[derecho]
+            last[nodo] = last[izquierdo] | last[derecho]
+            nullable[nodo] = nullable[izquierdo] or nullable[derecho]
+        elif operador == CONCATENACION:
+            if nullable[izquierdo]:
+                first[nodo] = first[izquierdo] | first[derecho]
+            else:
+                first[nodo] = first[izquierdo]
+            if nullable[derecho]:
+                last[nodo] = last[izquierdo] | last[derecho]
+            else:
+                last[nodo] = last[derecho]
+            nullable[nodo] = nullable[izquierdo] and nullable[derecho]
+
+            # Follow para concatenación
+            for i in conjuntos.posiciones(last[izquierdo]):
+                follow_dict[i] |= first[derecho]
+        elif operador == ESTRELLA:
+            first[nodo] = first[izquierdo]
+            last[nodo] = last[izquierdo]
+            nullable[nodo] = True
+
+            # Follow para *
+            for i in conjuntos.posiciones(last[nodo]):
+                follow_dict[i] |= first[nodo]
+        elif operador == MAS:  # Igual que * pero solo es nullable si su operando lo es
+            first[nodo] = first[izquierdo]
+            last[nodo] = last[izquierdo]
+            nullable[nodo] = nullable[izquierdo]
+
+            # Follow para +
+            for i in conjuntos.posiciones(last[nodo]):
+                follow_dict[i] |= first[nodo]
+        elif operador == OPCIONAL:
+            first[nodo] = first[izquierdo]
+            last[nodo] = last[izquierdo]
+            nullable[nodo] = True
+        elif operador == VACIO:
+            first[nodo] = last[nodo] = conjuntos.vacio()
+            nullable[nodo] = True
+
+    arbol.first = first
+    arbol.last = last
+
+# Obtener todos los nodos hoja del árbol (sus índices), de izquierda a derecha
+def obtener_hojas(arbol):
+    operadores = arbol.operador
+    return [actual for actual in recorrer_preorden(arbol) if operadores[actual] == HOJA]
+
+# Función para imprimir el árbol de expresión en forma visual con mayor claridad
+def imprimir_arbol_ordenado(arbol, prefijo="", es_izquierdo=True):
+    # Se imprime primero el hijo derecho, luego el nodo y al final el hijo izquierdo
+    pila = [(arbol.raiz, prefijo, es_izquierdo, False)]
+    while pila:
+        actual, prefijo, es_izquierdo, listo = pila.pop()
+        if actual == SIN_HIJO:
+            continue
+        if listo:
+            print(prefijo + ("└── " if es_izquierdo else "┌── ") + arbol.valor(actual))
+            continue
+        pila.append((arbol.izquierdo[actual], prefijo + ("    " if es_izquierdo else "│   "), True, False))
+        pila.append((actual, prefijo, es_izquierdo, True))
+        pila.append((arbol.derecho[actual], prefijo + ("│   " if es_izquierdo else "    "), False, False))
@@ -0,0 +1,223 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+
+from compilador import VERSION_COMPILADOR, CompiladorIncremental, compilar_gramatica
+from escaner import construir_escaner, construir_escaner_posiciones
+from instrumentacion import Instrumentacion
+from salidas import obtener_escritor
+
+# Caracteres que pueden formar el alfabeto de las gramáticas sintéticas (cada uno es un terminal 'x')
+CARACTERES_ALFABETO = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-*/<>=:;,.[]{}()!?#$%&@^_~|"
+
+# Generar una gramática sintética (texto con SETS y TOKENS) con la misma semilla siempre da la misma gramática.
+# Cada token es una alternación de "anchura" ramas; cada rama concatena dos subexpresiones de un nivel menos
+# de anidamiento, y en el último nivel hay terminales del alfabeto. densidad_estrella es la probabilidad de
+# que una subexpresión lleve "*".
+def generar_gramatica(tokens=20, anchura=2, profundidad=2, densidad_estrella=0.2, alfabeto=10, semilla=0):
+    if not 1 <= alfabeto <= len(CARACTERES_ALFABETO):
+        raise Exception(f"Error: El alfabeto debe tener entre 1 y {len(CARACTERES_ALFABETO)} caracteres")
+    if tokens < 1 or anchura < 1 or profundidad < 0:
+        raise Exception("Error: Parámetros de la gramática sintética no válidos")
+    aleatorio = random.Random(semilla)
+    caracteres = CARACTERES_ALFABETO[:alfabeto]
+
+    def estrella(expresion):
+        return expresion + " *" if aleatorio.random() < densidad_estrella else expresion
+
+    def subexpresion(nivel):
+        if nivel == 0:
+            return estrella(f"'{aleatorio.choice(caracteres)}'")
+        ramas = [" ".join(subexpresion(nivel - 1) for _ in range(2)) for _ in range(anchura)]
+        return estrella("( " + " | ".join(ramas) + " )")
+
+    lineas = ["SETS", f"\tCARACTER = {'+'.join(repr(caracter) for caracter in caracteres)}", "TOKENS"]
+    for numero in range(1, tokens + 1):
+        # El primer carácter fijo evita que todos los tokens empiecen igual
+        lineas.append(f"\tTOKEN {numero}= '{caracteres[numero % alfabeto]}' {subexpresion(profundidad)}")
+    lineas.append(f"\tTOKEN {tokens + 1}= CARACTER CARACTER *")
+    lineas.append(f"ERROR = {tokens + 2}")
+    return "\n".join(lineas) + "\n"
+
+# Generar un texto de entrada para el escáner con los caracteres del alfabeto separados por espacios
+def generar_entrada(alfabeto=10, largo=100000, semilla=0):
+    aleatorio = random.Random(semilla)
+    caracteres = CARACTERES_ALFABETO[:alfabeto] + " "
+    return "".join(aleatorio.choice(caracteres) for _ in range(largo))
+
+# Instrumentación del compilador que además de la duración de cada etapa mide su pico de memoria con tracemalloc
+class InstrumentacionMemoria(Instrumentacion):
+    def __init__(self, medir_memoria=True):
+        super().__init__()
+        self.medir_memoria = medir_memoria
+        self.memoria = {}  # Etapa -> pico de memoria en bytes
+
+    @contextmanager
+    def etapa(self, nombre):
+        if self.medir_memoria:
+            tracemalloc.start()
+        try:
+            with super().etapa(nombre):
+                yield self
+        finally:
+            if self.medir_memoria:
+                pico = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                self.memoria[nombre] = max(self.memoria.get(nombre, 0), pico)
+
+    # Duración y pico de memoria (None si no se midió) de cada etapa
+    def etapas_medidas(self):
+        return {nombre: {'segundos': segundos, 'memoria_pico': self.memoria.get(nombre)}
+                for nombre, segundos in self.reporte()['etapas'].items()}
+
+# Medir todas las etapas del compilador y del escáner con una gramática. La compilación es la de
+# compilador.compilar_gramatica (o la de CompiladorIncremental con incremental) con la instrumentación, así se
+# miden las mismas etapas que corren al compilar, con simplificar, procesos y vectorizada (NumPy). Con incremental
+# también se mide "recompilar", la compilación de la misma gramática con todos sus tokens ya construidos. Con
+# medir_posiciones también se mide el escáner del autómata de posiciones (sin AFD), para elegir el motor de cada
+# gramática.
+def medir_gramatica(contenido_gramatica, texto_entrada, conjuntos='bits', medir_memoria=True,
+                    medir_posiciones=False, vectorizada=False, simplificar=False, procesos=1, incremental=False):
+    instrumentacion = InstrumentacionMemoria(medir_memoria)
+    if incremental:
+        compilador = CompiladorIncremental(conjuntos, procesos)
+        resultado = compilador.compilar(contenido_gramatica, instrumentacion=instrumentacion, vectorizada=vectorizada)
+        with instrumentacion.etapa('recompilar'):
+            compilador.compilar(contenido_gramatica, vectorizada=vectorizada)
+    else:
+        resultado = compilar_gramatica(contenido_gramatica, conjuntos, procesos=procesos,
+                                       instrumentacion=instrumentacion, simplificar=simplificar,
+                                       vectorizada=vectorizada)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        with instrumentacion.etapa('salidas'):
+            obtener_escritor('fln', 'texto')(resultado.arbol, os.path.join(directorio, 'fln.txt'), resultado.conjuntos)
+            obtener_escritor('follow', 'texto')(resultado.follow_dict, os.path.join(directorio, 'follow.txt'),
+                                                resultado.conjuntos)
+            obtener_escritor('transiciones', 'texto')(resultado.tabla, resultado.estados,
+                                                      os.path.join(directorio, 'transiciones.txt'), resultado.conjuntos)
+
+    with instrumentacion.etapa('construir_escaner'):
+        escaner = construir_escaner(resultado, vectorizada=vectorizada)
+    with instrumentacion.etapa('escanear'):
+        total_tokens = sum(1 for _ in escaner.tokenizar(texto_entrada))
+
+    if medir_posiciones:
+        with instrumentacion.etapa('construir_escaner_posiciones'):
+            escaner_posiciones = construir_escaner_posiciones(resultado)
+        with instrumentacion.etapa('escanear_posiciones'):
+            tokens_posiciones = sum(1 for _ in escaner_posiciones.tokenizar(texto_entrada))
+        if tokens_posiciones != total_tokens:
+            raise Exception("Error: El autómata de posiciones y el AFD no dan la misma cantidad de tokens")
+
+    return {
+        'nodos': len(resultado.arbol),
+        'posiciones': resultado.total_hojas,
+        'estados': len(resultado.estados),
+        'estados_escaner': escaner.tabla.total_estados,
+        'clases_escaner': escaner.tabla.total_clases,
+        'caracteres_entrada': len(texto_entrada),
+        'tokens_entrada': total_tokens,
+        'etapas': instrumentacion.etapas_medidas(),
+    }
+
+# Juntar varias repeticiones de una medición quedándose con el menor tiempo y el mayor pico de memoria por etapa
+def combinar_repeticiones(mediciones):
+    combinada = dict(mediciones[0])
+    combinada['etapas'] = {}
+    for nombre in mediciones[0]['etapas']:
+        tiempos = [medicion['etapas'][nombre]['segundos'] for medicion in mediciones]
+        picos = [medicion['etapas'][nombre]['memoria_pico'] for medicion in mediciones]
+        combinada['etapas'][nombre] = {
+            'segundos': min(tiempos),
+            'memoria_pico': max(picos) if None not in picos else None,
+        }
+    return combinada
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="Mide cada etapa del compilador y del escáner con gramáticas sintéticas y guarda JSON. "
+                    "Con varios valores por parámetro se mide cada combinación.")
+    parser.add_argument('--tokens', type=int, nargs='+', default=[20], help="Cantidad de tokens")
+    parser.add_argument('--anchura', type=int, nargs='+', default=[2], help="Ramas de cada alternación")
+    parser.add_argument('--profundidad', type=int, nargs='+', default=[2], help="Niveles de anidamiento")
+    parser.add_argument('--densidad-estrella', type=float, nargs='+', default=[0.2],
+                        help="Probabilidad de que una subexpresión lleve *")
+    parser.add_argument('--alfabeto', type=int, nargs='+', default=[10], help="Cantidad de caracteres del alfabeto")
+    parser.add_argument('--entrada', type=int, default=100000, help="Largo del texto que se escanea")
+    parser.add_argument('--conjuntos', choices=['bits', 'set'], default='bits',
+                        help="Representación de los conjuntos de posiciones")
+    parser.add_argument('--repeticiones', type=int, default=1, help="Repeticiones de cada medición (se toma el mínimo)")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla de las gramáticas y entradas")
+    parser.add_argument('--sin-memoria', action='store_true',
+                        help="No medir el pico de memoria (tracemalloc hace más lentas las etapas)")
+    parser.add_argument('--posiciones', action='store_true',
+                        help="Medir también el escáner del autómata de posiciones (máscaras de bits, sin AFD)")
+    parser.add_argument('--numpy', action='store_true', help="Hacer la construcción de subconjuntos con NumPy")
+    parser.add_argument('--simplificar', action='store_true',
+                        help="Simplificar y factorizar el árbol antes de numerar las hojas")
+    parser.add_argument('--procesos', type=int, default=1, help="Procesos para construir los tokens en paralelo")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Compilar con el compilador incremental y medir también la recompilación sin cambios")
+    parser.add_argument('--salida', help="Ruta del archivo JSON (por defecto se escribe en la salida estándar)")
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+
+    resultados = []
+    combinaciones = itertools.product(args.tokens, args.anchura, args.profundidad, args.densidad_estrella,
+                                      args.alfabeto)
+    for tokens, anchura, profundidad, densidad_estrella, alfabeto in combinaciones:
+        parametros = {'tokens': tokens, 'anchura': anchura, 'profundidad': profundidad,
+                      'densidad_estrella': densidad_estrella, 'alfabeto': alfabeto}
+        try:
+            gramatica = generar_gramatica(semilla=args.semilla, **parametros)
+        except Exception as e:
+            print(e)
+            return 1
+        entrada = generar_entrada(alfabeto, args.entrada, args.semilla)
+        mediciones = [medir_gramatica(gramatica, entrada, args.conjuntos, not args.sin_memoria, args.posiciones,
+                                      args.numpy, args.simplificar, args.procesos, args.incremental)
+                      for _ in range(max(1, args.repeticiones))]
+        resultado = {'parametros': parametros}
+        resultado.update(combinar_repeticiones(mediciones))
+        resultados.append(resultado)
+        print(f"{parametros}: {resultado['posiciones']} posiciones, {resultado['estados']} estados", file=sys.stderr)
+
+    reporte = {
+        'version': VERSION_COMPILADOR,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'conjuntos': args.conjuntos,
+        'memoria': not args.sin_memoria,
+        'repeticiones': args.repeticiones,
+        'numpy': args.numpy,
+        'simplificar': args.simplificar,
+        'procesos': args.procesos,
+        'incremental': args.incremental,
+        'semilla': args.semilla,
+        'resultados': resultados,
+    }
+    texto = json.dumps(reporte, indent=2, ensure_ascii=False)
+    if args.salida:
+        try:
+            with open(args.salida, 'w') as archivo:
+                archivo.write(texto + '\n')
+        except OSError as e:
+            print(f"Ocurrió un error al intentar guardar el archivo: {e}")
+            return 1
+        print(f"Resultados guardados exitosamente en {args.salida}", file=sys.stderr)
+    else:
+        print(texto)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
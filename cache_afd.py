@@ -0,0 +1,124 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from compilador import VERSION_COMPILADOR
+from tabla_densa import ClasesCaracteres, TablaDensa
+
+# Formato del archivo de caché (.lfad):
+#   MAGIA (4 bytes) | FORMATO (uint32) | largo de la cabecera (uint32) | cabecera JSON | relleno hasta múltiplo de 8
+#   | arreglos int32 en el orden de "arreglos" de la cabecera
+# La cabecera guarda la versión del compilador, la llave de la gramática, el orden de bytes, el mapa de clases
+# y los metadatos (símbolos de las hojas y marcadores como pares [posición, valor], token de error). El mapa de
+# clases de una tabla por caracteres va como tramos [inicio, fin, clase] de códigos ("tramos"); el de una tabla
+# por símbolos, como diccionario ("clase_entrada").
+MAGIA = b'LFAD'
+FORMATO = 3
+EXTENSION = '.lfad'
+ARREGLOS = ['transiciones', 'aceptacion', 'filas', 'aceptacion_filas']
+
+# Función para calcular la llave de una gramática: hash del texto, la versión del compilador y las opciones
+def clave_gramatica(contenido_gramatica, opciones=""):
+    datos = f"{VERSION_COMPILADOR}\n{opciones}\n{contenido_gramatica}".encode('utf-8')
+    return hashlib.sha256(datos).hexdigest()
+
+def ruta_cache(directorio_cache, clave):
+    return os.path.join(directorio_cache, clave + EXTENSION)
+
+# Serializar la tabla densa (y las filas ya preparadas del escáner) en el formato de caché
+def serializar_artefacto(clave, tabla, filas, aceptacion_filas, metadatos):
+    arreglos = {
+        'transiciones': array('i', tabla.transiciones),
+        'aceptacion': array('i', tabla.aceptacion),
+        'filas': array('i', filas),
+        'aceptacion_filas': array('i', aceptacion_filas),
+    }
+    if isinstance(tabla.clase_entrada, ClasesCaracteres):
+        mapa_clases = {'tramos': tabla.clase_entrada.tramos}
+    else:
+        mapa_clases = {'clase_entrada': tabla.clase_entrada}
+    cabecera = json.dumps({
+        'version': VERSION_COMPILADOR,
+        'clave': clave,
+        'orden_bytes': sys.byteorder,
+        'total_clases': tabla.total_clases,
+        **mapa_clases,
+        'largos': {nombre: len(arreglos[nombre]) for nombre in ARREGLOS},
+        'metadatos': metadatos,
+    }).encode('utf-8')
+
+    inicio_arreglos = 12 + len(cabecera)
+    relleno = (-inicio_arreglos) % 8
+    partes = [MAGIA + struct.pack('<II', FORMATO, len(cabecera)), cabecera, b'\0' * relleno]
+    partes.extend(arreglos[nombre].tobytes() for nombre in ARREGLOS)
+    return b''.join(partes)
+
+# Guardar la tabla densa (y las filas ya preparadas del escáner) en un archivo de caché
+def guardar_artefacto(ruta, clave, tabla, filas, aceptacion_filas, metadatos):
+    datos = serializar_artefacto(clave, tabla, filas, aceptacion_filas, metadatos)
+
+    # Se escribe a un archivo temporal y se reemplaza, así nunca queda un archivo de caché a medias
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    ruta_temporal = ruta + '.tmp'
+    with open(ruta_temporal, 'wb') as archivo:
+        archivo.write(datos)
+    os.replace(ruta_temporal, ruta)
+
+# Cargar un archivo de caché. Con usar_mmap los arreglos son vistas del archivo mapeado en memoria, así el tiempo
+# de carga no depende del tamaño de la tabla. Devuelve (tabla, filas, aceptacion_filas, metadatos) o None si el
+# archivo no existe o es de otra versión, otra gramática u otro orden de bytes.
+def cargar_artefacto(ruta, clave, usar_mmap=True):
+    try:
+        with open(ruta, 'rb') as archivo:
+            if usar_mmap:
+                datos = memoryview(mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                datos = memoryview(archivo.read())
+    except (OSError, ValueError):
+        return None
+    return leer_artefacto(datos, clave)
+
+# Leer un artefacto desde un búfer (archivo mapeado, bytes o memoria compartida) sin copiar los arreglos: son
+# vistas del búfer. Puede haber bytes de más al final (la memoria compartida se redondea a páginas).
+def leer_artefacto(datos, clave):
+    datos = memoryview(datos)
+    if len(datos) < 12 or bytes(datos[:4]) != MAGIA:
+        return None
+    formato, largo_cabecera = struct.unpack('<II', datos[4:12])
+    if formato != FORMATO:
+        return None
+    try:
+        cabecera = json.loads(bytes(datos[12:12 + largo_cabecera]).decode('utf-8'))
+        return leer_arreglos(datos, clave, cabecera, 12 + largo_cabecera)
+    except (ValueError, KeyError, TypeError):  # Cabecera corrupta o de otro formato: se vuelve a compilar
+        return None
+
+# Armar la tabla a partir de la cabecera ya leída; None si no corresponde a esta versión, gramática u orden de
+# bytes, o si el búfer es más corto que los arreglos que declara
+def leer_arreglos(datos, clave, cabecera, desplazamiento):
+    if (cabecera['version'] != VERSION_COMPILADOR or cabecera['clave'] != clave or
+            cabecera['orden_bytes'] != sys.byteorder):
+        return None
+
+    desplazamiento += (-desplazamiento) % 8
+    arreglos = {}
+    for nombre in ARREGLOS:
+        total = cabecera['largos'][nombre]
+        if not isinstance(total, int) or total < 0 or desplazamiento + total * 4 > len(datos):
+            return None
+        largo = total * 4
+        arreglos[nombre] = datos[desplazamiento:desplazamiento + largo].cast('i')
+        desplazamiento += largo
+
+    if 'tramos' in cabecera:
+        clase_entrada = ClasesCaracteres(cabecera['tramos'])
+    else:
+        clase_entrada = cabecera['clase_entrada']
+    tabla = TablaDensa(arreglos['transiciones'], arreglos['aceptacion'], cabecera['total_clases'], clase_entrada)
+    return tabla, arreglos['filas'], arreglos['aceptacion_filas'], cabecera['metadatos']
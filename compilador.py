@@ -0,0 +1,355 @@
+import argparse
+import pickle
+import sys
+
+from arbol import calcular_conjuntos, construir_arbol, imprimir_arbol_ordenado
+from conjuntos import obtener_conjuntos
+from fragmentos import construir_fragmentos, unir_fragmentos
+from instrumentacion import Instrumentacion, sin_instrumentacion
+from minimizacion import minimizar_afd
+from gramatica import (TablaSimbolos, extraer_expresion_regular, extraer_sets, extraer_token_error,
+                       guardar_expresion_regular_tokens, leer_archivo, nombrar, partes_token, simbolizar)
+from salidas import FORMATOS, obtener_escritor
+from tabla_densa import construir_tabla_densa
+from transiciones import (calcular_aceptacion, generar_tabla_transiciones, obtener_alfabeto, obtener_marcadores,
+                          obtener_simbolos_hoja)
+
+# Versión del compilador: forma parte de la llave de los AFD guardados en caché
+VERSION_COMPILADOR = "1.5"
+
+# Resultado de compilar una gramática: árbol, conjuntos y tabla de transiciones
+class ResultadoCompilacion:
+    def __init__(self, expresion, arbol, total_hojas, follow_dict, simbolos_hoja, transiciones, estados,
+                 tokens_extraidos=None, expresion_original=None, conjuntos=None, marcadores=None, aceptacion=None):
+        self.expresion = expresion  # Expresión con los nombres de los símbolos (a1, b2, ...)
+        self.arbol = arbol
+        self.total_hojas = total_hojas
+        self.follow_dict = follow_dict
+        self.simbolos_hoja = simbolos_hoja  # Número de hoja -> símbolo
+        self.transiciones = transiciones
+        self.tabla = None  # Tabla densa por clases de símbolos, se arma al final de la compilación
+        self.estados = estados
+        self.tokens_extraidos = tokens_extraidos  # Lista de (número, expresión) leída de la gramática
+        self.expresion_original = expresion_original  # Expresión con los terminales originales
+        self.conjuntos = conjuntos  # Representación usada para los conjuntos de posiciones ('set' o 'bits')
+        self.marcadores = marcadores  # Posición del marcador Tn -> número de token
+        self.aceptacion = aceptacion  # Id de estado -> token que acepta (None si no acepta)
+        self.estados_sin_minimizar = len(estados)  # Cantidad de estados antes de minimizar
+        self.sets = {}  # Nombre del SET -> rangos de códigos, para ejecutar el autómata sobre texto
+        self.token_error = None  # Número del token de error (ERROR = n) si la gramática lo define
+
+# Compilar una expresión ya convertida a letras: árbol, First/Last/Nullable/Follow y transiciones en una sola pasada
+# La expresión también puede ser la lista de partes con ids de tabla_simbolos (ver gramatica.simbolizar).
+# Con generar_afd en False se omite la construcción de subconjuntos (para el AFD perezoso, que la hace al escanear)
+# instrumentacion es una Instrumentacion para medir cada etapa (por defecto no se mide nada)
+# Con simplificar el árbol se simplifica y factoriza antes de numerar las hojas (ver arbol.simplificar_arbol)
+# Con vectorizada la construcción de subconjuntos se hace con NumPy (ver generar_tabla_transiciones_numpy)
+def compilar_expresion(expresion, tokens_extraidos=None, expresion_original=None, conjuntos='bits', minimizar=False,
+                       generar_afd=True, tabla_simbolos=None, instrumentacion=sin_instrumentacion,
+                       simplificar=False, vectorizada=False):
+    conjuntos = obtener_conjuntos(conjuntos)
+    with instrumentacion.etapa('construir_arbol'):
+        arbol, total_hojas = construir_arbol(expresion, tabla_simbolos, simplificar)
+    if not isinstance(expresion, str):
+        expresion = nombrar(expresion, arbol.tabla_simbolos)
+
+    with instrumentacion.etapa('calcular_conjuntos'):
+        # Diccionario para almacenar los follow de cada nodo hoja numerado
+        follow_dict = {i: conjuntos.vacio() for i in range(1, total_hojas + 1)}
+        calcular_conjuntos(arbol, follow_dict, conjuntos)
+
+    return completar_compilacion(expresion, arbol, total_hojas, follow_dict, conjuntos, tokens_extraidos,
+                                 expresion_original, minimizar, generar_afd, instrumentacion, vectorizada)
+
+# Terminar la compilación de un árbol con sus conjuntos ya calculados: transiciones, aceptación y tabla densa
+def completar_compilacion(expresion, arbol, total_hojas, follow_dict, conjuntos, tokens_extraidos=None,
+                          expresion_original=None, minimizar=False, generar_afd=True,
+                          instrumentacion=sin_instrumentacion, vectorizada=False):
+    simbolos_hoja = obtener_simbolos_hoja(arbol)
+    with instrumentacion.etapa('generar_tabla_transiciones'):
+        if generar_afd:
+            transiciones, estados = generar_tabla_transiciones(arbol, follow_dict, total_hojas, simbolos_hoja,
+                                                               conjuntos, vectorizada=vectorizada)
+        else:
+            transiciones, estados = [], []
+
+        marcadores = obtener_marcadores(simbolos_hoja, arbol.tabla_simbolos)
+        aceptacion = calcular_aceptacion(estados, marcadores, conjuntos)
+
+    resultado = ResultadoCompilacion(expresion, arbol, total_hojas, follow_dict, simbolos_hoja, transiciones, estados,
+                                     tokens_extraidos, expresion_original, conjuntos, marcadores, aceptacion)
+    if minimizar:
+        with instrumentacion.etapa('minimizar'):
+            minimizar_resultado(resultado)
+    with instrumentacion.etapa('tabla_densa'):
+        resultado.tabla = construir_tabla_densa(resultado.transiciones, resultado.aceptacion,
+                                                {simbolo: simbolo for simbolo in obtener_alfabeto(simbolos_hoja)})
+
+    if instrumentacion.activa:
+        registrar_datos(instrumentacion, resultado)
+    return resultado
+
+# Registrar las cantidades de un resultado en la instrumentación (el Follow más grande se busca solo aquí)
+def registrar_datos(instrumentacion, resultado):
+    conjuntos = resultado.conjuntos
+    tamanos_follow = [conjuntos.tamano(follow) for follow in resultado.follow_dict.values()]
+    instrumentacion.registrar(
+        nodos=len(resultado.arbol),
+        hojas=resultado.total_hojas,
+        simbolos=len(resultado.arbol.tabla_simbolos),
+        follow_maximo=max(tamanos_follow, default=0),
+        estados=resultado.estados_sin_minimizar,
+        estados_finales=len(resultado.estados),
+        clases=resultado.tabla.total_clases,
+        tamano_tabla=len(resultado.tabla.transiciones),
+        bytes_tabla=len(resultado.tabla.transiciones) * resultado.tabla.transiciones.itemsize,
+    )
+
+# Reemplazar la tabla de transiciones del resultado por la del AFD mínimo
+def minimizar_resultado(resultado):
+    simbolos_marcadores = {resultado.simbolos_hoja[pos] for pos in resultado.marcadores}
+    alfabeto = [simbolo for simbolo in obtener_alfabeto(resultado.simbolos_hoja) if simbolo not in simbolos_marcadores]
+    resultado.transiciones, resultado.estados, resultado.aceptacion = minimizar_afd(
+        resultado.transiciones, resultado.estados, resultado.aceptacion, alfabeto, resultado.conjuntos)
+
+# Compilar el contenido de un archivo de gramática (sección TOKENS)
+# Con procesos mayor que 1 los tokens se compilan en paralelo (ver CompiladorIncremental); el resultado es el mismo.
+# Con simplificar se compila siempre el árbol completo, porque la factorización junta partes de varios tokens.
+def compilar_gramatica(contenido_gramatica, conjuntos='bits', minimizar=False, generar_afd=True, procesos=1,
+                       instrumentacion=sin_instrumentacion, simplificar=False, vectorizada=False):
+    if procesos > 1 and not simplificar:
+        return CompiladorIncremental(conjuntos, procesos).compilar(contenido_gramatica, minimizar, generar_afd,
+                                                                   instrumentacion, vectorizada)
+
+    with instrumentacion.etapa('tokenizar'):
+        tokens_extraidos = extraer_expresion_regular(contenido_gramatica)
+        if not tokens_extraidos:
+            raise Exception("Error: No se encontraron tokens en la gramática")
+
+        # Los tokens se separan en partes una sola vez y los terminales pasan directo a ids de la tabla de símbolos
+        partes_tokens = [partes_token(numero_token, expresion_token)
+                         for numero_token, expresion_token in tokens_extraidos]
+        partes = []
+        for partes_de_token in partes_tokens:
+            if partes:
+                partes.append('|')
+            partes.extend(partes_de_token)
+        expresion_original = ''.join(partes)
+
+        tabla_simbolos = TablaSimbolos()
+        partes = simbolizar(partes, tabla_simbolos)
+    resultado = compilar_expresion(partes, tokens_extraidos, expresion_original, conjuntos, minimizar, generar_afd,
+                                   tabla_simbolos, instrumentacion, simplificar, vectorizada)
+    resultado.sets = extraer_sets(contenido_gramatica)
+    resultado.token_error = extraer_token_error(contenido_gramatica)
+    return resultado
+
+# Compilador que guarda el árbol de cada token (con First, Last, Nullable y su Follow interno), con la expresión
+# del token como llave. Al recompilar una gramática solo se construyen los tokens cuya expresión cambió; los demás
+# se desplazan a su nueva posición, se vuelve a hacer la unión con "|" y se genera la tabla de transiciones.
+# Con procesos mayor que 1 los tokens que hay que construir se reparten en un ProcessPoolExecutor.
+class CompiladorIncremental:
+    def __init__(self, conjuntos='bits', procesos=1):
+        self.conjuntos = obtener_conjuntos(conjuntos)
+        self.procesos = procesos
+        self.fragmentos = {}  # Texto del token -> Fragmento
+        self.tabla_simbolos = TablaSimbolos()  # Tabla de símbolos compartida por todos los fragmentos
+        self.tokens_recompilados = 0  # Tokens que se construyeron en la última compilación
+
+    def compilar(self, contenido_gramatica, minimizar=False, generar_afd=True, instrumentacion=sin_instrumentacion,
+                 vectorizada=False):
+        with instrumentacion.etapa('tokenizar'):
+            tokens_extraidos = extraer_expresion_regular(contenido_gramatica)
+            if not tokens_extraidos:
+                raise Exception("Error: No se encontraron tokens en la gramática")
+
+            partes_tokens = {}  # Texto del token -> partes, en el orden de la gramática
+            expresiones = []
+            for numero_token, expresion_token in tokens_extraidos:
+                partes = partes_token(numero_token, expresion_token)
+                expresion = ''.join(partes)
+                partes_tokens.setdefault(expresion, partes)
+                expresiones.append(expresion)
+
+        # Construir el árbol, First, Last, Nullable y Follow de los tokens nuevos
+        with instrumentacion.etapa('construir_fragmentos'):
+            if any(expresion not in partes_tokens for expresion in self.fragmentos):
+                self.compactar_simbolos(expresiones, partes_tokens)
+            nuevas = [partes for expresion, partes in partes_tokens.items() if expresion not in self.fragmentos]
+            for fragmento in construir_fragmentos(nuevas, self.conjuntos, self.tabla_simbolos, self.procesos):
+                self.fragmentos[fragmento.expresion] = fragmento
+            self.tokens_recompilados = len(nuevas)
+            fragmentos = [self.fragmentos[expresion] for expresion in expresiones]
+
+            # Olvidar los tokens que ya no están en la gramática
+            self.fragmentos = {fragmento.expresion: fragmento for fragmento in fragmentos}
+        instrumentacion.registrar(tokens_recompilados=self.tokens_recompilados)
+
+        with instrumentacion.etapa('unir_fragmentos'):
+            arbol, total_hojas, follow_dict = unir_fragmentos(fragmentos, self.conjuntos, self.tabla_simbolos)
+        expresion_original = "|".join(expresiones)
+        expresion = "|".join(nombrar(simbolizar(partes_tokens[expresion], self.tabla_simbolos), self.tabla_simbolos)
+                             for expresion in expresiones)
+        resultado = completar_compilacion(expresion, arbol, total_hojas, follow_dict, self.conjuntos,
+                                          tokens_extraidos, expresion_original, minimizar, generar_afd,
+                                          instrumentacion, vectorizada)
+        resultado.sets = extraer_sets(contenido_gramatica)
+        resultado.token_error = extraer_token_error(contenido_gramatica)
+        return resultado
+
+    # Olvidar los tokens que ya no están en la gramática y armar de nuevo la tabla de símbolos, en el mismo orden
+    # que una compilación completa, así los terminales que solo usaban esos tokens no quedan en la guía de
+    # --tokens ni en la cantidad de símbolos. Los fragmentos que quedan pasan sus ids a la tabla nueva.
+    def compactar_simbolos(self, expresiones, partes_tokens):
+        tabla_simbolos = TablaSimbolos()
+        for expresion in expresiones:
+            simbolizar(partes_tokens[expresion], tabla_simbolos)
+        self.fragmentos = {expresion: fragmento for expresion, fragmento in self.fragmentos.items()
+                           if expresion in partes_tokens}
+        for fragmento in self.fragmentos.values():
+            fragmento.compartir_simbolos(tabla_simbolos)
+        self.tabla_simbolos = tabla_simbolos
+
+    # Guardar los tokens compilados en un archivo para usarlos en la siguiente ejecución
+    def guardar(self, ruta):
+        estado = {'version': VERSION_COMPILADOR, 'conjuntos': self.conjuntos.nombre, 'fragmentos': self.fragmentos,
+                  'tabla_simbolos': self.tabla_simbolos}
+        with open(ruta, 'wb') as archivo:
+            pickle.dump(estado, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+# Cargar un compilador incremental guardado; si no existe, es de otra versión o representación, o no se puede leer
+# (archivo dañado, clases que ya no existen, ...), empieza vacío
+def cargar_compilador_incremental(ruta, conjuntos='bits'):
+    compilador = CompiladorIncremental(conjuntos)
+    try:
+        with open(ruta, 'rb') as archivo:
+            estado = pickle.load(archivo)
+        if estado.get('version') != VERSION_COMPILADOR or estado.get('conjuntos') != compilador.conjuntos.nombre:
+            return compilador
+        fragmentos, tabla_simbolos = estado['fragmentos'], estado['tabla_simbolos']
+    except Exception:
+        return CompiladorIncremental(conjuntos)
+    compilador.fragmentos = fragmentos
+    compilador.tabla_simbolos = tabla_simbolos
+    return compilador
+
+# Compilar un archivo de gramática, devuelve None si no se pudo leer
+def compilar_archivo(ruta_gramatica, conjuntos='bits', minimizar=False, generar_afd=True, procesos=1,
+                     instrumentacion=sin_instrumentacion, simplificar=False, vectorizada=False):
+    contenido_gramatica = leer_archivo(ruta_gramatica)
+    if not contenido_gramatica:
+        return None
+    return compilar_gramatica(contenido_gramatica, conjuntos, minimizar, generar_afd, procesos, instrumentacion,
+                              simplificar, vectorizada)
+
+# Guardar solo las salidas intermedias que se pidan (las rutas en None se omiten)
+# formato es el de las tablas FLN, Follow y de transiciones: 'texto', 'csv', 'jsonl' o 'binario'
+def guardar_salidas(resultado, ruta_tokens=None, ruta_fln=None, ruta_follow=None, ruta_transiciones=None,
+                    instrumentacion=sin_instrumentacion, formato='texto'):
+    with instrumentacion.etapa('salidas'):
+        if ruta_tokens and resultado.tokens_extraidos:
+            guardar_expresion_regular_tokens(ruta_tokens, resultado.tokens_extraidos, resultado.expresion_original,
+                                             resultado.expresion, resultado.arbol.tabla_simbolos)
+        if ruta_fln:
+            obtener_escritor('fln', formato)(resultado.arbol, ruta_fln, resultado.conjuntos)
+            print(f"Tabla guardada exitosamente en {ruta_fln}")
+        if ruta_follow:
+            obtener_escritor('follow', formato)(resultado.follow_dict, ruta_follow, resultado.conjuntos)
+            print(f"Tabla de Follow guardada exitosamente en {ruta_follow}")
+        if ruta_transiciones:
+            obtener_escritor('transiciones', formato)(resultado.tabla, resultado.estados, ruta_transiciones,
+                                                      resultado.conjuntos)
+            print(f"Tabla de transiciones guardada exitosamente en {ruta_transiciones}")
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Compila los TOKENS de una gramática a su tabla de transiciones.")
+    entrada = parser.add_mutually_exclusive_group(required=True)
+    entrada.add_argument('gramatica', nargs='?', help="Ruta del archivo de gramática")
+    entrada.add_argument('--expresion', help="Expresión ya convertida a letras (a1, b2, ...) en lugar de una gramática")
+    parser.add_argument('--tokens', help="Ruta de salida de la expresión de tokens (salidatokens.txt)")
+    parser.add_argument('--fln', help="Ruta de salida de la tabla First/Last/Nullable")
+    parser.add_argument('--follow', help="Ruta de salida de la tabla de Follow")
+    parser.add_argument('--transiciones', help="Ruta de salida de la tabla de transiciones")
+    parser.add_argument('--formato', choices=FORMATOS, default='texto',
+                        help="Formato de las tablas FLN, Follow y de transiciones")
+    parser.add_argument('--conjuntos', choices=['bits', 'set'], default='bits',
+                        help="Representación de los conjuntos de posiciones (enteros de bits o set de Python)")
+    parser.add_argument('--minimizar', action='store_true',
+                        help="Minimizar el AFD antes de guardar la tabla de transiciones")
+    parser.add_argument('--arbol', action='store_true', help="Imprimir el árbol de expresión")
+    parser.add_argument('--simplificar', action='store_true',
+                        help="Simplificar el árbol y factorizar prefijos comunes antes de numerar las posiciones")
+    parser.add_argument('--numpy', action='store_true',
+                        help="Construir los subconjuntos con NumPy (conviene con estados de muchas posiciones)")
+    parser.add_argument('--procesos', type=int, default=1,
+                        help="Compilar los tokens en paralelo con esta cantidad de procesos")
+    parser.add_argument('--incremental', metavar='ARCHIVO',
+                        help="Guardar en este archivo los tokens compilados y recompilar solo los que cambiaron")
+    parser.add_argument('--instrumentar', action='store_true',
+                        help="Medir cada etapa y escribir el reporte como una línea JSON (en stderr o en --log)")
+    parser.add_argument('--log', metavar='ARCHIVO', help="Con --instrumentar, agregar el reporte a este archivo")
+    parser.add_argument('--perfilar', metavar='ETAPA',
+                        help="Capturar una etapa con cProfile (tokenizar, construir_arbol, calcular_conjuntos, "
+                             "generar_tabla_transiciones, minimizar, tabla_densa, salidas, ...)")
+    parser.add_argument('--perfil', metavar='ARCHIVO', help="Con --perfilar, guardar el perfil en formato de pstats")
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    instrumentacion = sin_instrumentacion
+    if args.instrumentar or args.perfilar:
+        instrumentacion = Instrumentacion(perfilar=args.perfilar)
+
+    try:
+        if args.expresion:
+            resultado = compilar_expresion(args.expresion, conjuntos=args.conjuntos, minimizar=args.minimizar,
+                                           instrumentacion=instrumentacion, simplificar=args.simplificar,
+                                           vectorizada=args.numpy)
+        elif args.incremental:
+            if args.simplificar:
+                print("--simplificar no se puede usar con --incremental.")
+                return 1
+            contenido_gramatica = leer_archivo(args.gramatica)
+            if not contenido_gramatica:
+                print("No se pudo leer el archivo de gramática.")
+                return 1
+            compilador = cargar_compilador_incremental(args.incremental, args.conjuntos)
+            compilador.procesos = args.procesos
+            resultado = compilador.compilar(contenido_gramatica, args.minimizar, instrumentacion=instrumentacion,
+                                            vectorizada=args.numpy)
+            compilador.guardar(args.incremental)
+            print(f"Tokens recompilados: {compilador.tokens_recompilados} de {len(resultado.tokens_extraidos)}")
+        else:
+            resultado = compilar_archivo(args.gramatica, args.conjuntos, args.minimizar, procesos=args.procesos,
+                                         instrumentacion=instrumentacion, simplificar=args.simplificar,
+                                         vectorizada=args.numpy)
+            if resultado is None:
+                print("No se pudo leer el archivo de gramática.")
+                return 1
+    except Exception as e:
+        print(e)
+        return 1
+
+    if args.arbol:
+        imprimir_arbol_ordenado(resultado.arbol)
+
+    guardar_salidas(resultado, args.tokens, args.fln, args.follow, args.transiciones, instrumentacion, args.formato)
+    print(f"Posiciones: {resultado.total_hojas}, estados: {resultado.estados_sin_minimizar}")
+    if args.minimizar:
+        print(f"Estados después de minimizar: {len(resultado.estados)}")
+
+    if instrumentacion.activa:
+        try:
+            instrumentacion.escribir_reporte(args.log)
+            if args.perfil:
+                instrumentacion.guardar_perfil(args.perfil)
+        except OSError as e:
+            print(f"Ocurrió un error al intentar guardar el reporte: {e}")
+            return 1
+        except Exception as e:
+            print(e)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
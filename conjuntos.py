@@ -0,0 +1,84 @@
+# Representaciones de los conjuntos de posiciones (first, last, follow y estados).
+# Ambas soportan la unión con el operador "|" (y "|=" dentro de diccionarios),
+# así que el cálculo de conjuntos y la construcción de subconjuntos no dependen de cuál se use.
+
+# Conjuntos de Python: {1, 2, 3}
+class ConjuntosPython:
+    nombre = 'set'
+
+    def vacio(self):
+        return set()
+
+    def unitario(self, posicion):
+        return {posicion}
+
+    # Recorrer las posiciones del conjunto (sin orden garantizado)
+    def posiciones(self, conjunto):
+        return conjunto
+
+    # Posiciones ordenadas de menor a mayor
+    def ordenados(self, conjunto):
+        return sorted(conjunto)
+
+    # Llave inmutable y canónica para identificar un estado
+    def clave(self, conjunto):
+        return frozenset(conjunto)
+
+    def tamano(self, conjunto):
+        return len(conjunto)
+
+    # Sumar desplazamiento a todas las posiciones
+    def desplazar(self, conjunto, desplazamiento):
+        return {posicion + desplazamiento for posicion in conjunto}
+
+# Enteros usados como mapa de bits: la posición p está en el conjunto si el bit p está encendido
+class ConjuntosBits:
+    nombre = 'bits'
+
+    def vacio(self):
+        return 0
+
+    def unitario(self, posicion):
+        return 1 << posicion
+
+    # Recorrer las posiciones apagando el bit más bajo en cada paso
+    def posiciones(self, conjunto):
+        while conjunto:
+            bit_bajo = conjunto & -conjunto
+            yield bit_bajo.bit_length() - 1
+            conjunto ^= bit_bajo
+
+    # Las posiciones salen de menor a mayor, no hace falta ordenarlas
+    def ordenados(self, conjunto):
+        return list(self.posiciones(conjunto))
+
+    # El entero ya es inmutable y canónico
+    def clave(self, conjunto):
+        return conjunto
+
+    def tamano(self, conjunto):
+        return bin(conjunto).count('1')
+
+    def desplazar(self, conjunto, desplazamiento):
+        return conjunto << desplazamiento
+
+conjuntos_python = ConjuntosPython()
+conjuntos_bits = ConjuntosBits()
+
+backends_conjuntos = {
+    conjuntos_python.nombre: conjuntos_python,
+    conjuntos_bits.nombre: conjuntos_bits,
+}
+
+# Función para obtener la representación de conjuntos por su nombre ('set' o 'bits')
+def obtener_conjuntos(nombre):
+    if nombre not in backends_conjuntos:
+        raise Exception(f"Error: Representación de conjuntos no reconocida: {nombre}")
+    return backends_conjuntos[nombre]
+
+# Función para escribir un conjunto como lo hace str(set), con las posiciones ordenadas
+def formatear_conjunto(conjuntos, conjunto):
+    posiciones = conjuntos.ordenados(conjunto)
+    if not posiciones:
+        return "set()"
+    return "{" + ", ".join(str(posicion) for posicion in posiciones) + "}"
@@ -0,0 +1,593 @@
+import argparse
+import mmap
+import re
+import sys
+import time
+from array import array
+
+from cache_afd import cargar_artefacto, clave_gramatica, guardar_artefacto, ruta_cache
+from compilador import compilar_archivo, compilar_gramatica
+from gramatica import EPSILON, leer_archivo, partes_expresion, rangos_terminal
+from minimizacion import minimizar_afd
+from perezoso import CAPACIDAD, AFDPerezoso
+from posiciones import BITS_BLOQUE, AutomataPosiciones
+from tabla_densa import SIN_TRANSICION, ClasesCaracteres, construir_tabla_densa
+from tokens_compactos import TokensCompactos
+from transiciones import calcular_aceptacion, generar_tabla_transiciones
+
+# Caracteres que se saltan entre tokens cuando ningún token empieza con ellos
+IGNORAR = " \t\r\n"
+
+# Tamaño de los bloques que se leen del archivo en el modo por flujo
+TAMANO_BLOQUE = 1 << 20
+
+# Escáner que ejecuta el AFD sobre texto con la regla de la coincidencia más larga.
+# tabla es una TablaDensa por clases de caracteres. Antes de escanear, la entrada se traduce a clases
+# (bytes.translate, sin recorrerla en Python) y cada paso es leer el destino en la lista de filas.
+class Escaner:
+    # filas y aceptacion_filas se pueden dar ya preparadas (por ejemplo, cargadas de la caché)
+    def __init__(self, tabla, token_error=None, ignorar=IGNORAR, filas=None, aceptacion_filas=None):
+        self.tabla = tabla
+        self.token_error = token_error  # Token que se devuelve para un carácter que no inicia ningún token
+        self.ignorar = ignorar
+        if filas is None:
+            self.preparar_filas()
+        else:
+            self.filas = filas
+            self.aceptacion_filas = aceptacion_filas
+        self.preparar_traduccion()
+
+    # Copiar la tabla a listas donde cada destino ya es el inicio de su fila (estado * total_clases),
+    # así el paso es filas[fila + clase] sin multiplicar. aceptacion_filas se indexa con el inicio de la fila.
+    def preparar_filas(self):
+        tabla = self.tabla
+        total_clases = tabla.total_clases
+        self.filas = [destino * total_clases if destino >= 0 else SIN_TRANSICION for destino in tabla.transiciones]
+        self.aceptacion_filas = [SIN_TRANSICION] * len(self.filas)
+        for estado in range(tabla.total_estados):
+            self.aceptacion_filas[estado * total_clases] = tabla.aceptacion[estado]
+
+    def preparar_traduccion(self):
+        tabla = self.tabla
+        self.traduccion = None  # Tabla de bytes.translate: byte -> clase (si hay a lo más 256 clases)
+        if tabla.clase_byte is not None and tabla.total_clases <= 256:
+            self.traduccion = bytes(list(tabla.clase_byte))
+        # Con más de 256 clases las clases van en un array (siempre del mismo tipo, para poder concatenar bloques)
+        self.tipo_clases = 'H' if tabla.total_clases <= 1 << 16 else 'I'
+
+    # Traducir bytes a la secuencia de sus clases (bytes, o array si hay más de 256 clases)
+    def clases_bytes(self, datos):
+        if self.traduccion is not None:
+            return bytes(datos).translate(self.traduccion)
+        return array(self.tipo_clases, map(self.tabla.clase_byte.__getitem__, datos))
+
+    # Traducir texto a la secuencia de sus clases (los caracteres fuera de Latin-1 se buscan uno por uno)
+    def clases_texto(self, texto):
+        try:
+            return self.clases_bytes(texto.encode('latin-1'))
+        except UnicodeEncodeError:
+            clase = self.tabla.clase_entrada.clase
+            return [clase(caracter) for caracter in texto]
+
+    # Devuelve (token, inicio, fin) por cada token del texto, sin copiar los lexemas
+    def tokenizar(self, texto):
+        filas = self.filas
+        aceptacion = self.aceptacion_filas
+        ignorar = self.ignorar
+        hay_estados = self.tabla.total_estados > 0
+        clases = self.clases_texto(texto)
+        total = len(texto)
+        inicio = 0
+
+        while inicio < total:
+            fila = 0
+            pos = inicio
+            ultimo_token = SIN_TRANSICION
+            ultimo_fin = inicio
+
+            # Avanzar mientras haya transición y recordar el último estado de aceptación
+            while hay_estados and pos < total:
+                fila = filas[fila + clases[pos]]
+                if fila < 0:
+                    break
+                pos += 1
+                token = aceptacion[fila]
+                if token >= 0:
+                    ultimo_token = token
+                    ultimo_fin = pos
+
+            if ultimo_token >= 0:
+                yield ultimo_token, inicio, ultimo_fin
+                inicio = ultimo_fin
+            else:
+                if texto[inicio] not in ignorar:
+                    yield self.token_error, inicio, inicio + 1
+                inicio += 1
+
+    # Devuelve (token, lexema) por cada token del texto
+    def lexemas(self, texto):
+        for token, inicio, fin in self.tokenizar(texto):
+            yield token, texto[inicio:fin]
+
+    # Tokenizar un archivo binario leyéndolo por bloques. Devuelve (token, inicio, fin) con posiciones en bytes
+    # (leídos como Latin-1, el rango de caracteres que puede definir la gramática: CHR(0)..CHR(255)),
+    # y además el lexema (bytes) si lexemas es True. Un token que queda partido entre dos bloques se sigue
+    # escaneando con el bloque siguiente, así la memoria queda acotada por el bloque más el token más largo.
+    def tokenizar_flujo(self, archivo, tamano_bloque=TAMANO_BLOQUE, lexemas=False):
+        return self.escanear_bytes(lambda: archivo.read(tamano_bloque), lexemas)
+
+    # Tokenizar un archivo por ruta, leyéndolo por bloques o desde un mmap (el sistema operativo pagina el archivo)
+    def tokenizar_archivo(self, ruta, tamano_bloque=TAMANO_BLOQUE, usar_mmap=False, lexemas=False):
+        with open(ruta, 'rb') as archivo:
+            if not usar_mmap:
+                yield from self.tokenizar_flujo(archivo, tamano_bloque, lexemas)
+                return
+            try:
+                datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # No se puede mapear un archivo vacío
+                return
+            with datos:
+                yield from self.tokenizar_flujo(datos, tamano_bloque, lexemas)
+
+    # Escanear los bloques que devuelve leer_bloque (b'' al final del archivo).
+    # Lo leído y sus clases se guardan en un búfer del que solo se descarta lo anterior al token en curso, y el
+    # escaneo de un token que queda partido entre bloques sigue con el bloque siguiente desde el estado (fila,
+    # pos, último token aceptado) en que quedó, así un token largo no se vuelve a escanear ni a copiar por cada bloque.
+    def escanear_bytes(self, leer_bloque, lexemas=False):
+        filas = self.filas
+        aceptacion = self.aceptacion_filas
+        hay_estados = self.tabla.total_estados > 0
+        ignorar = {ord(caracter) for caracter in self.ignorar}
+        token_error = self.token_error
+        datos = bytearray()
+        clases = bytearray() if self.traduccion is not None else array(self.tipo_clases)
+        fin_archivo = False
+        base = 0  # Posición en el archivo del primer byte de datos
+        inicio = 0
+        fila = 0
+        pos = 0
+        ultimo_token = SIN_TRANSICION
+        ultimo_fin = 0
+
+        while True:
+            # Avanzar mientras haya transición y recordar el último estado de aceptación
+            total = len(datos)
+            while hay_estados and pos < total:
+                fila = filas[fila + clases[pos]]
+                if fila < 0:
+                    break
+                pos += 1
+                token = aceptacion[fila]
+                if token >= 0:
+                    ultimo_token = token
+                    ultimo_fin = pos
+
+            # Se acabó lo leído a mitad de un posible token (o antes de empezar otro): leer el siguiente bloque y
+            # seguir desde donde quedó
+            if pos == total and fila >= 0 and not fin_archivo:
+                bloque = leer_bloque()
+                if not bloque:
+                    fin_archivo = True
+                    continue
+                if inicio:
+                    del datos[:inicio]
+                    del clases[:inicio]
+                    base += inicio
+                    pos -= inicio
+                    ultimo_fin -= inicio
+                    inicio = 0
+                datos += bloque
+                clases += self.clases_bytes(bloque)
+                continue
+            if inicio >= total:
+                return
+
+            if ultimo_token >= 0:
+                if lexemas:
+                    yield ultimo_token, base + inicio, base + ultimo_fin, bytes(datos[inicio:ultimo_fin])
+                else:
+                    yield ultimo_token, base + inicio, base + ultimo_fin
+                inicio = ultimo_fin
+            else:
+                if datos[inicio] not in ignorar:
+                    if lexemas:
+                        yield token_error, base + inicio, base + inicio + 1, bytes(datos[inicio:inicio + 1])
+                    else:
+                        yield token_error, base + inicio, base + inicio + 1
+                inicio += 1
+            fila = 0
+            pos = inicio
+            ultimo_token = SIN_TRANSICION
+            ultimo_fin = inicio
+
+# Función para obtener los rangos de códigos de cada símbolo de hoja (a1 -> rangos de DIGITO), sin los marcadores Tn
+def rangos_simbolos(resultado):
+    simbolos_marcadores = {resultado.simbolos_hoja[pos] for pos in resultado.marcadores}
+    rangos = {}
+    for simbolo in set(resultado.simbolos_hoja.values()) - simbolos_marcadores:
+        terminal = resultado.arbol.tabla_simbolos.terminal(simbolo)
+        rangos[simbolo] = rangos_terminal(terminal, resultado.sets)
+    return rangos
+
+# Función para dividir los caracteres en clases: dos caracteres están en la misma clase si pertenecen a los mismos
+# símbolos. Se recorren los rangos de los símbolos de menor a mayor: el conjunto de símbolos solo cambia donde
+# empieza o termina un rango, así cada tramo entre dos de esos puntos es de una sola clase (una clase [^ ... ] o un
+# SET grande es un par de rangos, no cientos de caracteres). Las clases se numeran desde 1 (la 0 es la de los
+# caracteres que no son de ningún símbolo). Devuelve la ClasesCaracteres por tramos y símbolo -> lista de clases
+# que lo cumplen.
+def calcular_clases_caracteres(rangos_simbolo):
+    cambios = {}  # Código -> lista de (símbolo, True si empieza un rango suyo / False si termina)
+    for simbolo in rangos_simbolo:
+        for inicio, fin in rangos_simbolo[simbolo]:
+            cambios.setdefault(inicio, []).append((simbolo, True))
+            cambios.setdefault(fin + 1, []).append((simbolo, False))
+
+    ids_clases = {}  # Tupla de símbolos -> clase
+    tramos = []
+    clases_simbolo = {simbolo: [] for simbolo in rangos_simbolo}
+    activos = set()
+    puntos = sorted(cambios)
+    for i, punto in enumerate(puntos[:-1]):
+        for simbolo, empieza in cambios[punto]:
+            if empieza:
+                activos.add(simbolo)
+            else:
+                activos.discard(simbolo)
+        if not activos:
+            continue
+
+        firma = tuple(sorted(activos))
+        clase = ids_clases.get(firma)
+        if clase is None:
+            clase = len(ids_clases) + 1
+            ids_clases[firma] = clase
+            for simbolo in firma:
+                clases_simbolo[simbolo].append(clase)
+        tramos.append((punto, puntos[i + 1] - 1, clase))
+    return ClasesCaracteres(tramos), clases_simbolo
+
+# Construir el escáner de un resultado de compilación: AFD sobre clases de caracteres y tabla por carácter
+# Con vectorizada la construcción de subconjuntos se hace con NumPy
+def construir_escaner(resultado, minimizar=True, ignorar=IGNORAR, vectorizada=False):
+    clases_caracteres, clases_simbolo = calcular_clases_caracteres(rangos_simbolos(resultado))
+    transiciones, estados = generar_tabla_transiciones(resultado.arbol, resultado.follow_dict, resultado.total_hojas,
+                                                       resultado.simbolos_hoja, resultado.conjuntos, clases_simbolo,
+                                                       vectorizada)
+    aceptacion = calcular_aceptacion(estados, resultado.marcadores, resultado.conjuntos)
+    if minimizar:
+        clases = clases_caracteres.clases()
+        transiciones, estados, aceptacion = minimizar_afd(transiciones, estados, aceptacion, clases, resultado.conjuntos)
+
+    # Las clases que se comportan igual en todos los estados se juntan en la tabla densa
+    tabla = construir_tabla_densa(transiciones, aceptacion, clases_caracteres)
+    return Escaner(tabla, resultado.token_error, ignorar)
+
+# Escáner con la misma regla de coincidencia más larga que Escaner, pero sobre un AFDPerezoso: solo se calculan
+# los estados y transiciones que la entrada alcanza, así que no hace falta la construcción de subconjuntos completa.
+class EscanerPerezoso:
+    def __init__(self, afd, clases_caracteres, token_error=None, ignorar=IGNORAR):
+        self.afd = afd
+        self.clases_caracteres = clases_caracteres  # ClasesCaracteres: carácter -> clase (0 si no es de ninguna)
+        self.token_error = token_error
+        self.ignorar = ignorar
+
+    # Devuelve (token, inicio, fin) por cada token del texto
+    def tokenizar(self, texto):
+        afd = self.afd
+        clases = self.clases_caracteres.clases_texto(texto)
+        ignorar = self.ignorar
+        total = len(texto)
+        inicio = 0
+
+        while inicio < total:
+            llave = afd.inicial
+            pos = inicio
+            ultimo_token = None
+            ultimo_fin = inicio
+            while llave is not None and pos < total:
+                clase = clases[pos]
+                if not clase:
+                    break
+                llave = afd.siguiente(afd.estado(llave), clase)
+                if llave is None:
+                    break
+                pos += 1
+                token = afd.estado(llave).token
+                if token is not None:
+                    ultimo_token = token
+                    ultimo_fin = pos
+
+            if ultimo_token is not None:
+                yield ultimo_token, inicio, ultimo_fin
+                inicio = ultimo_fin
+            else:
+                if texto[inicio] not in ignorar:
+                    yield self.token_error, inicio, inicio + 1
+                inicio += 1
+
+    # Devuelve (token, lexema) por cada token del texto
+    def lexemas(self, texto):
+        for token, inicio, fin in self.tokenizar(texto):
+            yield token, texto[inicio:fin]
+
+# Construir el escáner perezoso de un resultado de compilación (no usa las transiciones ya generadas)
+def construir_escaner_perezoso(resultado, capacidad=CAPACIDAD, ignorar=IGNORAR):
+    clases_caracteres, clases_simbolo = calcular_clases_caracteres(rangos_simbolos(resultado))
+    afd = AFDPerezoso(resultado.arbol, resultado.follow_dict, resultado.simbolos_hoja, resultado.marcadores,
+                      clases_simbolo, resultado.conjuntos, capacidad)
+    return EscanerPerezoso(afd, clases_caracteres, resultado.token_error, ignorar)
+
+# Escáner con la misma regla de coincidencia más larga que Escaner, pero simulando el autómata de posiciones
+# (AutomataPosiciones): nunca se construye el AFD, cada paso une máscaras de bits. Es más lento por carácter que
+# la tabla, pero la memoria solo depende de la cantidad de posiciones.
+class EscanerPosiciones:
+    def __init__(self, automata, clases_caracteres, token_error=None, ignorar=IGNORAR):
+        self.automata = automata
+        self.clases_caracteres = clases_caracteres  # ClasesCaracteres: carácter -> clase (0 si no es de ninguna)
+        self.token_error = token_error
+        self.ignorar = ignorar
+        # Clase -> posiciones con las que avanza, en una lista (la clase 0 no avanza ninguna)
+        self.mascara_clase = [automata.mascara_clase.get(clase, 0)
+                              for clase in range(max(clases_caracteres.clases(), default=0) + 1)]
+
+    # Devuelve (token, inicio, fin) por cada token del texto
+    def tokenizar(self, texto):
+        automata = self.automata
+        avanzar = automata.avanzar
+        mascara_clase = self.mascara_clase
+        clases = self.clases_caracteres.clases_texto(texto)
+        mascara_marcadores = automata.mascara_marcadores
+        token_posicion = automata.token_posicion
+        inicial = automata.inicial
+        ignorar = self.ignorar
+        total = len(texto)
+        inicio = 0
+
+        while inicio < total:
+            activas = inicial
+            pos = inicio
+            ultimo_token = None
+            ultimo_fin = inicio
+            while pos < total:
+                mascara = activas & mascara_clase[clases[pos]]
+                if not mascara:
+                    break
+                activas = avanzar(mascara)
+                pos += 1
+                aceptadas = activas & mascara_marcadores
+                if aceptadas:
+                    ultimo_token = token_posicion[(aceptadas & -aceptadas).bit_length() - 1]
+                    ultimo_fin = pos
+
+            if ultimo_token is not None:
+                yield ultimo_token, inicio, ultimo_fin
+                inicio = ultimo_fin
+            else:
+                if texto[inicio] not in ignorar:
+                    yield self.token_error, inicio, inicio + 1
+                inicio += 1
+
+    # Devuelve (token, lexema) por cada token del texto
+    def lexemas(self, texto):
+        for token, inicio, fin in self.tokenizar(texto):
+            yield token, texto[inicio:fin]
+
+# Construir el escáner del autómata de posiciones de un resultado de compilación (no usa las transiciones, así que
+# se puede compilar con generar_afd=False)
+def construir_escaner_posiciones(resultado, bits_bloque=BITS_BLOQUE, ignorar=IGNORAR):
+    clases_caracteres, clases_simbolo = calcular_clases_caracteres(rangos_simbolos(resultado))
+    automata = AutomataPosiciones(resultado.arbol, resultado.follow_dict, resultado.simbolos_hoja,
+                                  resultado.marcadores, clases_simbolo, resultado.conjuntos, bits_bloque)
+    return EscanerPosiciones(automata, clases_caracteres, resultado.token_error, ignorar)
+
+# Obtener el escáner de una gramática usando la caché de AFD compilados del directorio dado.
+# Si hay un archivo de caché con la misma llave (texto de la gramática, versión del compilador y opciones) se
+# carga directamente; si no, se compila la gramática y se guarda. Devuelve None si no se pudo leer la gramática.
+def obtener_escaner(ruta_gramatica, directorio_cache, minimizar=True, ignorar=IGNORAR, simplificar=False,
+                    vectorizada=False):
+    contenido = leer_archivo(ruta_gramatica)
+    if not contenido:
+        return None
+
+    opciones = f"minimizar={minimizar};ignorar={ignorar!r}" + (";simplificar" if simplificar else "")
+    clave = clave_gramatica(contenido, opciones)
+    ruta = ruta_cache(directorio_cache, clave)
+    artefacto = cargar_artefacto(ruta, clave)
+    if artefacto is not None:
+        tabla, filas, aceptacion_filas, metadatos = artefacto
+        return Escaner(tabla, metadatos['token_error'], metadatos['ignorar'], filas, aceptacion_filas)
+
+    resultado = compilar_gramatica(contenido, generar_afd=False, simplificar=simplificar)
+    escaner = construir_escaner(resultado, minimizar, ignorar, vectorizada)
+    # La cabecera es JSON, que solo tiene llaves de texto: los diccionarios por posición van como pares
+    # [posición, valor] para que al cargarlos con dict() las posiciones vuelvan a ser enteros
+    metadatos = {
+        'token_error': escaner.token_error,
+        'ignorar': escaner.ignorar,
+        'simbolos_hoja': sorted(resultado.simbolos_hoja.items()),  # Numeración de las hojas
+        'terminales': {simbolo: resultado.arbol.tabla_simbolos.terminal(simbolo)
+                       for simbolo in set(resultado.simbolos_hoja.values())},  # Mapa de símbolos
+        'marcadores': sorted(resultado.marcadores.items()),
+    }
+    try:
+        guardar_artefacto(ruta, clave, escaner.tabla, escaner.filas, escaner.aceptacion_filas, metadatos)
+    except OSError as e:
+        print(f"No se pudo guardar la caché: {e}")
+    return escaner
+
+# Construir una expresión de "re" equivalente a la gramática, con un grupo (?P<Tn>...) por token.
+# Solo sirve para comparar velocidad: "re" toma la primera alternativa que coincide, no la más larga.
+def construir_expresion_re(resultado):
+    grupos = []
+    for numero_token, expresion_token in resultado.tokens_extraidos:
+        partes = partes_expresion(expresion_token)
+        patron = []
+        for parte in partes:
+            if parte == '.':
+                continue
+            if parte == '(':
+                patron.append("(?:")  # Sin capturar: los únicos grupos con nombre son los de los tokens
+                continue
+            if parte in ['*', '+', '?', '|', ')']:
+                patron.append(parte)
+                continue
+            if parte == EPSILON:
+                patron.append("(?:)")  # Grupo vacío para que un *, + o ? siguiente no se pegue a otra parte
+                continue
+            rangos = rangos_terminal(parte, resultado.sets)
+            if not rangos:
+                patron.append("(?!)")  # Una clase vacía no coincide con nada
+            elif len(rangos) == 1 and rangos[0][0] == rangos[0][1]:
+                patron.append(re.escape(chr(rangos[0][0])))
+            else:
+                patron.append("[" + "".join(rango_re(inicio, fin) for inicio, fin in rangos) + "]")
+        grupos.append(f"(?P<T{numero_token}>{''.join(patron)})")
+    return re.compile("|".join(grupos))
+
+# Función para escribir un rango de códigos dentro de una clase [ ... ] de "re"
+def rango_re(inicio, fin):
+    if inicio == fin:
+        return re.escape(chr(inicio))
+    return re.escape(chr(inicio)) + "-" + re.escape(chr(fin))
+
+# Tokenizar con "re" siguiendo las mismas reglas del escáner (saltar IGNORAR y marcar errores)
+def tokenizar_con_re(patron, texto, token_error=None, ignorar=IGNORAR):
+    total = len(texto)
+    inicio = 0
+    coincidir = patron.match
+    while inicio < total:
+        coincidencia = coincidir(texto, inicio)
+        if coincidencia and coincidencia.end() > inicio:
+            yield int(coincidencia.lastgroup[1:]), inicio, coincidencia.end()
+            inicio = coincidencia.end()
+        else:
+            if texto[inicio] not in ignorar:
+                yield token_error, inicio, inicio + 1
+            inicio += 1
+
+# Medir cuántos caracteres por segundo procesa un tokenizador (función que recibe el texto)
+def medir_velocidad(tokenizar, texto):
+    inicio = time.perf_counter()
+    total_tokens = sum(1 for _ in tokenizar(texto))
+    duracion = time.perf_counter() - inicio
+    return len(texto) / duracion if duracion else float('inf'), total_tokens
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Tokeniza un archivo con el AFD compilado de una gramática.")
+    parser.add_argument('gramatica', help="Ruta del archivo de gramática")
+    parser.add_argument('entrada', help="Ruta del archivo a tokenizar")
+    parser.add_argument('--comparar-re', action='store_true',
+                        help="Medir caracteres por segundo contra la misma gramática compilada con re")
+    parser.add_argument('--flujo', action='store_true',
+                        help="Leer la entrada por bloques y mostrar las posiciones en bytes de cada token")
+    parser.add_argument('--mmap', action='store_true', help="Con --flujo, mapear el archivo en memoria con mmap")
+    parser.add_argument('--bloque', type=int, default=TAMANO_BLOQUE, help="Con --flujo, tamaño de bloque en bytes")
+    parser.add_argument('--sin-minimizar', action='store_true', help="Usar el AFD sin minimizar")
+    parser.add_argument('--simplificar', action='store_true',
+                        help="Simplificar el árbol y factorizar prefijos comunes antes de construir el AFD")
+    parser.add_argument('--numpy', action='store_true',
+                        help="Construir los subconjuntos con NumPy (conviene con estados de muchas posiciones)")
+    parser.add_argument('--perezoso', action='store_true',
+                        help="Calcular los estados del AFD solo cuando la entrada los alcanza")
+    parser.add_argument('--capacidad', type=int, default=CAPACIDAD,
+                        help="Con --perezoso, cantidad máxima de estados guardados en la caché")
+    parser.add_argument('--posiciones', action='store_true',
+                        help="Simular el autómata de posiciones con máscaras de bits en vez de construir el AFD")
+    parser.add_argument('--bits-bloque', type=int, default=BITS_BLOQUE,
+                        help="Con --posiciones, bits de cada bloque de las tablas de Follow (por omisión 0: sin tablas)")
+    parser.add_argument('--compacto', metavar='ARCHIVO',
+                        help="Guardar los tokens en columnas compactas (token, inicio, largo) en este archivo .lfak "
+                             "en vez de mostrarlos")
+    parser.add_argument('--cache', metavar='DIRECTORIO',
+                        help="Guardar el AFD compilado en este directorio y cargarlo de ahí si la gramática no cambió")
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+
+    try:
+        # --comparar-re necesita el resultado completo de la compilación, así que no usa la caché
+        if args.perezoso or args.posiciones:
+            if args.perezoso and args.posiciones:
+                print("--perezoso no se puede usar con --posiciones.")
+                return 1
+            if args.flujo:
+                print("--perezoso y --posiciones no se pueden usar con --flujo.")
+                return 1
+            resultado = compilar_archivo(args.gramatica, generar_afd=False, simplificar=args.simplificar)
+            if resultado is None:
+                escaner = None
+            elif args.perezoso:
+                escaner = construir_escaner_perezoso(resultado, args.capacidad)
+            else:
+                escaner = construir_escaner_posiciones(resultado, args.bits_bloque)
+        elif args.cache and not args.comparar_re:
+            resultado = None
+            escaner = obtener_escaner(args.gramatica, args.cache, minimizar=not args.sin_minimizar,
+                                      simplificar=args.simplificar, vectorizada=args.numpy)
+        else:
+            resultado = compilar_archivo(args.gramatica, generar_afd=False, simplificar=args.simplificar)
+            escaner = (construir_escaner(resultado, minimizar=not args.sin_minimizar, vectorizada=args.numpy)
+                       if resultado else None)
+        if escaner is None:
+            print("No se pudo leer el archivo de gramática.")
+            return 1
+    except Exception as e:
+        print(e)
+        return 1
+
+    if args.compacto and not args.comparar_re:
+        try:
+            if args.flujo:
+                tokens = TokensCompactos().extender(escaner.tokenizar_archivo(args.entrada, args.bloque, args.mmap))
+            else:
+                texto = leer_archivo(args.entrada)
+                if texto is None:
+                    return 1
+                tokens = TokensCompactos().extender(escaner.tokenizar(texto))
+            tokens.guardar(args.compacto)
+        except OSError as e:
+            print(f"Ocurrió un error: {e}")
+            return 1
+        print(f"{len(tokens)} tokens guardados exitosamente en {args.compacto} ({tokens.tamano_bytes()} bytes)")
+        return 0
+
+    if args.flujo:
+        try:
+            for token, inicio, fin, lexema in escaner.tokenizar_archivo(args.entrada, args.bloque, args.mmap, True):
+                print(f"{token}\t{inicio}\t{fin}\t{lexema.decode('latin-1')}")
+        except OSError as e:
+            print(f"Ocurrió un error: {e}")
+            return 1
+        return 0
+
+    texto = leer_archivo(args.entrada)
+    if texto is None:
+        return 1
+
+    if args.comparar_re:
+        patron = construir_expresion_re(resultado)
+        velocidad_afd, tokens_afd = medir_velocidad(escaner.tokenizar, texto)
+        velocidad_re, tokens_re = medir_velocidad(lambda t: tokenizar_con_re(patron, t, resultado.token_error), texto)
+        if args.perezoso:
+            print(f"AFD perezoso: {velocidad_afd:,.0f} caracteres/s ({tokens_afd} tokens)")
+        elif args.posiciones:
+            estadisticas = escaner.automata.estadisticas()
+            print(f"Posiciones: {velocidad_afd:,.0f} caracteres/s ({tokens_afd} tokens, "
+                  f"{estadisticas['posiciones']} posiciones, {estadisticas['entradas_tablas']} entradas en tablas)")
+        else:
+            print(f"AFD: {velocidad_afd:,.0f} caracteres/s ({tokens_afd} tokens, {escaner.tabla.total_estados} "
+                  f"estados, {escaner.tabla.total_clases} clases)")
+        print(f"re:  {velocidad_re:,.0f} caracteres/s ({tokens_re} tokens)")
+    else:
+        for token, lexema in escaner.lexemas(texto):
+            print(f"{token}\t{lexema}")
+
+    if args.perezoso:
+        estadisticas = escaner.afd.estadisticas()
+        print(f"Caché del AFD perezoso: {estadisticas['estados']} estados, {estadisticas['aciertos']} aciertos, "
+              f"{estadisticas['fallos']} fallos, {estadisticas['desalojos']} desalojos", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from arbol import ALTERNACION, SIN_HIJO, Arbol, calcular_conjuntos, construir_arbol
+from conjuntos import conjuntos_python, obtener_conjuntos
+from gramatica import TablaSimbolos, simbolizar
+
+# Árbol ya calculado (First, Last, Nullable y Follow) de un solo token, a partir de sus partes (ver
+# gramatica.partes_token). Las hojas se numeran desde 1 y los nodos desde 0, como si el token fuera toda la
+# gramática; al unir los tokens se desplazan. Si no se pasa una tabla de símbolos compartida se usa una propia.
+class Fragmento:
+    def __init__(self, partes, conjuntos=conjuntos_python, tabla_simbolos=None):
+        if tabla_simbolos is None:
+            tabla_simbolos = TablaSimbolos()
+        arbol, total_hojas = construir_arbol(simbolizar(partes, tabla_simbolos), tabla_simbolos)
+        follow_dict = {i: conjuntos.vacio() for i in range(1, total_hojas + 1)}
+        calcular_conjuntos(arbol, follow_dict, conjuntos)
+
+        self.expresion = ''.join(partes)  # Texto del token, es la llave del fragmento
+        self.arbol = arbol
+        self.total_hojas = total_hojas
+        self.follow_dict = follow_dict
+        self.colocado = None  # (desplazamiento de nodos, desplazamiento de hojas, arreglos desplazados)
+
+    # El resultado de colocar() no se guarda al serializar: ocupa más que el fragmento y se vuelve a armar barato
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado['colocado'] = None
+        return estado
+
+    # Pasar los ids de símbolo del árbol del token a otra tabla (la compartida), agregando los terminales (y
+    # marcadores) nuevos en el orden de sus ids. Solo se pasan los símbolos que usa el árbol: la tabla de origen
+    # puede ser una compartida con símbolos de otros tokens.
+    def compartir_simbolos(self, tabla_simbolos):
+        arbol = self.arbol
+        usados = sorted({id_simbolo for id_simbolo in arbol.simbolo if id_simbolo >= 0})
+        ids_compartidos = {id_simbolo: tabla_simbolos.agregar_de(arbol.tabla_simbolos, id_simbolo)
+                           for id_simbolo in usados}
+        arbol.simbolo = array('i', (ids_compartidos[id_simbolo] if id_simbolo >= 0 else id_simbolo
+                                    for id_simbolo in arbol.simbolo))
+        arbol.tabla_simbolos = tabla_simbolos
+        arbol.simbolos = tabla_simbolos.nombres
+
+    # Índices de hijos, números de hoja, First, Last y Follow desplazados para que el primer nodo del token sea
+    # desplazamiento_nodos y su primera hoja desplazamiento_hojas + 1. Se guarda el último resultado, así un token
+    # que queda en la misma posición al recompilar no se vuelve a recorrer.
+    def colocar(self, desplazamiento_nodos, desplazamiento_hojas, conjuntos=conjuntos_python):
+        if self.colocado is not None and self.colocado[:2] == (desplazamiento_nodos, desplazamiento_hojas):
+            return self.colocado[2]
+
+        arbol = self.arbol
+        if desplazamiento_nodos:
+            izquierdo = array('i', (hijo + desplazamiento_nodos if hijo != SIN_HIJO else hijo
+                                    for hijo in arbol.izquierdo))
+            derecho = array('i', (hijo + desplazamiento_nodos if hijo != SIN_HIJO else hijo for hijo in arbol.derecho))
+        else:
+            izquierdo, derecho = arbol.izquierdo, arbol.derecho
+        if desplazamiento_hojas:
+            numero_hoja = array('i', (numero + desplazamiento_hojas if numero else 0 for numero in arbol.numero_hoja))
+            first = [conjuntos.desplazar(conjunto, desplazamiento_hojas) for conjunto in arbol.first]
+            last = [conjuntos.desplazar(conjunto, desplazamiento_hojas) for conjunto in arbol.last]
+            follow_dict = {pos + desplazamiento_hojas: conjuntos.desplazar(follow, desplazamiento_hojas)
+                           for pos, follow in self.follow_dict.items()}
+        else:
+            numero_hoja, first, last, follow_dict = arbol.numero_hoja, arbol.first, arbol.last, self.follow_dict
+
+        colocado = (izquierdo, derecho, numero_hoja, first, last, follow_dict)
+        self.colocado = (desplazamiento_nodos, desplazamiento_hojas, colocado)
+        return colocado
+
+# Función que corre en cada proceso: construir el fragmento de un token con su propia tabla de símbolos
+def construir_fragmento(partes, nombre_conjuntos):
+    return Fragmento(partes, obtener_conjuntos(nombre_conjuntos))
+
+# Construir los fragmentos de varios tokens (lista de partes de cada uno), en paralelo si procesos es mayor que 1.
+# Los símbolos se pasan a la tabla compartida en el orden de los tokens (no en el que terminan los procesos),
+# así el resultado es el mismo que construyéndolos uno por uno.
+def construir_fragmentos(partes_tokens, conjuntos=conjuntos_python, tabla_simbolos=None, procesos=1):
+    if tabla_simbolos is None:
+        tabla_simbolos = TablaSimbolos()
+    if procesos is None or procesos <= 1 or len(partes_tokens) <= 1:
+        return [Fragmento(partes, conjuntos, tabla_simbolos) for partes in partes_tokens]
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        tamano_lote = max(1, len(partes_tokens) // (procesos * 4))
+        fragmentos = list(ejecutor.map(construir_fragmento, partes_tokens, [conjuntos.nombre] * len(partes_tokens),
+                                       chunksize=tamano_lote))
+    for fragmento in fragmentos:
+        fragmento.compartir_simbolos(tabla_simbolos)
+    return fragmentos
+
+# Unir los fragmentos de los tokens con "|" en el mismo orden y con la misma forma que construir_arbol le da a
+# (t1)|(t2)|...: la alternación es asociativa por la izquierda, así que después de cada token (menos el primero)
+# va el nodo que lo une con lo anterior. La alternación no agrega Follow, así que solo se calculan First, Last y
+# Nullable de esos nodos. Devuelve el árbol, el total de hojas y el diccionario de Follow.
+# Todos los fragmentos deben usar la misma tabla de símbolos, que pasa a ser la del árbol.
+def unir_fragmentos(fragmentos, conjuntos=conjuntos_python, tabla_simbolos=None):
+    arbol = Arbol(tabla_simbolos)
+    first = []
+    last = []
+    follow_dict = {}
+    total_hojas = 0
+    raiz = SIN_HIJO
+
+    for fragmento in fragmentos:
+        desplazamiento_nodos = len(arbol)
+        izquierdo, derecho, numero_hoja, first_fragmento, last_fragmento, follow_fragmento = fragmento.colocar(
+            desplazamiento_nodos, total_hojas, conjuntos)
+        arbol.operador.extend(fragmento.arbol.operador)
+        arbol.izquierdo.extend(izquierdo)
+        arbol.derecho.extend(derecho)
+        arbol.numero_hoja.extend(numero_hoja)
+        arbol.nullable.extend(fragmento.arbol.nullable)
+        arbol.simbolo.extend(fragmento.arbol.simbolo)
+        first.extend(first_fragmento)
+        last.extend(last_fragmento)
+        follow_dict.update(follow_fragmento)
+        total_hojas += fragmento.total_hojas
+
+        raiz_fragmento = desplazamiento_nodos + fragmento.arbol.raiz
+        if raiz == SIN_HIJO:
+            raiz = raiz_fragmento
+            continue
+        nodo = arbol.agregar_nodo(ALTERNACION, raiz, raiz_fragmento)
+        arbol.nullable[nodo] = arbol.nullable[raiz] or arbol.nullable[raiz_fragmento]
+        first.append(first[raiz] | first[raiz_fragmento])
+        last.append(last[raiz] | last[raiz_fragmento])
+        raiz = nodo
+
+    arbol.raiz = raiz
+    arbol.first = first
+    arbol.last = last
+    return arbol, total_hojas, follow_dict
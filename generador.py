@@ -0,0 +1,232 @@
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import types
+
+from cache_afd import clave_gramatica
+from compilador import VERSION_COMPILADOR, compilar_archivo
+from escaner import IGNORAR, construir_escaner, medir_velocidad, obtener_escaner
+from gramatica import leer_archivo
+
+# Plantilla del módulo generado. El escáner no depende del compilador: solo usa "re" para saltar de una vez las
+# secuencias de caracteres que dejan al autómata en el mismo estado (los ciclos de un estado consigo mismo).
+# Comparado con Escaner.tokenizar, el ciclo interno no revisa el final del texto (al final de las clases va la
+# clase 0, que no tiene transiciones) y los estados con ciclos van como destinos negativos, así el paso normal
+# no hace ninguna comparación de más.
+PLANTILLA_MODULO = '''# Escáner generado por generador.py (compilador {version}).
+# No editar: se vuelve a generar desde la gramática.
+import re
+from bisect import bisect_right
+
+VERSION_COMPILADOR = {version!r}
+TOKEN_ERROR = {token_error!r}
+IGNORAR = {ignorar!r}
+
+# Byte (Latin-1) -> clase de caracteres
+TRADUCCION = {traduccion!r}
+
+# Tramos de códigos desde 256 (inicio, fin incluido y clase), ordenados para buscar con bisect. Los caracteres
+# fuera de Latin-1 que no están en ningún tramo no son de ninguna clase
+INICIOS_EXTRA = {inicios_extra!r}
+FINES_EXTRA = {fines_extra!r}
+CLASES_EXTRA = {clases_extra!r}
+
+# Destino de cada (fila, clase) como inicio de la fila destino (estado * clases). -1 si no hay transición y
+# -2 - fila si el estado destino tiene ciclos (ver SALTOS)
+FILAS = {filas!r}
+
+# Token que acepta cada fila (-1 si no acepta), indexado con el inicio de la fila
+ACEPTACION = {aceptacion!r}
+
+# Estados con ciclos: búsqueda del primer carácter que sale del ciclo, indexada con el inicio de la fila
+SALTOS = {{
+{saltos}
+}}
+
+# Clase de un carácter fuera de Latin-1
+def clase_extra(codigo):
+    indice = bisect_right(INICIOS_EXTRA, codigo) - 1
+    if indice >= 0 and codigo <= FINES_EXTRA[indice]:
+        return CLASES_EXTRA[indice]
+    return 0
+
+def clases_texto(texto):
+    try:
+        clases = texto.encode('latin-1').translate(TRADUCCION)
+    except UnicodeEncodeError:  # Los caracteres fuera de Latin-1 se buscan uno por uno
+        clases = bytes(TRADUCCION[codigo] if codigo < 256 else clase_extra(codigo) for codigo in map(ord, texto))
+    return clases + b'\\x00'  # Centinela: la clase 0 no tiene transiciones
+
+# Devuelve (token, inicio, fin) por cada token del texto, con la regla de la coincidencia más larga
+def tokenizar(texto):
+    filas = FILAS
+    aceptacion = ACEPTACION
+    saltos = SALTOS
+    ignorar = IGNORAR
+    token_error = TOKEN_ERROR
+    clases = clases_texto(texto)
+    total = len(texto)
+    inicio = 0
+
+    while inicio < total:
+        fila = 0
+        pos = inicio
+        ultimo_token = -1
+        ultimo_fin = inicio
+
+        while {hay_estados!r}:
+            fila = filas[fila + clases[pos]]
+            pos += 1
+            if fila < 0:
+                if fila == -1:
+                    break
+                fila = -2 - fila
+                pos = saltos[fila](clases, pos).start()  # Siempre encuentra al menos el centinela
+            token = aceptacion[fila]
+            if token >= 0:
+                ultimo_token = token
+                ultimo_fin = pos
+
+        if ultimo_token >= 0:
+            yield ultimo_token, inicio, ultimo_fin
+            inicio = ultimo_fin
+        else:
+            if texto[inicio] not in ignorar:
+                yield token_error, inicio, inicio + 1
+            inicio += 1
+
+# Devuelve (token, lexema) por cada token del texto
+def lexemas(texto):
+    for token, inicio, fin in tokenizar(texto):
+        yield token, texto[inicio:fin]
+'''
+
+# Función para obtener las clases con las que un estado vuelve a sí mismo
+def clases_ciclo(tabla, estado):
+    inicio = estado * tabla.total_clases
+    return [clase for clase in range(tabla.total_clases) if tabla.transiciones[inicio + clase] == estado]
+
+# Función para escribir la búsqueda (regex sobre bytes de clases) del primer byte que no es de las clases dadas
+def patron_salida(clases):
+    return b'[^' + b''.join(re.escape(bytes([clase])) for clase in clases) + b']'
+
+# Generar el código fuente de un módulo de Python con el escáner del Escaner dado.
+# Con saltos=False los ciclos se recorren paso a paso, que conviene si casi todos los tokens son cortos
+# (la búsqueda con "re" solo paga cuando la secuencia es larga).
+def generar_codigo(escaner, saltos_ciclos=True):
+    tabla = escaner.tabla
+    if escaner.traduccion is None:
+        raise Exception("Error: Solo se puede generar código para tablas con a lo más 256 clases de caracteres")
+
+    filas = list(escaner.filas)
+    saltos = []
+    for estado in range(tabla.total_estados):
+        ciclo = clases_ciclo(tabla, estado) if saltos_ciclos else []
+        if ciclo:
+            fila = estado * tabla.total_clases
+            saltos.append(f"    {fila}: re.compile({patron_salida(ciclo)!r}).search,")
+            for clase in ciclo:
+                filas[fila + clase] = -2 - fila
+
+    return PLANTILLA_MODULO.format(
+        version=VERSION_COMPILADOR,
+        token_error=escaner.token_error,
+        ignorar=escaner.ignorar,
+        traduccion=escaner.traduccion,
+        inicios_extra=tuple(tabla.clase_entrada.inicios_extra),
+        fines_extra=tuple(tabla.clase_entrada.fines_extra),
+        clases_extra=tuple(tabla.clase_entrada.clases_extra),
+        filas=tuple(filas),
+        aceptacion=tuple(escaner.aceptacion_filas),
+        saltos="\n".join(saltos),
+        hay_estados=tabla.total_estados > 0,
+    )
+
+# Guardar el módulo generado en un archivo .py (se escribe a un temporal y se reemplaza)
+def guardar_codigo(escaner, ruta, saltos_ciclos=True):
+    codigo = generar_codigo(escaner, saltos_ciclos)
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta + '.tmp', 'w') as archivo:
+        archivo.write(codigo)
+    os.replace(ruta + '.tmp', ruta)
+    return codigo
+
+# Importar un módulo generado desde su archivo
+def importar_modulo(ruta, nombre='escaner_generado'):
+    especificacion = importlib.util.spec_from_file_location(nombre, ruta)
+    if especificacion is None:
+        raise Exception(f"Error: No se puede importar {ruta}")
+    modulo = importlib.util.module_from_spec(especificacion)
+    especificacion.loader.exec_module(modulo)
+    return modulo
+
+# Crear el módulo directamente desde el código, sin escribir archivo
+def cargar_codigo(codigo, nombre='escaner_generado'):
+    modulo = types.ModuleType(nombre)
+    exec(compile(codigo, f"<{nombre}>", 'exec'), modulo.__dict__)
+    return modulo
+
+# Obtener el módulo generado de una gramática usando el directorio dado como caché: el archivo se llama con la
+# llave de la gramática (texto, versión del compilador y opciones), así que se vuelve a generar solo si cambió.
+# El AFD se toma de la caché de escaner.obtener_escaner. Devuelve None si no se pudo leer la gramática.
+def obtener_modulo(ruta_gramatica, directorio_cache, minimizar=True, ignorar=IGNORAR):
+    contenido = leer_archivo(ruta_gramatica)
+    if not contenido:
+        return None
+
+    clave = clave_gramatica(contenido, f"generado;minimizar={minimizar};ignorar={ignorar!r}")
+    ruta = os.path.join(directorio_cache, f"escaner_{clave[:16]}.py")
+    if not os.path.exists(ruta):
+        escaner = obtener_escaner(ruta_gramatica, directorio_cache, minimizar, ignorar)
+        if escaner is None:
+            return None
+        guardar_codigo(escaner, ruta)
+    return importar_modulo(ruta, f"escaner_{clave[:16]}")
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="Genera un módulo de Python con el escáner de una gramática (no necesita el compilador).")
+    parser.add_argument('gramatica', help="Ruta del archivo de gramática")
+    parser.add_argument('salida', help="Ruta del módulo .py que se genera")
+    parser.add_argument('--sin-minimizar', action='store_true', help="Usar el AFD sin minimizar")
+    parser.add_argument('--sin-saltos', action='store_true',
+                        help="Recorrer los ciclos paso a paso en vez de saltarlos con re (para tokens cortos)")
+    parser.add_argument('--comparar', metavar='ENTRADA',
+                        help="Medir caracteres por segundo del módulo generado contra el escáner por tabla")
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+
+    try:
+        resultado = compilar_archivo(args.gramatica, generar_afd=False)
+        if resultado is None:
+            print("No se pudo leer el archivo de gramática.")
+            return 1
+        escaner = construir_escaner(resultado, minimizar=not args.sin_minimizar)
+        guardar_codigo(escaner, args.salida, not args.sin_saltos)
+    except OSError as e:
+        print(f"Ocurrió un error al intentar guardar el archivo: {e}")
+        return 1
+    except Exception as e:
+        print(e)
+        return 1
+    print(f"Escáner generado exitosamente en {args.salida}")
+
+    if args.comparar:
+        texto = leer_archivo(args.comparar)
+        if texto is None:
+            return 1
+        modulo = importar_modulo(args.salida)
+        velocidad_tabla, tokens_tabla = medir_velocidad(escaner.tokenizar, texto)
+        velocidad_generado, tokens_generado = medir_velocidad(modulo.tokenizar, texto)
+        print(f"Tabla:    {velocidad_tabla:,.0f} caracteres/s ({tokens_tabla} tokens)")
+        print(f"Generado: {velocidad_generado:,.0f} caracteres/s ({tokens_generado} tokens)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
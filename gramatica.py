@@ -0,0 +1,387 @@
+import re
+import string
+
+# Función para leer el archivo de gramática
+def leer_archivo(ruta_archivo):
+    try:
+        with open(ruta_archivo, 'r') as archivo:
+            return archivo.read()  # Devuelve el contenido del archivo como string
+    except FileNotFoundError:
+        print(f"El archivo {ruta_archivo} no se encontró.")
+        return None  # Retorna None en caso de error
+    except Exception as e:
+        print(f"Ocurrió un error: {e}")
+        return None  # Retorna None en caso de otro error
+
+# Lista de terminales (incluyendo aquellos que están entre comillas simples y dobles)
+terminales = [
+    'DIGITO', 'CHARSET', 'LETRA', 'RESERVADAS', 'T1', 'T2', 'T3', 'T4', 'T5', 'T6', 'T7', 'T8', 'T9',
+    'T10', 'T11', 'T12', 'T13', 'T14', 'T15', 'T16', 'T17', 'T40', 'T41', 'T42', 'T43', 'T44', 'T45', 'T46', 'T47', 'T48', 'T49', 'T50', 'T51', 'T52', 'T53',
+    "'", '"', "'''", "' '", "':'", "','", "';'", "'='", "'O'", "'R'", "'A'", "'N'", "'D'", "'M'", "'O'", "'D'", "'I'", "'V'", "'N'", "'T'", "'*'", "'('", "')'", "'['", "']'", "'{'", "'}'", "'.'", "'<'", "'>'", "'+'", "'-'"
+]
+
+# Incluyendo el terminal completo `'"'`
+terminales.append('\'"\'')
+
+# Crear un mapa de letras con tres combinaciones por cada letra (a1, a2, a3, b1, b2, b3, etc.)
+def generar_mapa_letras(terminales):
+    letras = string.ascii_lowercase
+    combinaciones = [f"{letra}{i}" for letra in letras for i in range(1, 4)]  # Generar combinaciones a1, a2, a3, b1, b2, b3, etc.
+    return dict(zip(terminales, combinaciones))
+
+mapa_letras = generar_mapa_letras(terminales)
+letras_a_terminales = {letra: terminal for terminal, letra in mapa_letras.items()}
+
+# Lista de operadores: Solo los que NO están entre comillas simples o dobles
+operadores = ['(', '*', '+', '?', ')', '|']
+
+# Épsilon (la cadena vacía) escrito explícitamente; un grupo vacío "()" o una alternativa vacía también lo son
+EPSILON = 'ε'
+
+# Clase de caracteres escrita dentro de un token: [ elementos ] o, negada, [^ elementos ] (todos los caracteres
+# Latin-1 menos los elementos). Los elementos son como los de SETS ('a', CHR(97), 'a'..'z') o nombres de SETS,
+# separados por "+" o espacios, por ejemplo [ 'A'..'Z' + DIGITO + '_' ] o [^ '"' ]. Toda la clase es un solo
+# terminal, así que ocupa una sola posición del árbol sin importar cuántos caracteres tenga.
+regex_clase = r"\[\^?(?:'''|'[^']*'|[^\]'])*\]"
+
+# Expresión regular que separa una expresión de la gramática en sus partes
+regex_partes = regex_clase + r"|'''|\"[^\"]*\"|\'[^\']*\'|[\w]+|[.,!?;*+()|]"
+
+# Función para verificar si una parte de la expresión es un terminal (nombre, comillas simples o dobles, clase)
+def es_terminal(parte):
+    return (parte in terminales or parte.startswith("'") or parte.startswith('"') or parte.startswith('[') or
+            re.match(r'^\w+$', parte) is not None)
+
+# Función para escribir una clase con sus elementos unidos por "+" y sin espacios, así [ 'a'..'z' '_' ] y
+# ['a'..'z'+'_'] son el mismo terminal. Si la clase no es válida se deja igual (el error sale al leer sus caracteres).
+def normalizar_clase(clase):
+    negada = clase.startswith('[^')
+    cuerpo = clase[2 if negada else 1:-1]
+    if re.sub(regex_elementos_clase, '', cuerpo).strip(' \t+'):
+        return clase
+    elementos = [elemento.group(0) for elemento in re.finditer(regex_elementos_clase, cuerpo)]
+    return ('[^' if negada else '[') + '+'.join(elementos) + ']'
+
+# Función para separar una expresión de la gramática en sus partes (las clases ya normalizadas)
+def separar_partes(expresion):
+    return [normalizar_clase(parte) if parte.startswith('[') else parte
+            for parte in re.findall(regex_partes, expresion)]
+
+# Función para agregar concatenaciones donde sea necesario
+def agregar_concatenaciones(expresion):
+    partes = separar_partes(expresion)  # Detecta todo lo que está entre comillas como un solo token
+
+    # Aquí se remueven los espacios en blanco
+    return ''.join(insertar_concatenaciones(partes))  # Unir todo sin espacios en blanco
+
+# Función para insertar el símbolo de concatenación "." en una lista de partes ya separadas
+def insertar_concatenaciones(partes):
+    resultado = []
+    for i in range(len(partes) - 1):
+        resultado.append(partes[i])
+        # Reglas de concatenación:
+        # 1. Concatenar entre dos terminales.
+        # 2. Concatenar entre un terminal y un paréntesis de apertura "(".
+        # 3. Concatenar después de ")", "*", "+" o "?" si le sigue un terminal o "(".
+        # 4. No concatenar entre operadores (excepto después de "(" o antes de ")" si están rodeados de terminales).
+        if (es_terminal(partes[i]) or partes[i] in [')', '*', '+', '?']) and \
+           (es_terminal(partes[i + 1]) or partes[i + 1] == '('):
+            resultado.append('.')  # Añadir el símbolo de concatenación
+    resultado.append(partes[-1])  # Agregar la última parte
+    return resultado
+
+# Tabla de símbolos: cada terminal recibe un id entero (0, 1, 2, ...) la primera vez que aparece, sin límite.
+# El nombre de un símbolo es su letra de mapa_letras si la tiene (así las tablas de salida siguen mostrando a1, b2,
+# ...) o el mismo terminal si no; el árbol guarda los ids y los nombres solo se usan para mostrar.
+# Los ids de los terminales se buscan por el terminal, nunca por su nombre: dos terminales distintos son siempre
+# dos símbolos, aunque uno se llame como la letra del otro (un SET a1 y DIGITO, que se muestra como a1).
+class TablaSimbolos:
+    def __init__(self):
+        self.terminales = []  # Id -> terminal ("Tn" si es un marcador)
+        self.nombres = []  # Id -> nombre
+        self.tokens = []  # Id -> número de token si es un marcador Tn, None si es un terminal
+        self.ids = {}  # Terminal -> id
+        self.ids_marcadores = {}  # Número de token -> id de su marcador
+        self.ids_nombres = {}  # Nombre -> id
+
+    def __len__(self):
+        return len(self.terminales)
+
+    # Id de un terminal, agregándolo si es nuevo. Un terminal que se escribe como un marcador (T9) se muestra como
+    # <T9>, así la letra de T9 queda para el marcador
+    def agregar(self, terminal):
+        id_simbolo = self.ids.get(terminal)
+        if id_simbolo is None:
+            nombre = f"<{terminal}>" if numero_marcador(terminal) is not None else terminal
+            id_simbolo = self.nuevo_simbolo(terminal, self.nombre_terminal(nombre))
+        return id_simbolo
+
+    # Nombre con el que se muestra un terminal nuevo. Un terminal sin letra cuyo texto es una letra de mapa_letras
+    # (o el nombre de otro símbolo) se muestra entre < >, así ningún nombre se repite.
+    def nombre_terminal(self, terminal):
+        nombre = mapa_letras.get(terminal)
+        if nombre is None:
+            nombre = f"<{terminal}>" if terminal in letras_a_terminales else terminal
+        while nombre in self.ids_nombres:
+            nombre = f"<{nombre}>"
+        return nombre
+
+    # Id del marcador del token dado, agregándolo si es nuevo. Los marcadores no son terminales: se buscan por su
+    # número, así un terminal que se escribe igual (un SET llamado T9) es otro símbolo
+    def agregar_marcador(self, numero):
+        id_simbolo = self.ids_marcadores.get(numero)
+        if id_simbolo is None:
+            id_simbolo = self.nuevo_simbolo(f"T{numero}", self.nombre_terminal(f"T{numero}"), numero)
+        return id_simbolo
+
+    # Id en esta tabla del símbolo id_simbolo de otra tabla (terminal o marcador), agregándolo si es nuevo
+    def agregar_de(self, otra, id_simbolo):
+        numero = otra.tokens[id_simbolo]
+        if numero is not None:
+            return self.agregar_marcador(numero)
+        return self.agregar(otra.terminales[id_simbolo])
+
+    def nuevo_simbolo(self, terminal, nombre, numero=None):
+        id_simbolo = len(self.nombres)
+        if numero is None:
+            self.ids[terminal] = id_simbolo
+        else:
+            self.ids_marcadores[numero] = id_simbolo
+        self.ids_nombres[nombre] = id_simbolo
+        self.nombres.append(nombre)
+        self.terminales.append(terminal)
+        self.tokens.append(numero)
+        return id_simbolo
+
+    # Id de un símbolo por su nombre (las expresiones ya convertidas a letras traen nombres, no terminales).
+    # En esas expresiones un marcador solo se reconoce por su nombre: la letra de un Tn (b2) o el mismo Tn.
+    def agregar_nombre(self, nombre):
+        id_simbolo = self.ids_nombres.get(nombre)
+        if id_simbolo is None:
+            terminal = letras_a_terminales.get(nombre, nombre)
+            numero = numero_marcador(terminal)
+            if numero is not None:
+                id_simbolo = self.ids_marcadores.get(numero)
+                if id_simbolo is None:
+                    id_simbolo = self.nuevo_simbolo(terminal, nombre, numero)
+            elif terminal in self.ids:  # El terminal ya está con otro nombre
+                id_simbolo = self.ids[terminal]
+            else:
+                id_simbolo = self.nuevo_simbolo(terminal, nombre)
+        return id_simbolo
+
+    # Terminal de un símbolo por su nombre
+    def terminal(self, nombre):
+        return self.terminales[self.ids_nombres[nombre]]
+
+    # Número de token de un símbolo por su nombre, o None si no es un marcador
+    def numero_token(self, nombre):
+        return self.tokens[self.ids_nombres[nombre]]
+
+# Función para cambiar los terminales de una lista de partes por sus ids en la tabla de símbolos.
+# Los operadores quedan como texto y las partes que no son ni terminal ni operador (",", ";", ...) se descartan.
+def simbolizar(partes, tabla_simbolos):
+    resultado = []
+    for parte in partes:
+        if isinstance(parte, Marcador):
+            resultado.append(tabla_simbolos.agregar_marcador(parte.numero))
+        elif parte in operadores or parte == '.' or parte == EPSILON:
+            resultado.append(parte)
+        elif es_terminal(parte):
+            resultado.append(tabla_simbolos.agregar(parte))
+    return resultado
+
+# Función para volver a escribir una lista de partes simbolizadas como texto, con los nombres de los símbolos
+def nombrar(partes, tabla_simbolos):
+    return ''.join(tabla_simbolos.nombres[parte] if isinstance(parte, int) else parte for parte in partes)
+
+# Función para convertir los terminales en letras del abecedario con números (a1, a2, a3, etc.)
+def convertir_a_letras(expresion):
+    partes = separar_partes(expresion)  # Reconoce comillas simples y dobles
+    resultado = []
+
+    for parte in partes:
+        if parte in mapa_letras:
+            resultado.append(mapa_letras[parte])  # Reemplaza el terminal por la letra con número
+        else:
+            resultado.append(parte)  # Deja operadores y otros caracteres igual
+
+    return ''.join(resultado)
+
+# Función para obtener el número de token de un nombre Tn, o None si no tiene esa forma. Solo se usa con las
+# expresiones ya convertidas a letras; en una gramática los marcadores son partes Marcador (ver partes_token).
+def numero_marcador(nombre):
+    coincidencia = re.fullmatch(r"T(\d+)", nombre)
+    return int(coincidencia.group(1)) if coincidencia else None
+
+# Función para extraer los conjuntos de la sección SETS: nombre -> rangos de códigos (ver unir_rangos)
+# Acepta caracteres entre comillas, CHR(n) y rangos con ".." unidos por "+", por ejemplo 'A'..'Z'+'a'..'z'+'_'
+def extraer_sets(texto):
+    seccion = re.search(r"SETS(.*?)TOKENS", texto, re.S)
+    if not seccion:
+        return {}
+
+    sets = {}
+    for nombre, definicion in re.findall(regex_sets, seccion.group(1), re.M):
+        sets[nombre] = unir_rangos(rango_elemento(*elemento)
+                                   for elemento in re.findall(regex_elementos_set, definicion))
+    return sets
+
+# Expresiones regulares para las definiciones de SETS y sus elementos ('A', CHR(65) o rangos 'A'..'Z')
+regex_sets = r"^\s*(\w+)\s*=\s*(.+)$"
+regex_elementos_set = r"(?:'(.)'|CHR\((\d+)\))(?:\.\.(?:'(.)'|CHR\((\d+)\)))?"
+
+# Elementos de una clase de caracteres: los de SETS o el nombre de un SET
+regex_elementos_clase = regex_elementos_set + r"|(\w+)"
+
+# Caracteres que puede negar una clase [^ ... ]: CHR(0)..CHR(255)
+TOTAL_CARACTERES_CLASE = 256
+
+# Función para obtener el rango (inicio, fin) de códigos de un elemento de SETS ('A', CHR(65) o un rango 'A'..'Z')
+def rango_elemento(inicio_comilla, inicio_chr, fin_comilla, fin_chr):
+    inicio = ord(inicio_comilla) if inicio_comilla else int(inicio_chr)
+    fin = inicio
+    if fin_comilla or fin_chr:
+        fin = ord(fin_comilla) if fin_comilla else int(fin_chr)
+    return inicio, fin
+
+# Función para juntar rangos (inicio, fin) de códigos, con fin incluido, en una tupla de rangos ordenados y
+# disjuntos (los que se tocan o se cruzan quedan en uno). Los caracteres de un SET, una clase o un terminal se
+# guardan siempre así, nunca carácter por carácter. Los rangos vacíos (fin < inicio) se descartan.
+def unir_rangos(rangos):
+    unidos = []
+    for inicio, fin in sorted(rango for rango in rangos if rango[0] <= rango[1]):
+        if unidos and inicio <= unidos[-1][1] + 1:
+            unidos[-1][1] = max(unidos[-1][1], fin)
+        else:
+            unidos.append([inicio, fin])
+    return tuple((inicio, fin) for inicio, fin in unidos)
+
+# Función para obtener los rangos de CHR(0)..CHR(total - 1) que no están en los rangos dados (ya unidos)
+def negar_rangos(rangos, total=TOTAL_CARACTERES_CLASE):
+    negados = []
+    siguiente = 0
+    for inicio, fin in rangos:
+        if inicio >= total:
+            break
+        if inicio > siguiente:
+            negados.append((siguiente, inicio - 1))
+        siguiente = fin + 1
+    if siguiente < total:
+        negados.append((siguiente, total - 1))
+    return tuple(negados)
+
+# Función para obtener los rangos de una clase [ ... ] o [^ ... ] escrita en un token
+def rangos_clase(clase, sets):
+    cuerpo = clase[1:-1]
+    negada = cuerpo.startswith('^')
+    if negada:
+        cuerpo = cuerpo[1:]
+
+    rangos = []
+    for *elemento, nombre_set in re.findall(regex_elementos_clase, cuerpo):
+        if not nombre_set:
+            rangos.append(rango_elemento(*elemento))
+        elif nombre_set in sets:
+            rangos.extend(sets[nombre_set])
+        else:
+            raise Exception(f"Error: El SET {nombre_set} de la clase {clase} no está definido")
+    if re.sub(regex_elementos_clase, '', cuerpo).strip(' \t+'):
+        raise Exception(f"Error: Clase de caracteres no válida: {clase}")
+
+    rangos = unir_rangos(rangos)
+    return negar_rangos(rangos) if negada else rangos
+
+# Función para obtener los rangos de códigos que representa un terminal de la gramática ('x', ''', una clase
+# [ ... ] o el nombre de un SET)
+def rangos_terminal(terminal, sets):
+    if terminal in sets:
+        return sets[terminal]
+    if terminal.startswith('['):
+        return rangos_clase(terminal, sets)
+    if terminal == "'''":
+        return ((ord("'"), ord("'")),)
+    if len(terminal) == 3 and terminal[0] == terminal[-1] and terminal[0] in "'\"":
+        return ((ord(terminal[1]), ord(terminal[1])),)
+    raise Exception(f"Error: El terminal {terminal} no tiene caracteres definidos")
+
+# Función para extraer el número del token de error (ERROR = n), o None si no está definido
+def extraer_token_error(texto):
+    coincidencia = re.search(r"ERROR\s*=\s*(\d+)", texto)
+    return int(coincidencia.group(1)) if coincidencia else None
+
+# Expresión regular de una llamada a acción ({ RESERVADAS() }) escrita después de la expresión de un token
+regex_accion = r"\{[^}]*\}"
+
+# Función para quitar las llamadas a acciones que no forman parte de la expresión regular. La expresión se recorre
+# con sus partes, así una llave entre comillas o dentro de una clase ('{', [ '}' ]) es un terminal y se deja igual.
+def quitar_acciones(expresion):
+    return re.sub(f"{regex_partes}|{regex_accion}",
+                  lambda parte: '' if parte.group(0).startswith('{') else parte.group(0), expresion)
+
+# Función para extraer las expresiones regulares de todos los tokens con sus identificadores
+def extraer_expresion_regular(texto):
+    tokens_matches = re.findall(regex_tokens, texto)
+    return tokens_matches if tokens_matches else None
+
+# Expresión regular para extraer todos los tokens y sus números
+regex_tokens = r"TOKEN\s+(\d+)\s*=\s*(.*)"
+
+# Función para separar la expresión de un token en sus partes, sin acciones y con las concatenaciones
+def partes_expresion(expresion_token):
+    return insertar_concatenaciones(separar_partes(quitar_acciones(expresion_token).strip()))
+
+# Marcador Tn que va al final de cada token. Se escribe como "Tn", pero simbolizar lo pasa a un símbolo marcador y
+# no a un terminal, así no se confunde con un SET o terminal que se llame igual.
+class Marcador(str):
+    def __new__(cls, numero):
+        marcador = super().__new__(cls, f"T{numero}")
+        marcador.numero = int(numero)
+        return marcador
+
+    # Para pickle (las partes se pasan a los procesos de construir_fragmentos)
+    def __getnewargs__(self):
+        return (self.numero,)
+
+# Función para separar un token en las partes de (expresión con concatenaciones) . Tn
+def partes_token(numero_token, expresion_token):
+    return ['('] + partes_expresion(expresion_token) + [')', '.', Marcador(numero_token)]
+
+# Función para dar a un token el formato (expresión con concatenaciones) . Tn
+def formatear_token(numero_token, expresion_token):
+    return ''.join(partes_token(numero_token, expresion_token))
+
+# Función para unir los tokens extraídos en una sola expresión, sin espacios en blanco, separados por "|"
+def construir_expresion_tokens(tokens_extraidos):
+    # Crear una lista con los tokens en el formato (expresión con concatenaciones) . Tn
+    tokens_formateados = [formatear_token(numero_token, expresion_token) for numero_token, expresion_token in tokens_extraidos]
+    # Unir todos los tokens con el separador "|" sin espacios en blanco
+    return "|".join(tokens_formateados)
+
+# Función para guardar los tokens extraídos en una sola línea, sin espacios en blanco, separados por "|".
+# La guía de correspondencias sale de la tabla de símbolos de la compilación si se da (los terminales sin letra se
+# muestran con su propio nombre); si no, del mapa fijo de letras con el que convertir_a_letras armó la expresión.
+def guardar_expresion_regular_tokens(ruta_salida, tokens_extraidos, expresion_original=None, expresion_letras=None,
+                                     tabla_simbolos=None):
+    try:
+        with open(ruta_salida, 'w') as archivo_salida:
+            if expresion_original is None:  # Se reutiliza la expresión si ya fue construida
+                expresion_original = construir_expresion_tokens(tokens_extraidos)
+            archivo_salida.write(expresion_original + '\n\n')  # Agregar espacio en blanco entre las expresiones
+
+            # Convertir a la versión con letras del abecedario y números (si no viene ya del compilador)
+            if expresion_letras is None:
+                expresion_letras = convertir_a_letras(expresion_original)
+            archivo_salida.write(expresion_letras + '\n\n')  # Guardar la versión con letras
+
+            # Guardar la guía de correspondencias entre terminales y letras
+            archivo_salida.write("Guia de correspondencias (Terminal -> Letra):\n")
+            if tabla_simbolos is not None:
+                correspondencias = zip(tabla_simbolos.terminales, tabla_simbolos.nombres)
+            else:
+                correspondencias = mapa_letras.items()
+            for terminal, letra in correspondencias:
+                archivo_salida.write(f"{terminal} -> {letra}\n")
+        print(f"Tokens guardados exitosamente en {ruta_salida}")
+    except Exception as e:
+        print(f"Ocurrió un error al intentar guardar el archivo: {e}")
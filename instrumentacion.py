@@ -0,0 +1,99 @@
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+# Registro de lo que pasa en cada etapa de la compilación: duración, cantidades (nodos, hojas, estados, ...)
+# y, si se pide, el perfil de cProfile de una sola etapa. Se usa con
+#     with instrumentacion.etapa('construir_arbol'):
+#         ...
+# y al final reporte() devuelve todo como diccionario (o escribir_reporte() lo guarda como una línea JSON).
+class Instrumentacion:
+    activa = True
+
+    # perfilar: nombre de la etapa que se captura con cProfile (None para ninguna)
+    # al_terminar_etapa: función opcional que se llama con (nombre, segundos) al terminar cada etapa
+    def __init__(self, perfilar=None, al_terminar_etapa=None, lineas_perfil=20):
+        self.perfilar = perfilar
+        self.al_terminar_etapa = al_terminar_etapa
+        self.lineas_perfil = lineas_perfil
+        self.etapas = []  # Lista de (nombre, segundos) en el orden en que terminaron
+        self.datos = {}  # Cantidades registradas: nodos, hojas, estados, follow_maximo, ...
+        self.perfil = None  # cProfile.Profile de la etapa perfilada
+
+    @contextmanager
+    def etapa(self, nombre):
+        perfil = None
+        if nombre == self.perfilar:
+            perfil = cProfile.Profile()
+            perfil.enable()
+        inicio = time.perf_counter()
+        try:
+            yield self
+        finally:
+            duracion = time.perf_counter() - inicio
+            if perfil is not None:
+                perfil.disable()
+                self.perfil = perfil
+            self.etapas.append((nombre, duracion))
+            if self.al_terminar_etapa is not None:
+                self.al_terminar_etapa(nombre, duracion)
+
+    # Registrar cantidades de la compilación (se reemplazan si ya estaban)
+    def registrar(self, **datos):
+        self.datos.update(datos)
+
+    # Texto con las funciones más costosas de la etapa perfilada
+    def texto_perfil(self):
+        if self.perfil is None:
+            return None
+        salida = io.StringIO()
+        pstats.Stats(self.perfil, stream=salida).sort_stats('cumulative').print_stats(self.lineas_perfil)
+        return salida.getvalue()
+
+    # Guardar el perfil en formato de pstats (para abrirlo con snakeviz, pstats, ...)
+    def guardar_perfil(self, ruta):
+        if self.perfil is None:
+            raise Exception(f"Error: No se perfiló ninguna etapa (perfilar={self.perfilar})")
+        self.perfil.dump_stats(ruta)
+
+    def reporte(self):
+        etapas = {}
+        for nombre, segundos in self.etapas:
+            etapas[nombre] = etapas.get(nombre, 0.0) + segundos
+        reporte = {
+            'tiempo': time.time(),
+            'etapas': etapas,
+            'total_segundos': sum(etapas.values()),
+            'datos': self.datos,
+        }
+        if self.perfil is not None:
+            reporte['etapa_perfilada'] = self.perfilar
+            reporte['perfil'] = self.texto_perfil()
+        return reporte
+
+    # Escribir el reporte como una línea JSON al final del archivo (o en stderr si no se da ruta)
+    def escribir_reporte(self, ruta=None):
+        linea = json.dumps(self.reporte(), ensure_ascii=False)
+        if ruta is None:
+            print(linea, file=sys.stderr)
+            return
+        with open(ruta, 'a') as archivo:
+            archivo.write(linea + '\n')
+
+# Instrumentación apagada: etapa() devuelve siempre el mismo contexto vacío y registrar() no hace nada,
+# así el compilador no paga casi nada cuando no se pide instrumentación.
+class InstrumentacionNula:
+    activa = False
+    contexto_vacio = nullcontext()
+
+    def etapa(self, nombre):
+        return self.contexto_vacio
+
+    def registrar(self, **datos):
+        pass
+
+sin_instrumentacion = InstrumentacionNula()
@@ -0,0 +1,161 @@
+import argparse
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing import shared_memory
+
+from cache_afd import leer_artefacto, serializar_artefacto
+from compilador import compilar_archivo
+from escaner import IGNORAR, Escaner, construir_escaner
+
+# Llave con la que se guarda la tabla en la memoria compartida (no es una caché: solo identifica el formato)
+CLAVE_LOTE = 'lote'
+
+# Token con el que los procesos marcan los caracteres de error (el token de error puede ser None)
+TOKEN_ERROR_LOTE = -1
+
+# Tabla del escáner copiada una sola vez a un bloque de multiprocessing.shared_memory, en el formato de
+# cache_afd. Los procesos se conectan por nombre y leen la tabla sin copiarla, en vez de recibirla en cada tarea.
+class TablaCompartida:
+    def __init__(self, escaner):
+        datos = serializar_artefacto(CLAVE_LOTE, escaner.tabla, escaner.filas, escaner.aceptacion_filas,
+                                     {'token_error': escaner.token_error, 'ignorar': escaner.ignorar})
+        self.memoria = shared_memory.SharedMemory(create=True, size=len(datos))
+        self.memoria.buf[:len(datos)] = datos
+        self.nombre = self.memoria.name
+
+    # Liberar el bloque (solo lo hace el proceso que lo creó)
+    def cerrar(self):
+        self.memoria.close()
+        self.memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+# Conectar a la tabla compartida y armar el escáner de un proceso (se guarda en variables del módulo)
+memoria_proceso = None
+escaner_proceso = None
+
+def iniciar_proceso(nombre_memoria):
+    global memoria_proceso, escaner_proceso
+    memoria_proceso = shared_memory.SharedMemory(name=nombre_memoria)
+    artefacto = leer_artefacto(memoria_proceso.buf, CLAVE_LOTE)
+    if artefacto is None:
+        raise Exception("Error: La memoria compartida no tiene una tabla de escáner válida")
+    tabla, filas, aceptacion_filas, metadatos = artefacto
+    escaner_proceso = Escaner(tabla, TOKEN_ERROR_LOTE, metadatos['ignorar'], filas, aceptacion_filas)
+
+# Texto de un documento: la entrada misma o el archivo de esa ruta, leído como Latin-1 para que las posiciones
+# sean las de los bytes
+def leer_documento(entrada, es_ruta=False):
+    if not es_ruta:
+        return entrada
+    with open(entrada, 'rb') as archivo:
+        return archivo.read().decode('latin-1')
+
+# Función que corre en cada proceso: tokenizar un documento con el escáner de la tabla compartida.
+# Devuelve los (token, inicio, fin) seguidos en un array('i'), que se pasa al proceso principal como un solo
+# bloque de bytes (una lista de tuplas cuesta casi lo mismo de serializar que de escanear). Si el documento
+# tiene 2 GiB o más, las posiciones no caben en int32 y el array es de tipo 'q'.
+def tokenizar_documento(entrada, es_ruta=False, escaner=None):
+    escaner = escaner_proceso if escaner is None else escaner
+    texto = leer_documento(entrada, es_ruta)
+    return array(tipo_documento(len(texto)), chain.from_iterable(escaner.tokenizar(texto)))
+
+# Función para obtener el tipo del array de un documento: int32 mientras las posiciones quepan, si no int64
+def tipo_documento(largo):
+    return 'i' if largo < 1 << 31 else 'q'
+
+# Pasar el array('i') de un documento a la lista de (token, inicio, fin) con el token de error del escáner
+def triples_documento(tokens, token_error=None):
+    valores = iter(tokens)
+    return [(token if token != TOKEN_ERROR_LOTE else token_error, inicio, fin)
+            for token, inicio, fin in zip(valores, valores, valores)]
+
+# Tokenizar muchos documentos independientes repartiéndolos entre procesos. entradas son textos o, con
+# son_rutas=True, rutas de archivos. Devuelve, en el mismo orden que las entradas, la lista de (token, inicio, fin)
+# de cada documento; con compacto=True devuelve el array('i') (o 'q', ver tokenizar_documento) con los tres
+# valores seguidos y -1 como token de error, sin armar las tuplas. Con un solo proceso se tokeniza aquí mismo,
+# sin memoria compartida.
+def tokenizar_lote(escaner, entradas, procesos=None, son_rutas=False, compacto=False, tamano_lote=None):
+    entradas = list(entradas)
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    if procesos <= 1 or len(entradas) <= 1:
+        escaner_lote = Escaner(escaner.tabla, TOKEN_ERROR_LOTE, escaner.ignorar, escaner.filas,
+                               escaner.aceptacion_filas)
+        for entrada in entradas:
+            tokens = tokenizar_documento(entrada, son_rutas, escaner_lote)
+            yield tokens if compacto else triples_documento(tokens, escaner.token_error)
+        return
+
+    if tamano_lote is None:
+        tamano_lote = max(1, len(entradas) // (procesos * 4))
+    with TablaCompartida(escaner) as tabla:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=iniciar_proceso,
+                                 initargs=(tabla.nombre,)) as ejecutor:
+            for tokens in ejecutor.map(tokenizar_documento, entradas, [son_rutas] * len(entradas),
+                                       chunksize=tamano_lote):
+                yield tokens if compacto else triples_documento(tokens, escaner.token_error)
+
+# Medir caracteres por segundo del lote completo con cada cantidad de procesos
+def medir_lote(escaner, textos, cantidades_procesos):
+    total_caracteres = sum(len(texto) for texto in textos)
+    mediciones = []
+    for procesos in cantidades_procesos:
+        inicio = time.perf_counter()
+        total_tokens = sum(len(tokens) // 3 for tokens in tokenizar_lote(escaner, textos, procesos, compacto=True))
+        duracion = time.perf_counter() - inicio
+        mediciones.append((procesos, total_caracteres / duracion if duracion else float('inf'), total_tokens))
+    return mediciones
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Tokeniza varios archivos en paralelo con una sola tabla compartida.")
+    parser.add_argument('gramatica', help="Ruta del archivo de gramática")
+    parser.add_argument('entradas', nargs='+', help="Rutas de los archivos a tokenizar")
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Cantidad de procesos (por defecto, uno por núcleo)")
+    parser.add_argument('--sin-minimizar', action='store_true', help="Usar el AFD sin minimizar")
+    parser.add_argument('--medir', type=int, nargs='+', metavar='PROCESOS',
+                        help="En vez de mostrar los tokens, medir caracteres por segundo con cada cantidad de procesos")
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+
+    try:
+        resultado = compilar_archivo(args.gramatica, generar_afd=False)
+        if resultado is None:
+            print("No se pudo leer el archivo de gramática.")
+            return 1
+        escaner = construir_escaner(resultado, minimizar=not args.sin_minimizar, ignorar=IGNORAR)
+    except Exception as e:
+        print(e)
+        return 1
+
+    try:
+        if args.medir:
+            textos = []
+            for ruta in args.entradas:
+                with open(ruta, 'rb') as archivo:
+                    textos.append(archivo.read().decode('latin-1'))
+            for procesos, velocidad, total_tokens in medir_lote(escaner, textos, args.medir):
+                print(f"{procesos} procesos: {velocidad:,.0f} caracteres/s ({total_tokens} tokens)")
+            return 0
+
+        for ruta, tokens in zip(args.entradas, tokenizar_lote(escaner, args.entradas, args.procesos, True)):
+            for token, inicio, fin in tokens:
+                print(f"{ruta}\t{token}\t{inicio}\t{fin}")
+    except OSError as e:
+        print(f"Ocurrió un error: {e}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+from collections import deque
+
+from conjuntos import conjuntos_python
+
+# Minimizar el AFD con el algoritmo de Hopcroft.
+# La partición inicial separa los estados según el token que aceptan, así dos estados que aceptan
+# tokens distintos nunca se juntan. Las transiciones que faltan van a un estado muerto implícito;
+# los estados equivalentes a él (los que ya no pueden aceptar nada) se eliminan del resultado.
+# Devuelve las transiciones, los estados (unión de las posiciones de los estados que se juntaron)
+# y la aceptación del AFD mínimo, con el estado inicial como S0.
+def minimizar_afd(transiciones, estados, aceptacion, alfabeto, conjuntos=conjuntos_python):
+    total = len(transiciones)
+    if total == 0:
+        return [], [], []
+    muerto = total  # Estado muerto implícito
+
+    # Transiciones inversas: inversas[simbolo][destino] = estados que llegan a destino con simbolo
+    inversas = {simbolo: {} for simbolo in alfabeto}
+    for origen, fila in enumerate(transiciones):
+        for simbolo in alfabeto:
+            destino = fila.get(simbolo, muerto)
+            inversas[simbolo].setdefault(destino, []).append(origen)
+    for simbolo in alfabeto:
+        inversas[simbolo].setdefault(muerto, []).append(muerto)
+
+    # Partición inicial: un bloque por token aceptado y uno para los que no aceptan (con el estado muerto)
+    grupos = {}
+    for estado in range(total):
+        grupos.setdefault(aceptacion[estado], set()).add(estado)
+    grupos.setdefault(None, set()).add(muerto)
+
+    particion = list(grupos.values())
+    bloque_de = [0] * (total + 1)
+    for id_bloque, bloque in enumerate(particion):
+        for estado in bloque:
+            bloque_de[estado] = id_bloque
+    pendientes = set(range(len(particion)))
+
+    while pendientes:
+        divisor = list(particion[pendientes.pop()])
+        for simbolo in alfabeto:
+            inversas_simbolo = inversas[simbolo]
+
+            # Estados que con este símbolo llegan al bloque divisor, agrupados por su bloque actual
+            afectados = {}
+            for destino in divisor:
+                for origen in inversas_simbolo.get(destino, ()):
+                    afectados.setdefault(bloque_de[origen], set()).add(origen)
+
+            for id_bloque, interseccion in afectados.items():
+                bloque = particion[id_bloque]
+                if len(interseccion) == len(bloque):
+                    continue
+
+                # Partir el bloque: la intersección se queda con el id, la diferencia es un bloque nuevo
+                diferencia = bloque - interseccion
+                id_nuevo = len(particion)
+                particion[id_bloque] = interseccion
+                particion.append(diferencia)
+                for estado in diferencia:
+                    bloque_de[estado] = id_nuevo
+
+                if id_bloque in pendientes:
+                    pendientes.add(id_nuevo)
+                elif len(interseccion) <= len(diferencia):
+                    pendientes.add(id_bloque)
+                else:
+                    pendientes.add(id_nuevo)
+
+    # Renumerar los bloques en el orden en que se alcanzan desde el estado inicial, sin el bloque muerto
+    bloque_muerto = bloque_de[muerto]
+    if bloque_de[0] == bloque_muerto:
+        return [], [], []
+    representantes = {}  # id de bloque -> nuevo id de estado
+    orden = []
+    pendientes_bfs = deque([bloque_de[0]])
+    representantes[bloque_de[0]] = 0
+    while pendientes_bfs:
+        id_bloque = pendientes_bfs.popleft()
+        orden.append(id_bloque)
+        fila = transiciones[next(iter(particion[id_bloque]))]
+        for simbolo in alfabeto:
+            destino = fila.get(simbolo)
+            if destino is None:
+                continue
+            id_destino = bloque_de[destino]
+            if id_destino != bloque_muerto and id_destino not in representantes:
+                representantes[id_destino] = len(representantes)
+                pendientes_bfs.append(id_destino)
+
+    transiciones_minimas = []
+    estados_minimos = []
+    aceptacion_minima = []
+    for id_bloque in orden:
+        miembros = sorted(particion[id_bloque])
+        fila = transiciones[miembros[0]]
+        fila_minima = {}
+        for simbolo in alfabeto:
+            destino = fila.get(simbolo)
+            if destino is not None and bloque_de[destino] != bloque_muerto:
+                fila_minima[simbolo] = representantes[bloque_de[destino]]
+        transiciones_minimas.append(fila_minima)
+
+        posiciones = conjuntos.vacio()
+        for miembro in miembros:
+            posiciones = posiciones | estados[miembro]
+        estados_minimos.append(conjuntos.clave(posiciones))
+        aceptacion_minima.append(aceptacion[miembros[0]])
+
+    return transiciones_minimas, estados_minimos, aceptacion_minima
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+from conjuntos import conjuntos_python
+from transiciones import calcular_aceptacion
+
+# Cantidad de estados que se guardan por defecto en el AFD perezoso
+CAPACIDAD = 4096
+
+# Estado ya materializado: llave de su conjunto de posiciones, token que acepta (None si no acepta) y transiciones
+# calculadas hasta ahora (clase -> llave del estado destino, o None si no hay transición)
+class EstadoPerezoso:
+    def __init__(self, llave, token):
+        self.llave = llave
+        self.token = token
+        self.transiciones = {}
+
+# AFD que se construye mientras se escanea. Un estado es la llave de su conjunto de posiciones y su transición con
+# una clase se calcula la primera vez que se pide, uniendo los Follow de sus posiciones que cumplen la clase.
+# Los estados calculados se guardan en una caché de tamaño limitado: al pasarse se saca el usado hace más tiempo.
+class AFDPerezoso:
+    def __init__(self, arbol, follow_dict, simbolos_hoja, marcadores, clases_simbolo, conjuntos=conjuntos_python,
+                 capacidad=CAPACIDAD):
+        if capacidad < 1:
+            raise Exception("Error: La capacidad de la caché debe ser al menos 1")
+        self.follow_dict = follow_dict
+        self.marcadores = marcadores
+        self.conjuntos = conjuntos
+        self.capacidad = capacidad
+        # Posición -> clases con las que avanza (los marcadores Tn no avanzan con ninguna)
+        self.clases_posicion = {pos: frozenset(clases_simbolo.get(simbolo, ()))
+                                for pos, simbolo in simbolos_hoja.items()}
+        inicial = arbol.first[arbol.raiz] if arbol.raiz >= 0 else conjuntos.vacio()
+        self.inicial = conjuntos.clave(inicial) if inicial else None
+        self.estados = OrderedDict()  # Llave -> EstadoPerezoso, del usado hace más tiempo al más reciente
+        self.aciertos = 0  # Transiciones que ya estaban calculadas
+        self.fallos = 0  # Transiciones que hubo que calcular
+        self.desalojos = 0  # Estados que se sacaron de la caché
+
+    # Obtener el estado de una llave, materializándolo si no está en la caché
+    def estado(self, llave):
+        estado = self.estados.get(llave)
+        if estado is not None:
+            self.estados.move_to_end(llave)
+            return estado
+        estado = EstadoPerezoso(llave, calcular_aceptacion([llave], self.marcadores, self.conjuntos)[0])
+        self.estados[llave] = estado
+        if len(self.estados) > self.capacidad:
+            self.estados.popitem(last=False)
+            self.desalojos += 1
+        return estado
+
+    # Llave del estado al que se llega desde estado (ya materializado) con la clase, o None si no hay transición
+    def siguiente(self, estado, clase):
+        destino = estado.transiciones.get(clase, False)
+        if destino is not False:
+            self.aciertos += 1
+            return destino
+
+        self.fallos += 1
+        conjuntos = self.conjuntos
+        clases_posicion = self.clases_posicion
+        follow_dict = self.follow_dict
+        transicion = conjuntos.vacio()
+        for pos in conjuntos.posiciones(estado.llave):
+            if clase in clases_posicion[pos]:
+                transicion = transicion | follow_dict[pos]
+        destino = conjuntos.clave(transicion) if transicion else None
+        estado.transiciones[clase] = destino
+        return destino
+
+    # Contadores de la caché
+    def estadisticas(self):
+        return {'estados': len(self.estados), 'aciertos': self.aciertos, 'fallos': self.fallos,
+                'desalojos': self.desalojos}
@@ -0,0 +1,121 @@
+from conjuntos import conjuntos_python
+
+# Bits de cada bloque de las tablas de Follow: con 8 bits cada bloque tiene 256 uniones ya calculadas.
+# Por omisión no se arman: cada entrada es una máscara de todas las posiciones, así las tablas ocupan del orden
+# de posiciones² bytes y con gramáticas grandes pesan más que el AFD que se quiere evitar.
+BITS_BLOQUE = 0
+
+# Memoria máxima (aproximada, en bytes) de las tablas de bloques; si no alcanza se usan bloques más chicos
+MEMORIA_TABLAS = 32 << 20
+
+# Con hasta estas posiciones activas conviene unir sus Follow uno por uno en vez de recorrer los bloques
+POSICIONES_SIN_TABLAS = 8
+
+# Función para pasar un conjunto de posiciones (de cualquier representación) a un entero con un bit por posición
+def mascara_conjunto(conjunto, conjuntos=conjuntos_python):
+    mascara = 0
+    for pos in conjuntos.posiciones(conjunto):
+        mascara |= 1 << pos
+    return mascara
+
+# Autómata de posiciones (Glushkov) simulado directamente, sin construir el AFD. Las posiciones activas son un
+# entero con un bit por hoja y un paso con la clase c es:
+#     activas = unión de Follow(p) para cada p en (activas & mascara_clase[c])
+# La unión se hace por bloques de bits_bloque posiciones: para cada bloque hay una tabla con la unión de los Follow
+# de cada combinación de sus bits, así que un paso cuesta una consulta por bloque (o, si hay pocas posiciones
+# activas, una unión por posición).
+# La memoria crece con las posiciones (Follow y tablas de bloques), no con los estados del AFD, que pueden ser
+# exponenciales. Con bits_bloque=0 no se arman tablas y se une el Follow de cada posición activa; si las tablas
+# pasarían de memoria_tablas bytes se achican los bloques (hasta no armarlas).
+class AutomataPosiciones:
+    def __init__(self, arbol, follow_dict, simbolos_hoja, marcadores, clases_simbolo, conjuntos=conjuntos_python,
+                 bits_bloque=BITS_BLOQUE, memoria_tablas=MEMORIA_TABLAS):
+        if bits_bloque < 0:
+            raise Exception("Error: Los bits por bloque no pueden ser negativos")
+        self.total_posiciones = max(simbolos_hoja, default=0)
+        while bits_bloque and self.memoria_tablas(bits_bloque) > memoria_tablas:
+            bits_bloque -= 1
+        self.bits_bloque = bits_bloque
+        self.inicial = mascara_conjunto(arbol.first[arbol.raiz], conjuntos) if arbol.raiz >= 0 else 0
+
+        # Posición -> máscara de su Follow (la posición 0 no existe)
+        self.follow = [0] * (self.total_posiciones + 1)
+        for pos, conjunto in follow_dict.items():
+            self.follow[pos] = mascara_conjunto(conjunto, conjuntos)
+
+        # Clase -> posiciones con las que se avanza con esa clase (los marcadores Tn no avanzan con ninguna)
+        self.mascara_clase = {}
+        for pos, simbolo in simbolos_hoja.items():
+            for clase in clases_simbolo.get(simbolo, ()):
+                self.mascara_clase[clase] = self.mascara_clase.get(clase, 0) | (1 << pos)
+
+        # Posiciones de los marcadores y token de cada una; si hay varias activas gana la menor, como en el AFD
+        self.mascara_marcadores = 0
+        self.token_posicion = [None] * (self.total_posiciones + 1)
+        for pos, token in marcadores.items():
+            self.mascara_marcadores |= 1 << pos
+            self.token_posicion[pos] = token
+
+        self.tablas = self.tablas_bloques() if bits_bloque else None
+
+    # Bytes aproximados de las tablas con bloques de bits_bloque bits: cada entrada es un lugar de la lista más
+    # un entero con un bit por posición
+    def memoria_tablas(self, bits_bloque):
+        bloques = self.total_posiciones // bits_bloque + 1
+        return bloques * (1 << bits_bloque) * (36 + self.total_posiciones // 8)
+
+    # Tablas de cada bloque: tablas[b][v] es la unión de los Follow de las posiciones b * bits_bloque + i con el
+    # bit i encendido en v. Cada entrada se arma con la de v sin su bit más bajo, así cuesta una unión.
+    def tablas_bloques(self):
+        bits_bloque = self.bits_bloque
+        follow = self.follow
+        tablas = []
+        for base in range(0, self.total_posiciones + 1, bits_bloque):
+            tabla = [0] * (1 << bits_bloque)
+            for valor in range(1, 1 << bits_bloque):
+                bit_bajo = valor & -valor
+                pos = base + bit_bajo.bit_length() - 1
+                tabla[valor] = tabla[valor ^ bit_bajo] | (follow[pos] if pos < len(follow) else 0)
+            tablas.append(tabla)
+        return tablas
+
+    # Posiciones activas después de avanzar con la clase (0 si no hay transición)
+    def siguiente(self, activas, clase):
+        return self.avanzar(activas & self.mascara_clase.get(clase, 0))
+
+    # Unión de los Follow de las posiciones de la máscara
+    def avanzar(self, mascara):
+        resultado = 0
+        tablas = self.tablas
+        if tablas is None or mascara.bit_count() <= POSICIONES_SIN_TABLAS:
+            follow = self.follow
+            while mascara:
+                bit_bajo = mascara & -mascara
+                resultado |= follow[bit_bajo.bit_length() - 1]
+                mascara ^= bit_bajo
+            return resultado
+
+        # Se salta directo al primer bloque con posiciones y de ahí se recorren los bloques en orden
+        bits_bloque = self.bits_bloque
+        valor_maximo = (1 << bits_bloque) - 1
+        bloque = ((mascara & -mascara).bit_length() - 1) // bits_bloque
+        mascara >>= bloque * bits_bloque
+        while mascara:
+            valor = mascara & valor_maximo
+            if valor:
+                resultado |= tablas[bloque][valor]
+            mascara >>= bits_bloque
+            bloque += 1
+        return resultado
+
+    # Token que aceptan las posiciones activas (None si no hay marcadores activos)
+    def token(self, activas):
+        aceptadas = activas & self.mascara_marcadores
+        if not aceptadas:
+            return None
+        return self.token_posicion[(aceptadas & -aceptadas).bit_length() - 1]
+
+    # Tamaño del autómata: posiciones, clases y entradas de las tablas de bloques
+    def estadisticas(self):
+        return {'posiciones': self.total_posiciones, 'clases': len(self.mascara_clase),
+                'entradas_tablas': sum(len(tabla) for tabla in self.tablas) if self.tablas else 0}
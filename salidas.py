@@ -0,0 +1,194 @@
+import csv
+import json
+import struct
+import sys
+from array import array
+
+from arbol import recorrer_inorden
+from conjuntos import conjuntos_python, formatear_conjunto
+
+# Tamaño del búfer de escritura de los archivos de salida
+TAMANO_BUFER = 1 << 16
+
+# Formatos de salida disponibles para cada tabla (ver registrar_escritor)
+FORMATOS = ['texto', 'csv', 'jsonl', 'binario']
+
+# Función para guardar los resultados de First, Last y Nullable en un archivo de texto
+def guardar_en_tabla_txt(arbol, archivo_txt, conjuntos=conjuntos_python):
+    with open(archivo_txt, 'w', buffering=TAMANO_BUFER) as archivo:
+        archivo.write(f"{'SIMBOLO':<10} {'FIRST':<10} {'LAST':<10} {'NULLABLE':<10}\n")
+        archivo.write("-" * 40 + "\n")
+        guardar_nodo_en_tabla(arbol, archivo, conjuntos)
+
+def guardar_nodo_en_tabla(arbol, archivo, conjuntos=conjuntos_python):
+    for nodo in recorrer_inorden(arbol):
+        first = formatear_conjunto(conjuntos, arbol.first[nodo])
+        last = formatear_conjunto(conjuntos, arbol.last[nodo])
+        archivo.write(f"{arbol.valor(nodo):<10} {first:<10} {last:<10} {str(bool(arbol.nullable[nodo])):<10}\n")
+
+# Función para guardar los resultados de Follow en un archivo de texto
+def guardar_follow_en_txt(follow_dict, archivo_txt, conjuntos=conjuntos_python):
+    with open(archivo_txt, 'w', buffering=TAMANO_BUFER) as archivo:
+        archivo.write(f"{'SIMBOLO':<10} {'FOLLOW':<10}\n")
+        archivo.write("-" * 20 + "\n")
+        for simbolo, follow in sorted(follow_dict.items()):
+            archivo.write(f"{simbolo:<10} {str(conjuntos.ordenados(follow)):<10}\n")
+
+# Función para obtener las columnas de la tabla de transiciones: los terminales ordenados y la clase de cada uno
+def columnas_tabla(tabla):
+    terminales = sorted(tabla.clase_entrada)
+    return terminales, [tabla.clase_entrada[terminal] for terminal in terminales]
+
+# Función para obtener los destinos de un estado en el orden de las columnas
+def destinos_estado(tabla, estado, clases):
+    inicio = estado * tabla.total_clases
+    fila = tabla.transiciones[inicio:inicio + tabla.total_clases]
+    return [fila[clase] for clase in clases]
+
+# Guardar la tabla en un archivo .txt con los terminales como encabezados
+def guardar_tabla_en_txt(tabla, estados, archivo_txt, conjuntos=conjuntos_python):
+    with open(archivo_txt, 'w', buffering=TAMANO_BUFER) as archivo:
+        # Escribir encabezado con los terminales (sin repetidos)
+        terminales, clases = columnas_tabla(tabla)
+        archivo.write(f"{'Estado':<50} " + " ".join(f"{terminal:<50}" for terminal in terminales) + "\n")
+        archivo.write("-" * (50 + len(terminales) * 51) + "\n")
+
+        # Cada estado se ordena y se escribe como texto una sola vez; las celdas reutilizan ese texto
+        textos_estados = [str(conjuntos.ordenados(estado)) for estado in estados]  # str() evita las dobles llaves
+        celdas = [f"{texto:<50}" for texto in textos_estados]
+        celda_vacia = f"{str([]):<50}"
+
+        # Escribir los estados y las transiciones
+        for i, texto in enumerate(textos_estados):
+            estado_str = f"S{i}={texto}"
+            transiciones_str = " ".join(celdas[destino] if destino >= 0 else celda_vacia
+                                        for destino in destinos_estado(tabla, i, clases))
+            archivo.write(f"{estado_str:<50} {transiciones_str}\n")
+
+# Formato CSV: posiciones separadas por espacios y destinos como número de estado (vacío si no hay transición)
+def guardar_tabla_en_csv(tabla, estados, archivo_csv, conjuntos=conjuntos_python):
+    with open(archivo_csv, 'w', newline='', buffering=TAMANO_BUFER) as archivo:
+        escritor = csv.writer(archivo)
+        terminales, clases = columnas_tabla(tabla)
+        escritor.writerow(['estado', 'posiciones', 'token'] + terminales)
+        for i, estado in enumerate(estados):
+            token = tabla.token(i)
+            escritor.writerow([i, " ".join(map(str, conjuntos.ordenados(estado))), "" if token is None else token] +
+                              ["" if destino < 0 else destino for destino in destinos_estado(tabla, i, clases)])
+
+def guardar_follow_en_csv(follow_dict, archivo_csv, conjuntos=conjuntos_python):
+    with open(archivo_csv, 'w', newline='', buffering=TAMANO_BUFER) as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['posicion', 'follow'])
+        escritor.writerows((posicion, " ".join(map(str, conjuntos.ordenados(follow))))
+                           for posicion, follow in sorted(follow_dict.items()))
+
+def guardar_fln_en_csv(arbol, archivo_csv, conjuntos=conjuntos_python):
+    with open(archivo_csv, 'w', newline='', buffering=TAMANO_BUFER) as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['simbolo', 'first', 'last', 'nullable'])
+        escritor.writerows((arbol.valor(nodo), " ".join(map(str, conjuntos.ordenados(arbol.first[nodo]))),
+                            " ".join(map(str, conjuntos.ordenados(arbol.last[nodo]))), int(arbol.nullable[nodo]))
+                           for nodo in recorrer_inorden(arbol))
+
+# Formato JSON lines: la primera línea describe la tabla y después hay un objeto por fila
+def guardar_tabla_en_jsonl(tabla, estados, archivo_jsonl, conjuntos=conjuntos_python):
+    with open(archivo_jsonl, 'w', buffering=TAMANO_BUFER) as archivo:
+        terminales, clases = columnas_tabla(tabla)
+        archivo.write(json.dumps({'tabla': 'transiciones', 'estados': len(estados), 'simbolos': terminales},
+                                 ensure_ascii=False) + "\n")
+        for i, estado in enumerate(estados):
+            transiciones = {terminal: destino
+                            for terminal, destino in zip(terminales, destinos_estado(tabla, i, clases)) if destino >= 0}
+            archivo.write(json.dumps({'estado': i, 'posiciones': conjuntos.ordenados(estado), 'token': tabla.token(i),
+                                      'transiciones': transiciones}, ensure_ascii=False) + "\n")
+
+def guardar_follow_en_jsonl(follow_dict, archivo_jsonl, conjuntos=conjuntos_python):
+    with open(archivo_jsonl, 'w', buffering=TAMANO_BUFER) as archivo:
+        archivo.write(json.dumps({'tabla': 'follow', 'posiciones': len(follow_dict)}) + "\n")
+        for posicion, follow in sorted(follow_dict.items()):
+            archivo.write(json.dumps({'posicion': posicion, 'follow': conjuntos.ordenados(follow)}) + "\n")
+
+def guardar_fln_en_jsonl(arbol, archivo_jsonl, conjuntos=conjuntos_python):
+    with open(archivo_jsonl, 'w', buffering=TAMANO_BUFER) as archivo:
+        archivo.write(json.dumps({'tabla': 'fln', 'nodos': len(arbol)}) + "\n")
+        for nodo in recorrer_inorden(arbol):
+            archivo.write(json.dumps({'simbolo': arbol.valor(nodo), 'first': conjuntos.ordenados(arbol.first[nodo]),
+                                      'last': conjuntos.ordenados(arbol.last[nodo]),
+                                      'nullable': bool(arbol.nullable[nodo])}, ensure_ascii=False) + "\n")
+
+# Formato binario: MAGIA (4 bytes) y después enteros uint32/int32 en little-endian.
+# Un texto se guarda como largo + bytes UTF-8 y una lista de posiciones como largo + posiciones.
+MAGIA_TRANSICIONES = b'LFAT'
+MAGIA_FOLLOW = b'LFAF'
+MAGIA_FLN = b'LFAN'
+
+def escribir_texto(archivo, texto):
+    datos = texto.encode('utf-8')
+    archivo.write(struct.pack('<I', len(datos)))
+    archivo.write(datos)
+
+def escribir_enteros(archivo, valores):
+    enteros = array('i', valores)
+    if sys.byteorder != 'little':  # Los enteros se guardan siempre en little-endian
+        enteros.byteswap()
+    archivo.write(enteros.tobytes())
+
+def escribir_posiciones(archivo, posiciones):
+    archivo.write(struct.pack('<I', len(posiciones)))
+    escribir_enteros(archivo, posiciones)
+
+# Transiciones: estados, clases, terminales (texto y clase), tabla densa estados x clases, token de cada estado
+# (-1 si no acepta) y las posiciones de cada estado
+def guardar_tabla_en_binario(tabla, estados, archivo_binario, conjuntos=conjuntos_python):
+    with open(archivo_binario, 'wb', buffering=TAMANO_BUFER) as archivo:
+        terminales, clases = columnas_tabla(tabla)
+        archivo.write(MAGIA_TRANSICIONES + struct.pack('<III', len(estados), tabla.total_clases, len(terminales)))
+        for terminal, clase in zip(terminales, clases):
+            escribir_texto(archivo, terminal)
+            archivo.write(struct.pack('<I', clase))
+        escribir_enteros(archivo, tabla.transiciones)
+        escribir_enteros(archivo, tabla.aceptacion)
+        for estado in estados:
+            escribir_posiciones(archivo, conjuntos.ordenados(estado))
+
+def guardar_follow_en_binario(follow_dict, archivo_binario, conjuntos=conjuntos_python):
+    with open(archivo_binario, 'wb', buffering=TAMANO_BUFER) as archivo:
+        archivo.write(MAGIA_FOLLOW + struct.pack('<I', len(follow_dict)))
+        for posicion, follow in sorted(follow_dict.items()):
+            archivo.write(struct.pack('<I', posicion))
+            escribir_posiciones(archivo, conjuntos.ordenados(follow))
+
+# FLN: un registro por nodo en inorden con símbolo, first, last y nullable (un byte)
+def guardar_fln_en_binario(arbol, archivo_binario, conjuntos=conjuntos_python):
+    with open(archivo_binario, 'wb', buffering=TAMANO_BUFER) as archivo:
+        archivo.write(MAGIA_FLN + struct.pack('<I', len(arbol)))
+        for nodo in recorrer_inorden(arbol):
+            escribir_texto(archivo, arbol.valor(nodo))
+            escribir_posiciones(archivo, conjuntos.ordenados(arbol.first[nodo]))
+            escribir_posiciones(archivo, conjuntos.ordenados(arbol.last[nodo]))
+            archivo.write(b'\x01' if arbol.nullable[nodo] else b'\x00')
+
+# Escritores por tabla y formato. Todos reciben los datos de la tabla, la ruta y la representación de conjuntos.
+escritores = {
+    'transiciones': {'texto': guardar_tabla_en_txt, 'csv': guardar_tabla_en_csv, 'jsonl': guardar_tabla_en_jsonl,
+                     'binario': guardar_tabla_en_binario},
+    'follow': {'texto': guardar_follow_en_txt, 'csv': guardar_follow_en_csv, 'jsonl': guardar_follow_en_jsonl,
+               'binario': guardar_follow_en_binario},
+    'fln': {'texto': guardar_en_tabla_txt, 'csv': guardar_fln_en_csv, 'jsonl': guardar_fln_en_jsonl,
+            'binario': guardar_fln_en_binario},
+}
+
+# Agregar (o reemplazar) el escritor de una tabla en un formato
+def registrar_escritor(tabla, formato, escritor):
+    if tabla not in escritores:
+        raise Exception(f"Error: Tabla de salida no reconocida: {tabla}")
+    escritores[tabla][formato] = escritor
+    if formato not in FORMATOS:
+        FORMATOS.append(formato)
+
+# Función para obtener el escritor de una tabla ('transiciones', 'follow' o 'fln') en un formato
+def obtener_escritor(tabla, formato='texto'):
+    if tabla not in escritores or formato not in escritores[tabla]:
+        raise Exception(f"Error: No hay escritor de {tabla} en formato {formato}")
+    return escritores[tabla][formato]
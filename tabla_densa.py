@@ -0,0 +1,165 @@
+from array import array
+from bisect import bisect_right
+
+try:
+    import numpy
+except ImportError:  # NumPy es opcional, la tabla funciona con array
+    numpy = None
+
+SIN_TRANSICION = -1  # Valor de la tabla cuando no hay transición (y de aceptacion cuando el estado no acepta)
+
+# Clase de cada carácter guardada por tramos de códigos: (inicio, fin, clase) ordenados, disjuntos y con fin
+# incluido. Los caracteres que no están en ningún tramo son de la clase 0. Así un SET o una clase [^ ... ] que
+# cubre miles de códigos es un solo tramo. Para leer rápido, los códigos menores que 256 (Latin-1) van además en
+# un arreglo de 256 clases y los demás se buscan con bisect en los tramos desde 256.
+class ClasesCaracteres:
+    def __init__(self, tramos):
+        self.tramos = []
+        for inicio, fin, clase in tramos:
+            if clase == 0:
+                continue  # La clase 0 es la de los caracteres fuera de todo tramo
+            if self.tramos and self.tramos[-1][1] == inicio - 1 and self.tramos[-1][2] == clase:
+                self.tramos[-1][1] = fin  # Dos tramos seguidos de la misma clase son uno solo
+            else:
+                self.tramos.append([inicio, fin, clase])
+
+        self.clase_byte = array('i', [0] * 256)  # Byte -> clase
+        self.inicios_extra = []  # Tramos desde el código 256, para bisect
+        self.fines_extra = []
+        self.clases_extra = []
+        for inicio, fin, clase in self.tramos:
+            for codigo in range(inicio, min(fin, 255) + 1):
+                self.clase_byte[codigo] = clase
+            if fin >= 256:
+                self.inicios_extra.append(max(inicio, 256))
+                self.fines_extra.append(fin)
+                self.clases_extra.append(clase)
+        # Tabla de bytes.translate (byte -> clase), si todas las clases caben en un byte
+        self.traduccion = bytes(list(self.clase_byte)) if max(self.clases(), default=0) < 256 else None
+
+    # Clase de un carácter (0 si no es de ninguna)
+    def clase(self, caracter):
+        codigo = ord(caracter)
+        if codigo < 256:
+            return self.clase_byte[codigo]
+        indice = bisect_right(self.inicios_extra, codigo) - 1
+        if indice >= 0 and codigo <= self.fines_extra[indice]:
+            return self.clases_extra[indice]
+        return 0
+
+    # Secuencia de las clases de un texto: bytes si todas las clases caben en un byte, si no una lista
+    def clases_texto(self, texto):
+        if self.traduccion is not None:
+            try:
+                return texto.encode('latin-1').translate(self.traduccion)
+            except UnicodeEncodeError:
+                pass
+        clase = self.clase
+        return [clase(caracter) for caracter in texto]
+
+    # Clases distintas de 0, ordenadas
+    def clases(self):
+        return sorted({clase for _, _, clase in self.tramos})
+
+    # Las mismas clases con otros números (clase -> clase nueva)
+    def renumerar(self, clase_nueva):
+        return ClasesCaracteres([(inicio, fin, clase_nueva[clase]) for inicio, fin, clase in self.tramos])
+
+    # Clase -> lista de rangos [inicio, fin] de sus códigos
+    def miembros(self, total_clases):
+        miembros = [[] for _ in range(total_clases)]
+        for inicio, fin, clase in self.tramos:
+            miembros[clase].append([inicio, fin])
+        return miembros
+
+# Tabla de transiciones densa: las entradas (símbolos o caracteres) que se comportan igual en todos los estados
+# se juntan en una clase, y la tabla se guarda como un arreglo plano de estados x clases.
+# El destino de (estado, clase) está en transiciones[estado * total_clases + clase].
+# La clase 0 es la de las entradas sin ninguna transición (también las que no están en el alfabeto).
+# Si las entradas son caracteres, clase_entrada es una ClasesCaracteres; si son símbolos, un diccionario.
+class TablaDensa:
+    def __init__(self, transiciones, aceptacion, total_clases, clase_entrada, miembros=None):
+        self.transiciones = transiciones  # array('i') de tamaño total_estados * total_clases
+        self.aceptacion = aceptacion  # array('i'): token que acepta cada estado o SIN_TRANSICION
+        self.total_clases = total_clases
+        self.total_estados = len(aceptacion)
+        self.clase_entrada = clase_entrada  # Entrada -> clase (ClasesCaracteres o diccionario)
+        if miembros is None:
+            miembros = self.calcular_miembros()
+        self.miembros = miembros  # Clase -> lista de entradas (o de rangos [inicio, fin] de caracteres)
+        self.clase_byte = self.calcular_clase_byte()  # Byte -> clase, si las entradas son caracteres
+
+    # Estado destino de un estado con una clase (SIN_TRANSICION si no hay)
+    def destino(self, estado, clase):
+        return self.transiciones[estado * self.total_clases + clase]
+
+    # Clase de una entrada (símbolo o carácter)
+    def clase(self, entrada):
+        if isinstance(self.clase_entrada, ClasesCaracteres):
+            return self.clase_entrada.clase(entrada)
+        return self.clase_entrada.get(entrada, 0)
+
+    # Estado destino de un estado con una entrada (símbolo o carácter)
+    def destino_entrada(self, estado, entrada):
+        return self.transiciones[estado * self.total_clases + self.clase(entrada)]
+
+    # Token que acepta el estado, o None
+    def token(self, estado):
+        token = self.aceptacion[estado]
+        return None if token == SIN_TRANSICION else token
+
+    # Arreglo de 256 clases para leer bytes directamente (Latin-1); None si las entradas no son caracteres
+    def calcular_clase_byte(self):
+        if isinstance(self.clase_entrada, ClasesCaracteres):
+            return self.clase_entrada.clase_byte
+        return None
+
+    def calcular_miembros(self):
+        if isinstance(self.clase_entrada, ClasesCaracteres):
+            return self.clase_entrada.miembros(self.total_clases)
+        miembros = [[] for _ in range(self.total_clases)]
+        for entrada, clase in self.clase_entrada.items():
+            miembros[clase].append(entrada)
+        return miembros
+
+    # Vista de la tabla como matriz int32 de NumPy (estados x clases), sin copiar los datos
+    def como_matriz(self):
+        if numpy is None:
+            raise Exception("Error: NumPy no está instalado")
+        return numpy.frombuffer(self.transiciones, dtype=numpy.int32).reshape(self.total_estados, self.total_clases)
+
+# Construir la tabla densa a partir de las transiciones por diccionario.
+# entradas es un diccionario entrada -> letra del alfabeto usada en transiciones (para el AFD por símbolos es
+# la identidad) o, para el AFD por caracteres, la ClasesCaracteres cuyas clases son las letras.
+def construir_tabla_densa(transiciones, aceptacion, entradas):
+    total_estados = len(transiciones)
+    por_caracteres = isinstance(entradas, ClasesCaracteres)
+    letras = entradas.clases() if por_caracteres else dict.fromkeys(entradas.values())
+
+    # Agrupar las letras del alfabeto cuya columna es igual en todos los estados
+    columna_vacia = (SIN_TRANSICION,) * total_estados
+    clases_columna = {columna_vacia: 0}
+    columnas = [columna_vacia]
+    clase_letra = {}
+    for letra in letras:
+        columna = tuple(fila.get(letra, SIN_TRANSICION) for fila in transiciones)
+        clase = clases_columna.get(columna)
+        if clase is None:
+            clase = len(columnas)
+            clases_columna[columna] = clase
+            columnas.append(columna)
+        clase_letra[letra] = clase
+
+    total_clases = len(columnas)
+    tabla = array('i', [SIN_TRANSICION]) * (total_estados * total_clases)
+    for clase, columna in enumerate(columnas):
+        for estado, destino in enumerate(columna):
+            tabla[estado * total_clases + clase] = destino
+
+    if por_caracteres:
+        clase_entrada = entradas.renumerar(clase_letra)
+    else:
+        clase_entrada = {entrada: clase_letra[letra] for entrada, letra in entradas.items()}
+
+    tokens = array('i', (SIN_TRANSICION if token is None else token for token in aceptacion))
+    return TablaDensa(tabla, tokens, total_clases, clase_entrada)
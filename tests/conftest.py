@@ -0,0 +1,113 @@
+import os
+import random
+import re
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import compilar_gramatica  # noqa: E402
+from escaner import IGNORAR, construir_expresion_re  # noqa: E402
+
+# Gramática chica con los casos que más se rompen: +, ?, ε, clases [..], palabras reservadas antes de
+# identificadores, prefijos comunes ('<', '<=', '<>') y tokens que dependen de la prioridad
+GRAMATICA_BASE = """SETS
+	LETRA = 'A'..'Z'+'a'..'z'+'_'
+	DIGITO = '0'..'9'
+TOKENS
+	TOKEN 1= DIGITO + ( '.' DIGITO + )? ( 'e' ( '+' | '-' | ) DIGITO+ )?
+	TOKEN 2= 'I''F'
+	TOKEN 3= LETRA ( LETRA | DIGITO )*
+	TOKEN 4= '<' ( '=' | ε | '>' )
+	TOKEN 5= '"' [^ '"' ] * '"'
+	TOKEN 6= [CHR(43) '-']
+	TOKEN 7= '(''*'
+	TOKEN 8= '('
+	TOKEN 9= '<''<''<'
+ERROR = 54
+"""
+
+# Gramática con tokens que comparten prefijos y ciclos, para la simplificación del árbol
+GRAMATICA_PREFIJOS = """TOKENS
+	TOKEN 1= 'a' ( ( 'c' )* )+ ( ε )+ () 'a'
+	TOKEN 2= 'a' ( ( ( () | () ) )* | ( 'b' | 'c' ) ( 'a' )+ )
+	TOKEN 3= 'a' ( ( 'c' )* ( () )+ )*
+	TOKEN 4= 'a' ( ( ( 'b' | 'b' ) )* | ( ( 'b' | 'a' ) | ( 'c' )? ) )
+	TOKEN 5= 'a' ( () | 'b' ) ( 'b' )? ( ( ε | () ) | ( 'c' )* )
+ERROR = 54
+"""
+
+# Gramática con un SET que cubre todo Unicode desde CHR(128): las clases se guardan por rangos, sin recorrer
+# cada código
+GRAMATICA_UNICODE = """SETS
+	LETRA = 'a'..'z'
+	U = CHR(128)..CHR(1114111)
+TOKENS
+	TOKEN 1= LETRA ( LETRA | U )*
+	TOKEN 2= U U*
+	TOKEN 3= [^ 'a'..'z' ' ']
+ERROR = 9
+"""
+
+TEXTOS_UNICODE = ['abλ€x 𝄞𝄞 ÿ!a', '\U0010ffff a\x80', 'zz\u0100\u00ff~ ']
+
+GRAMATICAS = {'base': GRAMATICA_BASE, 'prefijos': GRAMATICA_PREFIJOS}
+NOMBRES = sorted(GRAMATICAS)
+
+ALFABETOS = {'base': 'aIFz09.e+-<=>"(*x \n', 'prefijos': 'abc '}
+
+# Textos de prueba: uno fijo y varios al azar con el alfabeto de la gramática
+def textos_prueba(nombre, cantidad=20, largo=60, semilla=0):
+    aleatorio = random.Random(semilla)
+    alfabeto = ALFABETOS[nombre]
+    textos = ['IF x1 <= 3.5e+2 (* "hola" <<< <> IFa - +', 'aacca abca acb aaa', '']
+    textos.extend(''.join(aleatorio.choice(alfabeto) for _ in range(aleatorio.randint(1, largo)))
+                  for _ in range(cantidad))
+    return textos
+
+@pytest.fixture
+def ruta_gramatica(tmp_path):
+    def escribir(contenido, nombre='gramatica.txt'):
+        ruta = tmp_path / nombre
+        ruta.write_text(contenido, encoding='utf-8')
+        return str(ruta)
+    return escribir
+
+# Escáner de referencia independiente del AFD: en cada inicio prueba todos los largos de mayor a menor con la
+# expresión de "re" de cada token, en el orden en que se declararon (el primero gana si hay empate)
+class EscanerReferencia:
+    def __init__(self, resultado, ignorar=IGNORAR):
+        self.patrones = []
+        for numero, expresion in resultado.tokens_extraidos:
+            token = SimpleNamespace(tokens_extraidos=[(numero, expresion)], sets=resultado.sets)
+            patron = construir_expresion_re(token).pattern
+            self.patrones.append((int(numero), re.compile(patron, re.DOTALL)))
+        self.token_error = resultado.token_error
+        self.ignorar = ignorar
+
+    def tokenizar(self, texto):
+        inicio = 0
+        while inicio < len(texto):
+            encontrado = None
+            for fin in range(len(texto), inicio, -1):
+                for numero, patron in self.patrones:
+                    if patron.fullmatch(texto, inicio, fin):
+                        encontrado = (numero, inicio, fin)
+                        break
+                if encontrado:
+                    break
+            if encontrado:
+                yield encontrado
+                inicio = encontrado[2]
+            else:
+                if texto[inicio] not in self.ignorar:
+                    yield self.token_error, inicio, inicio + 1
+                inicio += 1
+
+# Compilar una gramática de prueba y tokenizar sus textos con el escáner de referencia
+def referencia(nombre):
+    resultado = compilar_gramatica(GRAMATICAS[nombre])
+    escaner = EscanerReferencia(resultado)
+    return resultado, [list(escaner.tokenizar(texto)) for texto in textos_prueba(nombre)]
@@ -0,0 +1,34 @@
+import sys
+
+from arbol import construir_arbol, recorrer_inorden
+from compilador import compilar_expresion, compilar_gramatica
+
+# Una expresión mucho más profunda que el límite de recursión se construye y se recorre sin recursión
+def test_expresion_profunda():
+    largo = sys.getrecursionlimit() * 2
+    resultado = compilar_expresion('.'.join(['a1'] * largo) + '.e1')
+    assert resultado.total_hojas == largo + 1
+    assert len(resultado.estados) == largo + 1
+
+    anidada = compilar_expresion('(' * largo + 'a1' + ')*' * largo + '.e1')
+    assert anidada.total_hojas == 2
+
+# Los nodos van en arreglos paralelos y cada nodo se agrega después de sus hijos
+def test_arbol_en_arreglos():
+    arbol, total_hojas = construir_arbol('(a1|a2).a1*')
+    assert total_hojas == 3
+    assert [arbol.valor(nodo) for nodo in recorrer_inorden(arbol)] == ['a1', '|', 'a2', '.', 'a1', '*']
+    assert all(hijo < nodo for nodo in range(len(arbol)) for hijo in (arbol.izquierdo[nodo], arbol.derecho[nodo]))
+
+# x+ y x? usan las posiciones de x una sola vez; ε, () y la alternativa vacía no tienen posiciones
+def test_mas_opcional_y_vacio():
+    mas = compilar_expresion('a1+.a2?.e1')
+    repetido = compilar_expresion('a1.a1*.(a2|()).e1')
+    assert mas.total_hojas == 3
+    assert repetido.total_hojas == 4
+    assert len(mas.estados) == len(repetido.estados)
+    arbol = mas.arbol
+    assert [arbol.valor(nodo) for nodo in recorrer_inorden(arbol)][:5] == ['a1', '+', '.', 'a2', '?']
+
+    vacios = compilar_gramatica("TOKENS\n\tTOKEN 1= 'a' ( 'b' | ) ε ()\nERROR = 5\n")
+    assert vacios.total_hojas == 3
@@ -0,0 +1,63 @@
+import json
+import os
+import struct
+
+from cache_afd import cargar_artefacto, clave_gramatica, guardar_artefacto, ruta_cache, serializar_artefacto
+from compilador import compilar_gramatica
+from conftest import GRAMATICA_BASE, GRAMATICA_UNICODE, TEXTOS_UNICODE, textos_prueba
+from escaner import Escaner, construir_escaner, obtener_escaner
+
+def test_artefacto_ida_y_vuelta(tmp_path):
+    escaner = construir_escaner(compilar_gramatica(GRAMATICA_BASE))
+    clave = clave_gramatica(GRAMATICA_BASE)
+    ruta = ruta_cache(str(tmp_path), clave)
+    guardar_artefacto(ruta, clave, escaner.tabla, escaner.filas, escaner.aceptacion_filas,
+                      {'token_error': escaner.token_error})
+    for usar_mmap in (False, True):
+        tabla, filas, aceptacion_filas, metadatos = cargar_artefacto(ruta, clave, usar_mmap)
+        cargado = Escaner(tabla, metadatos['token_error'], escaner.ignorar, filas, aceptacion_filas)
+        for texto in textos_prueba('base'):
+            assert list(cargado.tokenizar(texto)) == list(escaner.tokenizar(texto))
+    assert cargar_artefacto(ruta, 'otra llave') is None
+
+def test_cache_del_escaner(ruta_gramatica, tmp_path):
+    ruta = ruta_gramatica(GRAMATICA_BASE)
+    directorio = str(tmp_path / 'cache')
+    nuevo = obtener_escaner(ruta, directorio)
+    assert len(os.listdir(directorio)) == 1
+    cargado = obtener_escaner(ruta, directorio)
+    for texto in textos_prueba('base'):
+        assert list(cargado.tokenizar(texto)) == list(nuevo.tokenizar(texto))
+
+    # Las posiciones de los metadatos vuelven como enteros aunque la cabecera sea JSON
+    archivo = os.listdir(directorio)[0]
+    metadatos = cargar_artefacto(os.path.join(directorio, archivo), archivo[:-len('.lfad')])[3]
+    resultado = compilar_gramatica(GRAMATICA_BASE)
+    assert dict(metadatos['simbolos_hoja']) == resultado.simbolos_hoja
+    assert dict(metadatos['marcadores']) == resultado.marcadores
+
+# El mapa de clases se guarda como tramos de códigos: un SET de todo Unicode no agranda la cabecera
+def test_cache_clases_por_rangos(ruta_gramatica, tmp_path):
+    ruta = ruta_gramatica(GRAMATICA_UNICODE)
+    directorio = str(tmp_path / 'cache')
+    nuevo = obtener_escaner(ruta, directorio)
+    assert os.path.getsize(os.path.join(directorio, os.listdir(directorio)[0])) < 4096
+    cargado = obtener_escaner(ruta, directorio)
+    for texto in TEXTOS_UNICODE:
+        assert list(cargado.tokenizar(texto)) == list(nuevo.tokenizar(texto))
+
+# Una cabecera con la magia y el JSON bien pero sin alguna llave (o con otro tipo) hace recompilar, no falla
+def test_cache_cabecera_incompleta(tmp_path):
+    escaner = construir_escaner(compilar_gramatica(GRAMATICA_BASE))
+    clave = clave_gramatica(GRAMATICA_BASE)
+    datos = serializar_artefacto(clave, escaner.tabla, escaner.filas, escaner.aceptacion_filas, {})
+    largo_cabecera = struct.unpack('<I', datos[8:12])[0]
+    cabecera = json.loads(datos[12:12 + largo_cabecera])
+    sin_largos = {nombre: valor for nombre, valor in cabecera.items() if nombre != 'largos'}
+    ruta = str(tmp_path / 'cache.lfad')
+    for nueva in (sin_largos, {**cabecera, 'largos': {}}, {**cabecera, 'version': None, 'clave': None},
+                  {**cabecera, 'tramos': 5}, {**cabecera, 'largos': {**cabecera['largos'], 'filas': 10 ** 9}}, []):
+        texto = json.dumps(nueva).encode('utf-8')
+        with open(ruta, 'wb') as archivo:
+            archivo.write(datos[:8] + struct.pack('<I', len(texto)) + texto + datos[12 + largo_cabecera:])
+        assert cargar_artefacto(ruta, clave) is None, nueva
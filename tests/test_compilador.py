@@ -0,0 +1,72 @@
+import pytest
+
+from benchmark import generar_entrada, generar_gramatica, medir_gramatica
+from compilador import compilar_expresion, compilar_gramatica, main
+from conftest import GRAMATICAS, NOMBRES, textos_prueba
+from escaner import construir_escaner
+
+def tokens_escaner(resultado, nombre):
+    escaner = construir_escaner(resultado)
+    return [list(escaner.tokenizar(texto)) for texto in textos_prueba(nombre)]
+
+# Una sola pasada da el árbol con sus hojas numeradas, Follow de cada hoja y las transiciones de cada estado
+@pytest.mark.parametrize('nombre', NOMBRES)
+def test_compilar_gramatica(nombre):
+    resultado = compilar_gramatica(GRAMATICAS[nombre])
+    assert sorted(resultado.simbolos_hoja) == list(range(1, resultado.total_hojas + 1))
+    assert sorted(resultado.follow_dict) == list(range(1, resultado.total_hojas + 1))
+    assert len(resultado.transiciones) == len(resultado.estados)
+
+# La expresión en letras se compila igual que la que sale de la gramática
+def test_compilar_expresion():
+    resultado = compilar_expresion("(a1.a1*).e1|(a3.(a3|a1)*).e2")
+    assert resultado.total_hojas == 7
+    assert compilar_expresion(resultado.expresion).transiciones == resultado.transiciones
+
+# main escribe solo las salidas pedidas y devuelve 1 si no puede leer la gramática
+def test_main_salidas(ruta_gramatica, tmp_path):
+    ruta = ruta_gramatica(GRAMATICAS['base'])
+    salidas = {opcion: tmp_path / f'{opcion}.txt' for opcion in ('tokens', 'fln', 'follow', 'transiciones')}
+    argumentos = [ruta]
+    for opcion, salida in salidas.items():
+        argumentos.extend([f'--{opcion}', str(salida)])
+    assert main(argumentos) == 0
+    assert all(salida.stat().st_size > 0 for salida in salidas.values())
+    assert main([str(tmp_path / 'no_existe.txt')]) == 1
+
+@pytest.mark.parametrize('nombre', NOMBRES)
+@pytest.mark.parametrize('opciones', [{'conjuntos': 'set'}, {'minimizar': True}, {'simplificar': True},
+                                      {'procesos': 2}])
+def test_variantes_compilacion(nombre, opciones):
+    esperado = tokens_escaner(compilar_gramatica(GRAMATICAS[nombre]), nombre)
+    assert tokens_escaner(compilar_gramatica(GRAMATICAS[nombre], **opciones), nombre) == esperado
+
+@pytest.mark.parametrize('nombre', NOMBRES)
+def test_minimizar_no_agrega_estados(nombre):
+    normal = compilar_gramatica(GRAMATICAS[nombre])
+    minimo = compilar_gramatica(GRAMATICAS[nombre], minimizar=True)
+    assert len(minimo.estados) <= len(normal.estados)
+
+def test_simplificar_reduce_posiciones():
+    normal = compilar_gramatica(GRAMATICAS['prefijos'])
+    simplificado = compilar_gramatica(GRAMATICAS['prefijos'], simplificar=True)
+    assert simplificado.total_hojas < normal.total_hojas
+
+# El benchmark mide la compilación real (con sus etapas) con cada variante
+@pytest.mark.parametrize('opciones', [{}, {'simplificar': True}, {'procesos': 2}, {'incremental': True},
+                                      {'medir_posiciones': True, 'medir_memoria': True}])
+def test_benchmark_etapas(opciones):
+    opciones = {'medir_memoria': False, **opciones}
+    medicion = medir_gramatica(generar_gramatica(tokens=5), generar_entrada(largo=2000), **opciones)
+    etapas = medicion['etapas']
+    assert 'generar_tabla_transiciones' in etapas and 'escanear' in etapas
+    assert ('construir_fragmentos' in etapas) == bool(opciones.get('procesos') or opciones.get('incremental'))
+    assert ('recompilar' in etapas) == bool(opciones.get('incremental'))
+    assert all((etapa['memoria_pico'] is not None) == opciones['medir_memoria'] for etapa in etapas.values())
+
+# Con --expresion la concatenación puede ir implícita, como en la gramática: da el mismo autómata que con los "."
+def test_expresion_concatenacion_implicita():
+    implicita = compilar_expresion("(a1.a1*).b2|(w2.a2.w2|m2.a2.m2).b3|(a3.(a3|a1)*b1.()).c1")
+    explicita = compilar_expresion("(a1.a1*).b2|(w2.a2.w2|m2.a2.m2).b3|(a3.(a3|a1)*.b1.()).c1")
+    assert implicita.total_hojas == explicita.total_hojas
+    assert implicita.transiciones == explicita.transiciones
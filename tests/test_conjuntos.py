@@ -0,0 +1,25 @@
+import pytest
+
+from compilador import compilar_gramatica
+from conftest import GRAMATICAS, NOMBRES
+from conjuntos import conjuntos_bits, formatear_conjunto, obtener_conjuntos
+
+def test_conjuntos_bits():
+    conjunto = conjuntos_bits.unitario(70) | conjuntos_bits.unitario(3) | conjuntos_bits.unitario(9)
+    assert conjuntos_bits.ordenados(conjunto) == [3, 9, 70]
+    assert conjuntos_bits.tamano(conjunto) == 3
+    assert formatear_conjunto(conjuntos_bits, conjunto) == "{3, 9, 70}"
+    assert formatear_conjunto(conjuntos_bits, conjuntos_bits.vacio()) == "set()"
+    with pytest.raises(Exception):
+        obtener_conjuntos('lista')
+
+# Con enteros de bits y con set de Python salen los mismos Follow, estados y transiciones
+@pytest.mark.parametrize('nombre', NOMBRES)
+def test_bits_igual_a_set(nombre):
+    bits = compilar_gramatica(GRAMATICAS[nombre], conjuntos='bits')
+    python = compilar_gramatica(GRAMATICAS[nombre], conjuntos='set')
+    assert ({pos: bits.conjuntos.ordenados(follow) for pos, follow in bits.follow_dict.items()} ==
+            {pos: python.conjuntos.ordenados(follow) for pos, follow in python.follow_dict.items()})
+    assert ([bits.conjuntos.ordenados(estado) for estado in bits.estados] ==
+            [python.conjuntos.ordenados(estado) for estado in python.estados])
+    assert bits.transiciones == python.transiciones
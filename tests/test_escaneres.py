@@ -0,0 +1,111 @@
+import pytest
+
+from compilador import compilar_gramatica
+from conftest import (GRAMATICA_UNICODE, GRAMATICAS, NOMBRES, TEXTOS_UNICODE, EscanerReferencia, referencia,
+                      textos_prueba)
+from escaner import Escaner, construir_escaner, construir_escaner_perezoso, construir_escaner_posiciones
+
+@pytest.mark.parametrize('nombre', NOMBRES)
+@pytest.mark.parametrize('minimizar', [False, True])
+def test_escaner_tabla(nombre, minimizar):
+    resultado, esperados = referencia(nombre)
+    escaner = construir_escaner(resultado, minimizar)
+    for texto, esperado in zip(textos_prueba(nombre), esperados):
+        assert list(escaner.tokenizar(texto)) == esperado, texto
+
+@pytest.mark.parametrize('nombre', NOMBRES)
+@pytest.mark.parametrize('capacidad', [2, 4096])
+def test_escaner_perezoso(nombre, capacidad):
+    resultado, esperados = referencia(nombre)
+    escaner = construir_escaner_perezoso(resultado, capacidad)
+    for texto, esperado in zip(textos_prueba(nombre), esperados):
+        assert list(escaner.tokenizar(texto)) == esperado, texto
+
+@pytest.mark.parametrize('nombre', NOMBRES)
+@pytest.mark.parametrize('tamano_bloque', [1, 3, 1 << 20])
+@pytest.mark.parametrize('usar_mmap', [False, True])
+def test_flujo_por_bloques(nombre, tamano_bloque, usar_mmap, tmp_path):
+    resultado, esperados = referencia(nombre)
+    escaner = construir_escaner(resultado)
+    for indice, (texto, esperado) in enumerate(zip(textos_prueba(nombre), esperados)):
+        ruta = tmp_path / f'entrada{indice}.txt'
+        ruta.write_bytes(texto.encode('latin-1'))
+        assert list(escaner.tokenizar_archivo(str(ruta), tamano_bloque, usar_mmap)) == esperado, texto
+
+# Un token más largo que muchos bloques se sigue escaneando desde donde quedó: cada byte da un solo paso
+@pytest.mark.parametrize('lexemas', [False, True])
+def test_flujo_token_largo(lexemas, tmp_path):
+    resultado = compilar_gramatica(GRAMATICAS['base'])
+    escaner = construir_escaner(resultado)
+    pasos = []
+
+    class FilasContadas(list):
+        def __getitem__(self, indice):
+            pasos.append(indice)
+            return list.__getitem__(self, indice)
+
+    contado = Escaner(escaner.tabla, escaner.token_error, escaner.ignorar, FilasContadas(escaner.filas),
+                      escaner.aceptacion_filas)
+    texto = 'x' * 5000 + ' 12 "' + 'y' * 3000 + '" <<'
+    ruta = tmp_path / 'entrada.txt'
+    ruta.write_bytes(texto.encode('latin-1'))
+    tokens = list(contado.tokenizar_archivo(str(ruta), 7, lexemas=lexemas))
+    esperado = list(escaner.tokenizar(texto))
+    if lexemas:
+        assert [(token, inicio, fin) for token, inicio, fin, _ in tokens] == esperado
+        assert [lexema for _, _, _, lexema in tokens] == [texto[inicio:fin].encode('latin-1')
+                                                        for _, inicio, fin in esperado]
+    else:
+        assert tokens == esperado
+    assert len(pasos) < len(texto) + 20
+
+def test_filas_preparadas():
+    resultado, esperados = referencia('base')
+    escaner = construir_escaner(resultado)
+    copia = Escaner(escaner.tabla, escaner.token_error, escaner.ignorar)
+    for texto, esperado in zip(textos_prueba('base'), esperados):
+        assert list(copia.tokenizar(texto)) == esperado
+
+# Con más de 256 clases no se puede usar bytes.translate y las clases de cada bloque van en un array
+@pytest.mark.parametrize('tamano_bloque', [1, 7, 1 << 20])
+def test_flujo_mas_de_256_clases(tamano_bloque, tmp_path):
+    tokens = '\n'.join(f'\tTOKEN {codigo}= [CHR({codigo})] [CHR({codigo})]*' for codigo in range(1, 300))
+    resultado = compilar_gramatica(f'TOKENS\n{tokens}\nERROR = 1000\n')
+    escaner = construir_escaner(resultado)
+    assert escaner.traduccion is None
+    datos = bytes(range(256)) * 3 + b'aaab  \x01\x01\xff'
+    ruta = tmp_path / 'entrada.bin'
+    ruta.write_bytes(datos)
+    esperado = list(escaner.tokenizar(datos.decode('latin-1')))
+    corto = 'aaab  \x01\x01\xff\x00'
+    assert list(escaner.tokenizar(corto)) == list(EscanerReferencia(resultado).tokenizar(corto))
+    assert list(escaner.tokenizar_archivo(str(ruta), tamano_bloque)) == esperado
+
+# Un SET de más de un millón de códigos queda en un par de tramos y los tres escáneres lo leen con bisect
+def test_clases_por_rangos():
+    resultado = compilar_gramatica(GRAMATICA_UNICODE)
+    escaner = construir_escaner(resultado)
+    assert len(escaner.tabla.clase_entrada.tramos) < 10
+    referencia_unicode = EscanerReferencia(resultado)
+    escaneres = (escaner, construir_escaner_perezoso(resultado), construir_escaner_posiciones(resultado))
+    for texto in TEXTOS_UNICODE:
+        esperado = list(referencia_unicode.tokenizar(texto))
+        for escaner_texto in escaneres:
+            assert list(escaner_texto.tokenizar(texto)) == esperado, texto
+
+# ε va como grupo vacío en la expresión de "re": un *, + o ? después de ε no se pega a la parte anterior
+@pytest.mark.parametrize('expresion, coincide, no_coincide', [
+    ("'a' ε +", ['a'], ['aa', '']),
+    ("( ε ) *", [''], ['a']),
+    ("'a' | ε", ['a', ''], ['aa']),
+])
+def test_expresion_re_epsilon(expresion, coincide, no_coincide):
+    resultado = compilar_gramatica(f"TOKENS\n\tTOKEN 1= {expresion}\n\tTOKEN 2= 'b'\nERROR = 5\n")
+    patron = EscanerReferencia(resultado).patrones[0][1]
+    for texto in coincide:
+        assert patron.fullmatch(texto), texto
+    for texto in no_coincide:
+        assert not patron.fullmatch(texto), texto
+    escaner = construir_escaner(resultado)
+    for texto in ['a', 'aab', 'ba a', '']:
+        assert list(escaner.tokenizar(texto)) == list(EscanerReferencia(resultado).tokenizar(texto)), texto
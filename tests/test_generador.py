@@ -0,0 +1,44 @@
+import pytest
+
+from compilador import compilar_gramatica
+from conftest import GRAMATICA_UNICODE, NOMBRES, TEXTOS_UNICODE, EscanerReferencia, referencia, textos_prueba
+from escaner import construir_escaner
+from generador import cargar_codigo, generar_codigo, guardar_codigo, importar_modulo
+
+@pytest.mark.parametrize('nombre', NOMBRES)
+@pytest.mark.parametrize('saltos_ciclos', [False, True])
+def test_modulo_generado(nombre, saltos_ciclos):
+    resultado, esperados = referencia(nombre)
+    modulo = cargar_codigo(generar_codigo(construir_escaner(resultado), saltos_ciclos))
+    for texto, esperado in zip(textos_prueba(nombre), esperados):
+        assert list(modulo.tokenizar(texto)) == esperado, texto
+
+# El módulo guardado se importa sin el compilador y da los mismos tokens
+def test_modulo_guardado(tmp_path):
+    resultado, esperados = referencia('base')
+    ruta = str(tmp_path / 'escaner_base.py')
+    guardar_codigo(construir_escaner(resultado), ruta)
+    modulo = importar_modulo(ruta)
+    for texto, esperado in zip(textos_prueba('base'), esperados):
+        assert list(modulo.tokenizar(texto)) == esperado, texto
+
+# Los caracteres fuera de Latin-1 que define la gramática tienen su clase también en el módulo generado
+def test_modulo_generado_fuera_de_latin1():
+    resultado = compilar_gramatica("SETS\n\tU = CHR(97)..CHR(98)+CHR(955)\nTOKENS\n\tTOKEN 1= U U*\n"
+                                   "\tTOKEN 2= 'c'\nERROR = 9\n")
+    escaner = construir_escaner(resultado)
+    modulo = cargar_codigo(generar_codigo(escaner))
+    referencia = EscanerReferencia(resultado)
+    for texto in ('abλab', 'λ', 'cλλc€a', 'ab€'):
+        esperado = list(referencia.tokenizar(texto))
+        assert list(escaner.tokenizar(texto)) == esperado
+        assert list(modulo.tokenizar(texto)) == esperado
+
+# Los tramos desde 256 van en el módulo como tuplas para bisect, no un carácter por entrada
+def test_modulo_generado_rangos_grandes():
+    resultado = compilar_gramatica(GRAMATICA_UNICODE)
+    modulo = cargar_codigo(generar_codigo(construir_escaner(resultado)))
+    assert len(modulo.CLASES_EXTRA) < 10
+    referencia_unicode = EscanerReferencia(resultado)
+    for texto in TEXTOS_UNICODE:
+        assert list(modulo.tokenizar(texto)) == list(referencia_unicode.tokenizar(texto)), texto
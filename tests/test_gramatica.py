@@ -0,0 +1,86 @@
+import pytest
+
+from compilador import CompiladorIncremental, compilar_gramatica, guardar_salidas
+from conftest import EscanerReferencia
+from escaner import construir_escaner
+from gramatica import TablaSimbolos, extraer_sets, mapa_letras, rangos_terminal
+
+# Los ids son densos; los terminales con letra conservan su nombre y los demás se llaman como su texto
+def test_tabla_simbolos():
+    tabla = TablaSimbolos()
+    ids = [tabla.agregar(terminal) for terminal in ("'I'", "'F'", 'DIGITO', "'I'", 'VOCAL')]
+    assert ids == [0, 1, 2, 0, 3]
+    assert tabla.nombres == [mapa_letras["'I'"], "'F'", mapa_letras['DIGITO'], 'VOCAL']
+    assert tabla.terminal(mapa_letras['DIGITO']) == 'DIGITO'
+
+# Una gramática con más terminales que letras en el mapa fijo compila y escanea
+def test_terminales_sin_letra():
+    tokens = '\n'.join(f"\tTOKEN {numero}= 'x' '{chr(0x100 + numero)}'" for numero in range(1, 101))
+    resultado = compilar_gramatica(f'TOKENS\n{tokens}\nERROR = 200\n')
+    escaner = construir_escaner(resultado)
+    texto = 'xā xŤxĂ xx'
+    assert list(escaner.tokenizar(texto)) == list(EscanerReferencia(resultado).tokenizar(texto))
+    assert list(escaner.tokenizar(texto))[:3] == [(1, 0, 2), (100, 3, 5), (2, 5, 7)]
+
+# La guía del archivo de tokens trae los terminales de la gramática, también los que no tienen letra
+def test_guia_desde_la_tabla_de_simbolos(tmp_path):
+    resultado = compilar_gramatica("SETS\n\tVOCAL = 'a'+'e'\nTOKENS\n\tTOKEN 1= VOCAL 'F'\nERROR = 5\n")
+    ruta = tmp_path / 'tokens.txt'
+    guardar_salidas(resultado, ruta_tokens=str(ruta))
+    guia = ruta.read_text().split("Guia de correspondencias (Terminal -> Letra):\n")[1].splitlines()
+    assert guia == ['VOCAL -> VOCAL', "'F' -> 'F'", f"T1 -> {mapa_letras['T1']}"]
+
+# Las clases se escriben como los SETS (elementos, rangos, otros SETS y negación) y quedan en rangos ordenados;
+# dos formas de escribir la misma clase son un solo terminal
+def test_clases_en_linea():
+    sets = extraer_sets("SETS\n\tVOCAL = 'a'+'e'\nTOKENS\n")
+    assert rangos_terminal("[VOCAL CHR(98)..'d']", sets) == ((97, 101),)
+    assert rangos_terminal("[^ CHR(0)..CHR(64) 'B'..CHR(255)]", sets) == ((65, 65),)
+    resultado = compilar_gramatica("TOKENS\n\tTOKEN 1= [ 'a'..'c' '_' ] ['a'..'c'+'_']\nERROR = 5\n")
+    assert len(set(resultado.simbolos_hoja.values())) == 2
+
+# SET que se llama como la letra de otro terminal (DIGITO se muestra como a1)
+GRAMATICA_LETRA = """SETS
+	a1 = 'x'
+	DIGITO = '0'..'9'
+TOKENS
+	TOKEN 1= DIGITO DIGITO*
+	TOKEN 2= a1 a1*
+ERROR = 9
+"""
+
+def test_terminales_con_el_nombre_de_una_letra():
+    tabla = TablaSimbolos()
+    assert tabla.agregar('a1') != tabla.agregar('DIGITO')
+    assert tabla.agregar('a1') == tabla.agregar('a1')
+    assert tabla.nombres[tabla.agregar('DIGITO')] == mapa_letras['DIGITO']
+    assert len(set(tabla.nombres)) == len(tabla.nombres)
+    assert tabla.terminal(tabla.nombres[tabla.agregar('a1')]) == 'a1'
+
+@pytest.mark.parametrize('compilar', [compilar_gramatica, lambda gramatica: compilar_gramatica(gramatica, procesos=2),
+                                      lambda gramatica: CompiladorIncremental().compilar(gramatica)])
+def test_gramatica_con_el_nombre_de_una_letra(compilar):
+    resultado = compilar(GRAMATICA_LETRA)
+    escaner = construir_escaner(resultado)
+    referencia = EscanerReferencia(resultado)
+    for texto in ('xx 12', '1x2x', 'a1 DIGITO', ''):
+        assert list(escaner.tokenizar(texto)) == list(referencia.tokenizar(texto))
+    assert list(escaner.tokenizar('xx 12')) == [(2, 0, 2), (1, 3, 5)]
+
+# Un SET que se llama como un marcador (T9) es un terminal: solo el marcador de cada token acepta
+@pytest.mark.parametrize('opciones', [{}, {'procesos': 2}, {'simplificar': True}])
+def test_terminal_con_el_nombre_de_un_marcador(opciones):
+    resultado = compilar_gramatica("SETS\n\tT9 = 'x'\nTOKENS\n\tTOKEN 1= T9 'y'\n\tTOKEN 9= 'z'\nERROR = 5\n",
+                                   **opciones)
+    tabla = resultado.arbol.tabla_simbolos
+    assert sorted(resultado.marcadores.values()) == [1, 9]
+    assert tabla.numero_token(tabla.nombres[tabla.agregar('T9')]) is None
+    assert list(construir_escaner(resultado).tokenizar('xy z x')) == [(1, 0, 2), (9, 3, 4), (5, 5, 6)]
+
+# Las llaves entre comillas son terminales; solo se quitan las acciones { ... } que no están entre comillas
+def test_llaves_entre_comillas():
+    resultado = compilar_gramatica("SETS\n\tLETRA = 'a'..'z'\nTOKENS\n\tTOKEN 1= LETRA LETRA* { RESERVADAS() }\n"
+                                   "\tTOKEN 2= '{' LETRA * '}'\n\tTOKEN 3= [ '{' ]\nERROR = 9\n")
+    escaner = construir_escaner(resultado)
+    assert list(escaner.tokenizar('{ab} ab {')) == [(2, 0, 4), (1, 5, 7), (3, 8, 9)]
+    assert list(escaner.tokenizar('{ab}')) == list(EscanerReferencia(resultado).tokenizar('{ab}'))
@@ -0,0 +1,65 @@
+import pickle
+
+from compilador import VERSION_COMPILADOR, CompiladorIncremental, cargar_compilador_incremental, compilar_gramatica
+from conftest import GRAMATICA_BASE, GRAMATICAS
+
+def test_incremental_igual_a_completo():
+    compilador = CompiladorIncremental()
+    esperado = compilar_gramatica(GRAMATICAS['base'])
+    resultado = compilador.compilar(GRAMATICAS['base'])
+    assert compilador.tokens_recompilados == len(resultado.tokens_extraidos)
+    assert resultado.transiciones == esperado.transiciones
+
+    # Cambiar un token solo recompila ese token
+    cambiada = GRAMATICAS['base'].replace("TOKEN 8= '('", "TOKEN 8= '(' '('")
+    resultado = compilador.compilar(cambiada)
+    assert compilador.tokens_recompilados == 1
+    assert resultado.transiciones == compilar_gramatica(cambiada).transiciones
+
+def test_compilador_incremental_guardado(tmp_path):
+    ruta = str(tmp_path / 'incremental.pkl')
+    compilador = cargar_compilador_incremental(ruta)
+    compilador.compilar(GRAMATICA_BASE)
+    compilador.guardar(ruta)
+
+    cargado = cargar_compilador_incremental(ruta)
+    resultado = cargado.compilar(GRAMATICA_BASE)
+    assert cargado.tokens_recompilados == 0
+    assert resultado.transiciones == compilar_gramatica(GRAMATICA_BASE).transiciones
+
+# Al guardar no se serializan los arreglos ya desplazados de cada fragmento
+def test_compilador_incremental_no_guarda_colocado(tmp_path):
+    ruta = str(tmp_path / 'incremental.pkl')
+    compilador = cargar_compilador_incremental(ruta)
+    compilador.compilar(GRAMATICA_BASE)
+    assert any(fragmento.colocado is not None for fragmento in compilador.fragmentos.values())
+    compilador.guardar(ruta)
+    cargado = cargar_compilador_incremental(ruta)
+    assert all(fragmento.colocado is None for fragmento in cargado.fragmentos.values())
+
+# Un archivo que no se puede leer (basura, un pickle de otra cosa, clases que ya no existen) da un compilador vacío
+def test_compilador_incremental_archivo_invalido(tmp_path):
+    ruta = tmp_path / 'incremental.pkl'
+    contenidos = [b'no es un pickle', pickle.dumps([1, 2, 3]),
+                  pickle.dumps({'version': VERSION_COMPILADOR, 'conjuntos': 'bits'}),
+                  b'cmodulo_que_no_existe\nClase\n.']
+    for contenido in contenidos:
+        ruta.write_bytes(contenido)
+        compilador = cargar_compilador_incremental(str(ruta))
+        assert compilador.fragmentos == {}
+        resultado = compilador.compilar(GRAMATICA_BASE)
+        assert resultado.transiciones == compilar_gramatica(GRAMATICA_BASE).transiciones
+
+# Al quitar un token, los terminales que solo él usaba salen de la tabla de símbolos (y de la guía de --tokens)
+def test_incremental_quita_simbolos_de_tokens_borrados():
+    compilador = CompiladorIncremental()
+    compilador.compilar(GRAMATICA_BASE)
+    assert "'\"'" in compilador.tabla_simbolos.ids
+    sin_token = GRAMATICA_BASE.replace("\tTOKEN 5= '\"' [^ '\"' ] * '\"'\n", "")
+    resultado = compilador.compilar(sin_token)
+    esperado = compilar_gramatica(sin_token)
+    assert "'\"'" not in resultado.arbol.tabla_simbolos.ids
+    assert resultado.arbol.tabla_simbolos.terminales == esperado.arbol.tabla_simbolos.terminales
+    assert resultado.arbol.tabla_simbolos.nombres == esperado.arbol.tabla_simbolos.nombres
+    assert resultado.expresion == esperado.expresion
+    assert resultado.transiciones == esperado.transiciones
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from compilador import compilar_gramatica, main
+from conftest import GRAMATICA_BASE
+from instrumentacion import Instrumentacion
+
+# El reporte tiene la duración de cada etapa y las cantidades de la compilación
+def test_reporte_etapas_y_datos():
+    terminadas = []
+    instrumentacion = Instrumentacion(al_terminar_etapa=lambda nombre, segundos: terminadas.append(nombre))
+    resultado = compilar_gramatica(GRAMATICA_BASE, minimizar=True, instrumentacion=instrumentacion)
+    reporte = instrumentacion.reporte()
+
+    assert list(reporte['etapas']) == ['tokenizar', 'construir_arbol', 'calcular_conjuntos',
+                                       'generar_tabla_transiciones', 'minimizar', 'tabla_densa']
+    assert terminadas == list(reporte['etapas'])
+    assert reporte['total_segundos'] == pytest.approx(sum(reporte['etapas'].values()))
+    datos = reporte['datos']
+    assert datos['hojas'] == resultado.total_hojas
+    assert datos['estados'] == resultado.estados_sin_minimizar
+    assert datos['estados_finales'] == len(resultado.estados)
+    assert datos['clases'] == resultado.tabla.total_clases
+    assert 'perfil' not in reporte
+
+def test_perfil_de_una_etapa(tmp_path):
+    instrumentacion = Instrumentacion(perfilar='calcular_conjuntos')
+    compilar_gramatica(GRAMATICA_BASE, instrumentacion=instrumentacion)
+    reporte = instrumentacion.reporte()
+    assert reporte['etapa_perfilada'] == 'calcular_conjuntos'
+    assert 'calcular_conjuntos' in reporte['perfil']
+    ruta = tmp_path / 'perfil.pstats'
+    instrumentacion.guardar_perfil(str(ruta))
+    assert ruta.stat().st_size > 0
+
+    with pytest.raises(Exception):
+        Instrumentacion(perfilar='no existe').guardar_perfil(str(ruta))
+
+# Con --instrumentar y --log cada ejecución agrega una línea JSON al archivo
+def test_reporte_en_log(ruta_gramatica, tmp_path):
+    ruta = ruta_gramatica(GRAMATICA_BASE)
+    log = tmp_path / 'reporte.jsonl'
+    for _ in range(2):
+        assert main([ruta, '--instrumentar', '--log', str(log)]) == 0
+    lineas = log.read_text(encoding='utf-8').splitlines()
+    assert len(lineas) == 2
+    reporte = json.loads(lineas[-1])
+    assert 'generar_tabla_transiciones' in reporte['etapas']
+    assert reporte['datos']['hojas'] > 0
@@ -0,0 +1,35 @@
+from array import array
+
+import pytest
+
+from conftest import referencia, textos_prueba
+from escaner import construir_escaner
+from lotes import TOKEN_ERROR_LOTE, tipo_documento, tokenizar_lote, triples_documento
+
+@pytest.mark.parametrize('procesos', [1, 2])
+def test_lotes(procesos):
+    resultado, esperados = referencia('base')
+    escaner = construir_escaner(resultado)
+    assert list(tokenizar_lote(escaner, textos_prueba('base'), procesos)) == esperados
+
+# Con son_rutas los documentos se leen de archivos y con compacto se devuelven los valores seguidos
+@pytest.mark.parametrize('procesos', [1, 2])
+def test_lotes_rutas_compacto(procesos, tmp_path):
+    resultado, esperados = referencia('base')
+    escaner = construir_escaner(resultado)
+    rutas = []
+    for indice, texto in enumerate(textos_prueba('base')):
+        ruta = tmp_path / f'documento{indice}.txt'
+        ruta.write_bytes(texto.encode('latin-1'))
+        rutas.append(str(ruta))
+    for tokens, esperado in zip(tokenizar_lote(escaner, rutas, procesos, son_rutas=True, compacto=True), esperados):
+        valores = [TOKEN_ERROR_LOTE if token == escaner.token_error else token for token, _, _ in esperado]
+        assert list(tokens[0::3]) == valores
+        assert list(zip(tokens[1::3], tokens[2::3])) == [(inicio, fin) for _, inicio, fin in esperado]
+
+# Los documentos de 2 GiB o más usan un array int64, donde caben sus posiciones
+def test_lotes_documento_grande():
+    assert tipo_documento((1 << 31) - 1) == 'i'
+    assert tipo_documento(1 << 31) == 'q'
+    tokens = array(tipo_documento(5 << 30), [1, 5 << 30, (5 << 30) + 2, TOKEN_ERROR_LOTE, 0, 1])
+    assert triples_documento(tokens, 54) == [(1, 5 << 30, (5 << 30) + 2), (54, 0, 1)]
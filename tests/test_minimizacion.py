@@ -0,0 +1,32 @@
+from itertools import product
+
+import pytest
+
+from compilador import compilar_expresion, compilar_gramatica
+from conftest import GRAMATICAS, NOMBRES
+
+# Token que acepta el AFD después de leer los símbolos dados (None si no acepta o se queda sin transición)
+def token_aceptado(resultado, simbolos):
+    estado = 0
+    for simbolo in simbolos:
+        estado = resultado.transiciones[estado].get(simbolo)
+        if estado is None:
+            return None
+    return resultado.aceptacion[estado]
+
+# Los estados a los que se llega con a1 y con a3 aceptan lo mismo y se juntan
+def test_minimizar_junta_estados_equivalentes():
+    normal = compilar_expresion('(a1.a2|a3.a2).e1')
+    minimo = compilar_expresion('(a1.a2|a3.a2).e1', minimizar=True)
+    assert (len(normal.estados), len(minimo.estados)) == (4, 3)
+    assert minimo.transiciones[0]['a1'] == minimo.transiciones[0]['a3']
+
+# El AFD mínimo acepta las mismas secuencias de símbolos, con el mismo token
+@pytest.mark.parametrize('nombre', NOMBRES)
+def test_minimizar_mismo_lenguaje(nombre):
+    normal = compilar_gramatica(GRAMATICAS[nombre])
+    minimo = compilar_gramatica(GRAMATICAS[nombre], minimizar=True)
+    alfabeto = sorted({simbolo for fila in normal.transiciones for simbolo in fila})
+    for largo in range(4):
+        for simbolos in product(alfabeto, repeat=largo):
+            assert token_aceptado(minimo, simbolos) == token_aceptado(normal, simbolos), simbolos
@@ -0,0 +1,35 @@
+import pytest
+
+from compilador import compilar_gramatica
+from conftest import GRAMATICAS, NOMBRES, referencia, textos_prueba
+from escaner import calcular_clases_caracteres, construir_escaner_posiciones, rangos_simbolos
+from posiciones import AutomataPosiciones
+
+@pytest.mark.parametrize('nombre', NOMBRES)
+@pytest.mark.parametrize('bits_bloque', [0, 4, 8])
+def test_escaner_posiciones(nombre, bits_bloque):
+    resultado, esperados = referencia(nombre)
+    escaner = construir_escaner_posiciones(resultado, bits_bloque)
+    for texto, esperado in zip(textos_prueba(nombre), esperados):
+        assert list(escaner.tokenizar(texto)) == esperado, texto
+
+# Sin construir el AFD (generar_afd=False) el autómata de posiciones da los mismos tokens
+def test_escaner_posiciones_sin_afd():
+    resultado = compilar_gramatica(GRAMATICAS['base'], generar_afd=False)
+    assert resultado.estados == []
+    esperados = referencia('base')[1]
+    escaner = construir_escaner_posiciones(resultado)
+    for texto, esperado in zip(textos_prueba('base'), esperados):
+        assert list(escaner.tokenizar(texto)) == esperado, texto
+
+# Las tablas de bloques no pasan de la memoria pedida: se achican los bloques o no se arman
+def test_posiciones_memoria_tablas():
+    resultado = compilar_gramatica(GRAMATICAS['base'])
+    clases_caracteres, clases_simbolo = calcular_clases_caracteres(rangos_simbolos(resultado))
+    argumentos = (resultado.arbol, resultado.follow_dict, resultado.simbolos_hoja, resultado.marcadores,
+                  clases_simbolo, resultado.conjuntos)
+    assert AutomataPosiciones(*argumentos).tablas is None
+    automata = AutomataPosiciones(*argumentos, bits_bloque=8, memoria_tablas=20000)
+    assert 0 < automata.bits_bloque < 8
+    assert automata.memoria_tablas(automata.bits_bloque) <= 20000
+    assert AutomataPosiciones(*argumentos, bits_bloque=8, memoria_tablas=0).tablas is None
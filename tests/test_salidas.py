@@ -0,0 +1,95 @@
+import csv
+import json
+
+import pytest
+
+from arbol import recorrer_inorden
+from compilador import compilar_gramatica
+from conftest import GRAMATICA_BASE
+from salidas import FORMATOS, escritores, obtener_escritor, registrar_escritor
+
+@pytest.fixture(params=['bits', 'set'])
+def resultado(request):
+    return compilar_gramatica(GRAMATICA_BASE, conjuntos=request.param)
+
+def leer_csv(ruta):
+    with open(ruta, newline='') as archivo:
+        return list(csv.reader(archivo))
+
+def leer_jsonl(ruta):
+    with open(ruta) as archivo:
+        return [json.loads(linea) for linea in archivo]
+
+def posiciones(resultado, conjunto):
+    return resultado.conjuntos.ordenados(conjunto)
+
+def test_transiciones_csv(resultado, tmp_path):
+    ruta = str(tmp_path / 'transiciones.csv')
+    obtener_escritor('transiciones', 'csv')(resultado.tabla, resultado.estados, ruta, resultado.conjuntos)
+    encabezado, *filas = leer_csv(ruta)
+    terminales = encabezado[3:]
+    assert encabezado[:3] == ['estado', 'posiciones', 'token']
+    assert sorted(terminales) == sorted(resultado.tabla.clase_entrada)
+    assert len(filas) == len(resultado.estados)
+    for estado, fila in enumerate(filas):
+        token = resultado.tabla.token(estado)
+        assert fila[:3] == [str(estado), ' '.join(map(str, posiciones(resultado, resultado.estados[estado]))),
+                            '' if token is None else str(token)]
+        for terminal, celda in zip(terminales, fila[3:]):
+            destino = resultado.transiciones[estado].get(terminal)
+            assert celda == ('' if destino is None else str(destino))
+
+def test_transiciones_jsonl(resultado, tmp_path):
+    ruta = str(tmp_path / 'transiciones.jsonl')
+    obtener_escritor('transiciones', 'jsonl')(resultado.tabla, resultado.estados, ruta, resultado.conjuntos)
+    cabecera, *filas = leer_jsonl(ruta)
+    assert cabecera == {'tabla': 'transiciones', 'estados': len(resultado.estados),
+                        'simbolos': sorted(resultado.tabla.clase_entrada)}
+    assert [fila['estado'] for fila in filas] == list(range(len(resultado.estados)))
+    for fila in filas:
+        estado = fila['estado']
+        assert fila['posiciones'] == posiciones(resultado, resultado.estados[estado])
+        assert fila['token'] == resultado.tabla.token(estado)
+        assert fila['transiciones'] == resultado.transiciones[estado]
+
+@pytest.mark.parametrize('formato', ['csv', 'jsonl'])
+def test_follow(resultado, formato, tmp_path):
+    ruta = str(tmp_path / f'follow.{formato}')
+    obtener_escritor('follow', formato)(resultado.follow_dict, ruta, resultado.conjuntos)
+    esperado = [(pos, posiciones(resultado, follow)) for pos, follow in sorted(resultado.follow_dict.items())]
+    if formato == 'csv':
+        encabezado, *filas = leer_csv(ruta)
+        assert encabezado == ['posicion', 'follow']
+        assert [(int(pos), [int(p) for p in follow.split()]) for pos, follow in filas] == esperado
+    else:
+        cabecera, *filas = leer_jsonl(ruta)
+        assert cabecera == {'tabla': 'follow', 'posiciones': len(resultado.follow_dict)}
+        assert [(fila['posicion'], fila['follow']) for fila in filas] == esperado
+
+@pytest.mark.parametrize('formato', ['csv', 'jsonl'])
+def test_fln(resultado, formato, tmp_path):
+    arbol = resultado.arbol
+    ruta = str(tmp_path / f'fln.{formato}')
+    obtener_escritor('fln', formato)(arbol, ruta, resultado.conjuntos)
+    esperado = [(arbol.valor(nodo), posiciones(resultado, arbol.first[nodo]), posiciones(resultado, arbol.last[nodo]),
+                 bool(arbol.nullable[nodo])) for nodo in recorrer_inorden(arbol)]
+    if formato == 'csv':
+        encabezado, *filas = leer_csv(ruta)
+        assert encabezado == ['simbolo', 'first', 'last', 'nullable']
+        assert [(simbolo, [int(p) for p in first.split()], [int(p) for p in last.split()], nullable == '1')
+                for simbolo, first, last, nullable in filas] == esperado
+    else:
+        cabecera, *filas = leer_jsonl(ruta)
+        assert cabecera == {'tabla': 'fln', 'nodos': len(arbol)}
+        assert [(fila['simbolo'], fila['first'], fila['last'], fila['nullable']) for fila in filas] == esperado
+
+def test_registrar_escritor(monkeypatch):
+    monkeypatch.setitem(escritores, 'follow', dict(escritores['follow']))
+    monkeypatch.setattr('salidas.FORMATOS', list(FORMATOS))
+    escritor = lambda follow_dict, ruta, conjuntos: None  # noqa: E731
+    registrar_escritor('follow', 'nulo', escritor)
+    assert obtener_escritor('follow', 'nulo') is escritor
+    with pytest.raises(Exception):
+        obtener_escritor('transiciones', 'nulo')
+    with pytest.raises(Exception):
+        registrar_escritor('otra', 'nulo', escritor)
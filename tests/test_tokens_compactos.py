@@ -0,0 +1,45 @@
+from compilador import compilar_gramatica
+from conftest import GRAMATICA_BASE, textos_prueba
+from escaner import construir_escaner
+from salidas import obtener_escritor
+from tokens_compactos import TokensCompactos, cargar_tokens, numpy
+
+def test_tokens_compactos_ida_y_vuelta(tmp_path):
+    escaner = construir_escaner(compilar_gramatica(GRAMATICA_BASE))
+    texto = ' '.join(textos_prueba('base'))
+    tokens = TokensCompactos(1).extender(escaner.tokenizar(texto))
+    tokens.agregar(None, 0, 1)
+    ruta = str(tmp_path / 'tokens.lfak')
+    tokens.guardar(ruta)
+    cargados = cargar_tokens(ruta)
+    assert list(cargados) == list(escaner.tokenizar(texto)) + [(None, 0, 1)]
+    assert cargados.tamano_bytes() == 12 * len(cargados)
+
+# Un archivo binario de transiciones (salidas) no se puede leer como archivo de tokens
+def test_tokens_rechaza_tabla_de_transiciones(tmp_path):
+    resultado = compilar_gramatica(GRAMATICA_BASE)
+    ruta = str(tmp_path / 'transiciones.bin')
+    obtener_escritor('transiciones', 'binario')(resultado.tabla, resultado.estados, ruta, resultado.conjuntos)
+    assert cargar_tokens(ruta) is None
+
+# Las posiciones de más de 4 GiB pasan la columna a 64 bits y el tipo se guarda en el archivo
+def test_tokens_posiciones_de_64_bits(tmp_path):
+    tokens = TokensCompactos(1)
+    tokens.agregar(1, 0, 3)
+    tokens.extender([(2, 5 << 30, (5 << 30) + 2), (3, 6 << 30, 11 << 30)])
+    assert (tokens.inicios.typecode, tokens.largos.typecode) == ('Q', 'Q')
+    esperado = [(1, 0, 3), (2, 5 << 30, (5 << 30) + 2), (3, 6 << 30, 11 << 30)]
+    # Seguir agregando tras ensanchar hasta que las columnas tengan que crecer
+    capacidad = tokens.capacidad()
+    siguientes = [(4, (12 << 30) + i, (12 << 30) + i + (5 << 30)) for i in range(capacidad)]
+    tokens.extender(siguientes)
+    esperado += siguientes
+    assert tokens.capacidad() > capacidad
+    assert list(tokens) == esperado
+    ruta = str(tmp_path / 'tokens.lfak')
+    tokens.guardar(ruta)
+    cargados = cargar_tokens(ruta)
+    assert (cargados.inicios.typecode, cargados.largos.typecode) == ('Q', 'Q')
+    assert list(cargados) == esperado
+    if numpy is not None:
+        assert tokens.como_numpy()[1].tolist()[:3] == [0, 5 << 30, 6 << 30]
@@ -0,0 +1,49 @@
+import pytest
+
+import transiciones
+from compilador import compilar_gramatica
+from conftest import GRAMATICAS, NOMBRES
+from escaner import calcular_clases_caracteres, rangos_simbolos
+from tabla_densa import SIN_TRANSICION
+from transiciones import generar_tabla_transiciones, numpy
+
+# Cada conjunto de posiciones es un solo estado y los destinos son ids de estados
+@pytest.mark.parametrize('nombre', NOMBRES)
+def test_estados_sin_repetir(nombre):
+    resultado = compilar_gramatica(GRAMATICAS[nombre])
+    assert len(set(resultado.estados)) == len(resultado.estados)
+    assert all(0 <= destino < len(resultado.estados) for fila in resultado.transiciones for destino in fila.values())
+
+# La tabla densa da el mismo destino que la tabla por estados para cada símbolo, y -1 donde no hay transición
+@pytest.mark.parametrize('nombre', NOMBRES)
+def test_tabla_densa(nombre):
+    resultado = compilar_gramatica(GRAMATICAS[nombre])
+    tabla = resultado.tabla
+    simbolos = set(tabla.clase_entrada)
+    assert tabla.total_estados == len(resultado.estados)
+    for estado, fila in enumerate(resultado.transiciones):
+        for simbolo in simbolos:
+            assert tabla.destino_entrada(estado, simbolo) == fila.get(simbolo, SIN_TRANSICION)
+
+@pytest.mark.skipif(numpy is None, reason="NumPy no está instalado")
+@pytest.mark.parametrize('nombre', NOMBRES)
+@pytest.mark.parametrize('conjuntos', ['bits', 'set'])
+def test_subconjuntos_numpy(nombre, conjuntos):
+    resultado = compilar_gramatica(GRAMATICAS[nombre], conjuntos=conjuntos, generar_afd=False)
+    clases_simbolo = calcular_clases_caracteres(rangos_simbolos(resultado))[1]
+    for clases in (None, clases_simbolo):
+        argumentos = (resultado.arbol, resultado.follow_dict, resultado.total_hojas, resultado.simbolos_hoja,
+                      resultado.conjuntos, clases)
+        assert generar_tabla_transiciones(*argumentos, vectorizada=True) == generar_tabla_transiciones(*argumentos)
+
+# Si las matrices de Follow no entran en MEMORIA_NUMPY se usa la construcción de Python, con la misma tabla
+@pytest.mark.skipif(numpy is None, reason="NumPy no está instalado")
+@pytest.mark.parametrize('por_clases', [False, True])
+def test_subconjuntos_numpy_sin_memoria(monkeypatch, por_clases):
+    resultado = compilar_gramatica(GRAMATICAS['base'], generar_afd=False)
+    clases_simbolo = calcular_clases_caracteres(rangos_simbolos(resultado))[1] if por_clases else None
+    argumentos = (resultado.arbol, resultado.follow_dict, resultado.total_hojas, resultado.simbolos_hoja,
+                  resultado.conjuntos, clases_simbolo)
+    esperado = generar_tabla_transiciones(*argumentos)
+    monkeypatch.setattr(transiciones, 'MEMORIA_NUMPY', 0)
+    assert generar_tabla_transiciones(*argumentos, vectorizada=True) == esperado
@@ -0,0 +1,167 @@
+import struct
+import sys
+from array import array
+
+try:
+    import numpy
+except ImportError:  # NumPy es opcional, las columnas también se pueden usar como memoryview
+    numpy = None
+
+# Formato del archivo de tokens (.lfak):
+#   MAGIA (4 bytes) | FORMATO (uint32) | total de tokens (uint64) | orden de bytes (uint32: 0 little, 1 big)
+#   | tipos de las columnas de inicios y largos (2 bytes: 'I' uint32 o 'Q' uint64)
+#   | columna de tokens (uint32) | columna de inicios | columna de largos
+MAGIA = b'LFAK'
+FORMATO = 2
+CABECERA = struct.Struct('<IQI2s')
+EXTENSION = '.lfak'
+COLUMNAS = ['tokens', 'inicios', 'largos']
+
+# Tipos de array que puede tener una columna de posiciones: uint32 y, si alguna no cabe, uint64
+TIPOS_POSICION = ('I', 'Q')
+
+# Capacidad con la que empiezan las columnas; al llenarse se duplica
+CAPACIDAD_INICIAL = 1024
+
+# Valor que se guarda en la columna de tokens cuando el token es None (token de error no definido)
+SIN_TOKEN = 0xFFFFFFFF
+
+# Flujo de tokens guardado en tres columnas array('I') (número de token, inicio y largo), 12 bytes por token en
+# vez de una tupla de Python por token. Si un inicio o un largo no cabe en 32 bits (textos de más de 4 GiB), esa
+# columna se pasa a array('Q') y el tipo queda en la cabecera del .lfak. Las columnas se reservan de antemano y
+# crecen al doble cuando se llenan; solo los primeros "total" valores son tokens. columnas() y como_numpy() dan
+# vistas sin copiar para pasarlas a otro proceso o a un parser; mientras existan, las columnas no pueden crecer
+# (array no se puede redimensionar con vistas abiertas), así que hay que soltarlas antes de agregar más tokens.
+class TokensCompactos:
+    def __init__(self, capacidad=CAPACIDAD_INICIAL):
+        if capacidad < 1:
+            raise Exception("Error: La capacidad del flujo de tokens debe ser al menos 1")
+        self.tokens = array('I', [0]) * capacidad
+        self.inicios = array('I', [0]) * capacidad
+        self.largos = array('I', [0]) * capacidad
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    # Token i como (token, inicio, fin), igual que los que devuelve Escaner.tokenizar
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self.total
+        if not 0 <= indice < self.total:
+            raise IndexError("Error: Índice de token fuera de rango")
+        token = self.tokens[indice]
+        inicio = self.inicios[indice]
+        return (None if token == SIN_TOKEN else token), inicio, inicio + self.largos[indice]
+
+    def __iter__(self):
+        for indice in range(self.total):
+            yield self[indice]
+
+    def capacidad(self):
+        return len(self.tokens)
+
+    # Duplicar la capacidad de las columnas
+    def crecer(self):
+        n = max(len(self.tokens), CAPACIDAD_INICIAL)
+        for columna in (self.tokens, self.inicios, self.largos):
+            # Cada columna con su propio tipo: las de posiciones pueden estar ya en array('Q')
+            columna.extend(array(columna.typecode, [0]) * n)
+
+    # Pasar a array('Q') las columnas de posiciones en las que no cabe el valor dado (inicio, largo)
+    def ensanchar(self, inicio, largo):
+        if inicio > 0xFFFFFFFF and self.inicios.typecode == 'I':
+            self.inicios = array('Q', self.inicios)
+        if largo > 0xFFFFFFFF and self.largos.typecode == 'I':
+            self.largos = array('Q', self.largos)
+
+    # Agregar un token (fin es la posición siguiente al último carácter, como en Escaner.tokenizar)
+    def agregar(self, token, inicio, fin):
+        self.extender(((token, inicio, fin),))
+
+    # Agregar los (token, inicio, fin) de cualquier tokenizador (Escaner, EscanerPerezoso, EscanerPosiciones,
+    # un módulo generado o Escaner.tokenizar_archivo sin lexemas)
+    def extender(self, triples):
+        tokens = self.tokens
+        inicios = self.inicios
+        largos = self.largos
+        total = self.total
+        capacidad = len(tokens)
+        for token, inicio, fin in triples:
+            if total == capacidad:
+                self.total = total
+                self.crecer()
+                capacidad = len(tokens)
+            tokens[total] = SIN_TOKEN if token is None else token
+            try:
+                inicios[total] = inicio
+                largos[total] = fin - inicio
+            except OverflowError:  # Posición de más de 32 bits
+                self.ensanchar(inicio, fin - inicio)
+                inicios = self.inicios
+                largos = self.largos
+                inicios[total] = inicio
+                largos[total] = fin - inicio
+            total += 1
+        self.total = total
+        return self
+
+    # Quitar la capacidad sobrante (por ejemplo antes de entregar las columnas)
+    def recortar(self):
+        for columna in (self.tokens, self.inicios, self.largos):
+            del columna[self.total:]
+
+    # Vistas memoryview de los tokens guardados: (tokens, inicios, largos), sin copiar
+    def columnas(self):
+        return tuple(memoryview(columna)[:self.total] for columna in (self.tokens, self.inicios, self.largos))
+
+    # Vistas de NumPy de las tres columnas (uint32, o uint64 las de posiciones ensanchadas), sin copiar
+    def como_numpy(self):
+        if numpy is None:
+            raise Exception("Error: NumPy no está instalado")
+        return tuple(numpy.frombuffer(columna, dtype=columna.typecode, count=self.total)
+                     for columna in (self.tokens, self.inicios, self.largos))
+
+    # Bytes que ocupan los tokens guardados (sin contar la capacidad sobrante)
+    def tamano_bytes(self):
+        return self.total * (self.tokens.itemsize + self.inicios.itemsize + self.largos.itemsize)
+
+    # Devuelve (token, lexema) por cada token, con el texto que se tokenizó
+    def lexemas(self, texto):
+        for token, inicio, fin in self:
+            yield token, texto[inicio:fin]
+
+    # Guardar las columnas en un archivo .lfak (se escriben directo desde las columnas, sin armar tuplas)
+    def guardar(self, ruta):
+        with open(ruta, 'wb') as archivo:
+            tipos = (self.inicios.typecode + self.largos.typecode).encode('ascii')
+            archivo.write(MAGIA + CABECERA.pack(FORMATO, self.total, 0 if sys.byteorder == 'little' else 1, tipos))
+            for vista in self.columnas():
+                archivo.write(vista)
+
+# Cargar un archivo .lfak. Devuelve None si no es un archivo de tokens o es de otro formato.
+def cargar_tokens(ruta):
+    with open(ruta, 'rb') as archivo:
+        cabecera = archivo.read(4 + CABECERA.size)
+        if len(cabecera) < 4 + CABECERA.size or cabecera[:4] != MAGIA:
+            return None
+        formato, total, orden, tipos = CABECERA.unpack(cabecera[4:])
+        tipos = {'tokens': 'I', 'inicios': chr(tipos[0]), 'largos': chr(tipos[1])}
+        if formato != FORMATO or tipos['inicios'] not in TIPOS_POSICION or tipos['largos'] not in TIPOS_POSICION:
+            return None
+        compactos = TokensCompactos(1)
+        for nombre in COLUMNAS:
+            columna = array(tipos[nombre])
+            try:
+                columna.fromfile(archivo, total)
+            except EOFError:  # Archivo cortado
+                return None
+            if orden != (0 if sys.byteorder == 'little' else 1):
+                columna.byteswap()
+            setattr(compactos, nombre, columna)
+        compactos.total = total
+    return compactos
+
+# Tokenizar un texto y guardar el resultado en columnas compactas
+def tokenizar_compacto(escaner, texto, capacidad=CAPACIDAD_INICIAL):
+    return TokensCompactos(capacidad).extender(escaner.tokenizar(texto))
@@ -0,0 +1,232 @@
+from collections import deque
+
+try:
+    import numpy
+except ImportError:  # NumPy es opcional, la construcción de subconjuntos funciona sin él
+    numpy = None
+
+from arbol import obtener_hojas
+from conjuntos import conjuntos_python
+
+# Función para obtener el símbolo de cada hoja numerada del árbol
+def obtener_simbolos_hoja(arbol):
+    return {arbol.numero_hoja[nodo]: arbol.simbolos[arbol.simbolo[nodo]] for nodo in obtener_hojas(arbol)}
+
+# Función para obtener el alfabeto sin repetidos, en el orden en que aparecen las hojas
+def obtener_alfabeto(simbolos_hoja):
+    return list(dict.fromkeys(simbolos_hoja[pos] for pos in sorted(simbolos_hoja)))
+
+# Función para obtener las posiciones de los marcadores Tn con su número de token (el que guarda la tabla de
+# símbolos para cada marcador; un terminal que se llame como un marcador no lo es)
+def obtener_marcadores(simbolos_hoja, tabla_simbolos):
+    marcadores = {}
+    for pos, simbolo in simbolos_hoja.items():
+        token = tabla_simbolos.numero_token(simbolo)
+        if token is not None:
+            marcadores[pos] = token
+    return marcadores
+
+# Función para obtener el token que acepta cada estado (None si no acepta).
+# Si el estado contiene varios marcadores gana el de menor posición, es decir el token declarado primero.
+def calcular_aceptacion(estados, marcadores, conjuntos=conjuntos_python):
+    aceptacion = []
+    for estado in estados:
+        posicion_token = None
+        for pos in conjuntos.posiciones(estado):
+            if pos in marcadores and (posicion_token is None or pos < posicion_token):
+                posicion_token = pos
+        aceptacion.append(marcadores[posicion_token] if posicion_token is not None else None)
+    return aceptacion
+
+# Generar tabla de transiciones (construcción de subconjuntos)
+# Devuelve las transiciones como una lista de diccionarios {simbolo: id del estado destino}
+# y los estados como una lista de llaves de conjuntos (frozenset o entero de bits), donde el índice es el id del estado.
+# Si se da clases_simbolo (símbolo -> lista de clases de entrada que lo cumplen) las transiciones se hacen por clase
+# en lugar de por símbolo; así un carácter que pertenece a varios símbolos (LETRA y 'A') sigue todas sus posiciones.
+# Con vectorizada=True se usa generar_tabla_transiciones_numpy (da la misma tabla, con los mismos ids de estado).
+def generar_tabla_transiciones(arbol, follow_dict, total_hojas, simbolos_hoja=None, conjuntos=conjuntos_python,
+                               clases_simbolo=None, vectorizada=False):
+    if vectorizada:
+        return generar_tabla_transiciones_numpy(arbol, follow_dict, total_hojas, simbolos_hoja, conjuntos,
+                                                clases_simbolo)
+    if simbolos_hoja is None:
+        simbolos_hoja = obtener_simbolos_hoja(arbol)
+    if clases_simbolo is None:
+        alfabeto = obtener_alfabeto(simbolos_hoja)
+        clases_simbolo = {simbolo: (simbolo,) for simbolo in alfabeto}
+    else:
+        alfabeto = sorted({clase for clases in clases_simbolo.values() for clase in clases})
+
+    estados = []  # id -> conjunto de posiciones
+    ids_estados = {}  # llave del conjunto de posiciones -> id
+    transiciones = []  # id -> {simbolo: id destino}
+    pendientes = deque()  # Estados que falta expandir
+
+    def agregar_estado(posiciones):
+        id_estado = ids_estados.get(posiciones)
+        if id_estado is None:
+            id_estado = len(estados)
+            ids_estados[posiciones] = id_estado
+            estados.append(posiciones)
+            transiciones.append({})
+            pendientes.append(id_estado)
+        return id_estado
+
+    # Estado S0 es el first del nodo raíz
+    S0 = arbol.first[arbol.raiz]
+    if S0:
+        agregar_estado(conjuntos.clave(S0))
+
+    # Expandir el resto de los estados
+    while pendientes:
+        id_estado = pendientes.popleft()
+
+        # Agrupar los follow de las posiciones del estado según su símbolo (o las clases que lo cumplen)
+        siguientes = {}
+        for pos in conjuntos.posiciones(estados[id_estado]):
+            for simbolo in clases_simbolo.get(simbolos_hoja[pos], ()):
+                if simbolo in siguientes:
+                    siguientes[simbolo] |= follow_dict[pos]
+                else:
+                    siguientes[simbolo] = conjuntos.vacio() | follow_dict[pos]
+
+        fila = transiciones[id_estado]
+        for simbolo in alfabeto:
+            transicion = siguientes.get(simbolo)
+            if transicion:
+                fila[simbolo] = agregar_estado(conjuntos.clave(transicion))
+
+    return transiciones, estados
+
+# Cantidad máxima de valores (estados x posiciones) de cada lote de la construcción con NumPy
+TAMANO_LOTE_NUMPY = 1 << 22
+
+# Memoria máxima (aproximada, en bytes) de las matrices de Follow de cada símbolo en la construcción con NumPy
+# (float32, 4 bytes por valor); si pasarían de esto se usa la construcción de Python
+MEMORIA_NUMPY = 64 << 20
+
+# Pasar una fila empaquetada en bits (un bit por posición) a la llave del conjunto de posiciones en la
+# representación dada
+def conjunto_fila(empaquetada, conjuntos):
+    if conjuntos.nombre == 'bits':
+        return int.from_bytes(empaquetada, 'little')
+    fila = numpy.unpackbits(numpy.frombuffer(empaquetada, dtype=numpy.uint8), bitorder='little')
+    return conjuntos.clave(set(numpy.flatnonzero(fila).tolist()))
+
+# Construcción de subconjuntos con NumPy. Para cada símbolo (o clase) se arma una matriz bool con el Follow de
+# sus posiciones, solo en las columnas que alguno de esos Follow usa, y los estados pendientes se expanden por
+# lotes: los destinos de todos los estados del lote que tienen posiciones de ese símbolo salen de un solo
+# producto de matrices,
+#     (estados x posiciones del símbolo) @ (Follow de esas posiciones)
+# Los estados pendientes se guardan empaquetados en bits y cada destino se identifica por esos bytes. Los
+# estados se numeran en el mismo orden que en generar_tabla_transiciones (por niveles, y dentro del lote por id y
+# símbolo), así la tabla y los ids son los mismos. Conviene cuando los estados tienen muchas posiciones; con
+# estados chicos el producto hace más trabajo que unir los Follow uno por uno. Si las matrices de Follow pasarían
+# de MEMORIA_NUMPY bytes se usa la construcción de Python.
+def generar_tabla_transiciones_numpy(arbol, follow_dict, total_hojas, simbolos_hoja=None, conjuntos=conjuntos_python,
+                                     clases_simbolo=None):
+    if numpy is None:
+        raise Exception("Error: NumPy no está instalado")
+    if simbolos_hoja is None:
+        simbolos_hoja = obtener_simbolos_hoja(arbol)
+    clases_pedidas = clases_simbolo  # Para la construcción de Python, que ordena el alfabeto según se den o no
+    if clases_simbolo is None:
+        alfabeto = obtener_alfabeto(simbolos_hoja)
+        clases_simbolo = {simbolo: (simbolo,) for simbolo in alfabeto}
+    else:
+        alfabeto = sorted({clase for clases in clases_simbolo.values() for clase in clases})
+
+    # Posiciones de cada símbolo, seguidas en el orden del alfabeto: el símbolo i usa las columnas del lote (y
+    # las filas de su matriz de Follow) de tramos[i] a tramos[i + 1]. La columna 0 no se usa, así el índice es
+    # la posición.
+    posiciones_simbolo = {simbolo: [] for simbolo in alfabeto}
+    for pos in sorted(simbolos_hoja):
+        for simbolo in clases_simbolo.get(simbolos_hoja[pos], ()):
+            posiciones_simbolo[simbolo].append(pos)
+    orden = []
+    tramos = [0]
+    for simbolo in alfabeto:
+        orden.extend(posiciones_simbolo[simbolo])
+        tramos.append(len(orden))
+
+    # Columnas con algún Follow de las posiciones de cada símbolo: la matriz y el producto se hacen solo con esas
+    follow_posicion = {pos: numpy.fromiter(conjuntos.posiciones(conjunto), dtype=numpy.intp)
+                       for pos, conjunto in follow_dict.items()}
+    vacio = numpy.zeros(0, dtype=numpy.intp)
+    columnas_simbolo = []
+    memoria = 0
+    for simbolo in alfabeto:
+        usadas = numpy.unique(numpy.concatenate([vacio] + [follow_posicion.get(pos, vacio)
+                                                          for pos in posiciones_simbolo[simbolo]]))
+        columnas_simbolo.append(usadas)
+        memoria += len(posiciones_simbolo[simbolo]) * len(usadas) * 4  # float32
+    if memoria > MEMORIA_NUMPY:
+        return generar_tabla_transiciones(arbol, follow_dict, total_hojas, simbolos_hoja, conjuntos, clases_pedidas)
+
+    # Las matrices se arman una vez en float32, el tipo del producto, así ningún lote las vuelve a convertir
+    follow_simbolo = []
+    for indice, simbolo in enumerate(alfabeto):
+        usadas = columnas_simbolo[indice]
+        matriz = numpy.zeros((len(posiciones_simbolo[simbolo]), len(usadas)), dtype=numpy.float32)
+        for fila, pos in enumerate(posiciones_simbolo[simbolo]):
+            matriz[fila, numpy.searchsorted(usadas, follow_posicion.get(pos, vacio))] = 1
+        follow_simbolo.append(matriz)
+
+    columnas = total_hojas + 1
+    estados = []
+    ids_estados = {}  # Bytes de la fila empaquetada -> id
+    transiciones = []
+    filas_nuevas = []  # Filas empaquetadas de los estados del siguiente nivel
+
+    def agregar_estado(llave):
+        id_estado = len(estados)
+        ids_estados[llave] = id_estado
+        estados.append(conjunto_fila(llave, conjuntos))
+        transiciones.append({})
+        filas_nuevas.append(llave)
+        return id_estado
+
+    S0 = arbol.first[arbol.raiz]
+    if S0:
+        fila = numpy.zeros(columnas, dtype=bool)
+        fila[list(conjuntos.posiciones(S0))] = True
+        agregar_estado(numpy.packbits(fila, bitorder='little').tobytes())
+
+    tamano_lote = max(1, TAMANO_LOTE_NUMPY // columnas)
+    primer_id = 0
+    while filas_nuevas:
+        nivel = filas_nuevas
+        filas_nuevas = []
+        for inicio in range(0, len(nivel), tamano_lote):
+            llaves = nivel[inicio:inicio + tamano_lote]
+            empaquetado = numpy.frombuffer(b''.join(llaves), dtype=numpy.uint8).reshape(len(llaves), -1)
+            lote = numpy.unpackbits(empaquetado, axis=1, count=columnas, bitorder='little').view(bool)[:, orden]
+
+            # (estado del lote, índice del símbolo, bytes de la fila de destino) de cada transición
+            destinos = []
+            for indice, simbolo in enumerate(alfabeto):
+                desde, hasta = tramos[indice], tramos[indice + 1]
+                if desde == hasta or not len(columnas_simbolo[indice]):
+                    continue
+                parte = lote[:, desde:hasta]
+                con_posiciones = numpy.flatnonzero(parte.any(axis=1))
+                if not len(con_posiciones):
+                    continue
+                # Las posiciones que no están en el lote suman ceros: se usa la matriz completa, sin copiarla
+                producto = parte[con_posiciones].astype(numpy.float32) @ follow_simbolo[indice]
+                filas = numpy.zeros((len(con_posiciones), columnas), dtype=bool)
+                filas[:, columnas_simbolo[indice]] = producto > 0
+                hay_destino = filas.any(axis=1)
+                empaquetadas = numpy.packbits(filas, axis=1, bitorder='little')
+                for j in numpy.flatnonzero(hay_destino).tolist():
+                    destinos.append((con_posiciones[j], indice, empaquetadas[j].tobytes()))
+
+            destinos.sort(key=lambda destino: (destino[0], destino[1]))
+            for i, indice, llave in destinos:
+                id_destino = ids_estados.get(llave)
+                if id_destino is None:
+                    id_destino = agregar_estado(llave)
+                transiciones[primer_id + inicio + i][alfabeto[indice]] = id_destino
+        primer_id += len(nivel)
+
+    return transiciones, estados